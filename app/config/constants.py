@@ -59,6 +59,7 @@ class WebSocketEvents:
     
     # Bot response events
     BOT_TEXT_RESPONSE = "BOT_TEXT_RESPONSE"
+    BOT_TEXT_CHUNK = "BOT_TEXT_CHUNK"
     BOT_AUDIO_STREAM = "BOT_AUDIO_STREAM"
     TRANSCRIPTION_RESULT = "TRANSCRIPTION_RESULT"
     
@@ -113,6 +114,7 @@ AUDIO_BIT_DEPTH = 16
 DEFAULT_MAX_TOKENS = 2000
 DEFAULT_TEMPERATURE = 0.7
 DEFAULT_TOP_P = 0.9
+MAX_CONTEXT_TOKENS = 2000  # Token budget for conversation history in prompts
 
 # Tool settings
 TOOL_TIMEOUT = 30  # seconds
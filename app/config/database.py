@@ -47,13 +47,21 @@ async def connect_redis():
         redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379')
         redis_password = os.getenv('REDIS_PASSWORD')
         redis_db = int(os.getenv('REDIS_DB', 0))
-        
+        redis_max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+
+        # Keepalive + periodic health checks keep pooled connections from
+        # silently dying behind NATs/idle timeouts (a dead connection costs a
+        # full reconnect mid-request); the pool cap bounds fan-out under load
         redis_client = await aioredis.from_url(
             redis_url,
             password=redis_password if redis_password else None,
             db=redis_db,
             encoding='utf-8',
-            decode_responses=True
+            decode_responses=True,
+            max_connections=redis_max_connections,
+            socket_keepalive=True,
+            socket_connect_timeout=5,
+            health_check_interval=30
         )
         
         # Test connection
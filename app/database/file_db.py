@@ -4,36 +4,182 @@ Simple alternative to MongoDB for local development
 """
 
 import os
+import re
 import json
+import heapq
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import aiofiles
 from app.utils.logger import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bind the serializer implementations once at import instead of re-checking
+# orjson availability inside every call
+if orjson is not None:
+    def _dumps(data: Any) -> str:
+        """Serialize a document to pretty JSON (orjson)"""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str).decode('utf-8')
+else:
+    def _dumps(data: Any) -> str:
+        """Serialize a document to pretty JSON (stdlib fallback)"""
+        return json.dumps(data, indent=2, default=str)
+
+
+def _write_document(path: Path, data: Any) -> None:
+    """Serialize and atomically write a document (tmp file + os.replace)
+
+    Runs in a worker thread so neither the dump nor the disk flush blocks
+    the event loop, and a crash mid-write can never leave a torn file.
+    The tmp file is fsynced before the rename: without it the rename can
+    land before the data on some filesystems, making a crash replace the
+    good file with an empty or truncated one.
+    """
+    content = _dumps(data)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+if orjson is not None:
+    def _dumps_compact(data: Any) -> str:
+        """Serialize a document to one JSON line (orjson)"""
+        return orjson.dumps(data, default=str).decode('utf-8')
+else:
+    def _dumps_compact(data: Any) -> str:
+        """Serialize a document to one JSON line (stdlib fallback)"""
+        return json.dumps(data, default=str)
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int) -> 're.Pattern':
+    """Compile (and cache) a $regex query pattern"""
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=256)
+def _split_path(key: str) -> tuple:
+    """Split (and cache) a dotted field path
+
+    Nested-field queries re-split the same key for every candidate document;
+    query keys are a small fixed set, so the split is paid once.
+    """
+    return tuple(key.split('.'))
+
+
+def _sort_key(field: str):
+    """Key function for sorting on a possibly dotted field
+
+    Missing (or non-dict intermediate) values sort as '' - the same default
+    the flat lookups always used. Resolving dotted paths here means sorts on
+    e.g. 'metadata.createdAt' actually order by the nested value instead of
+    silently comparing the empty default for every document.
+    """
+    parts = _split_path(field)
+    if len(parts) == 1:
+        return lambda doc: doc.get(field, '')
+
+    def key(doc):
+        value = doc
+        for part in parts:
+            if not isinstance(value, dict):
+                return ''
+            value = value.get(part)
+        return value if value is not None else ''
+    return key
+
+
+# All document writes go through dedicated single-worker shards instead of
+# the loop's default executor. Writes are routed by entity key, so writes to
+# the same files stay naturally serialized on one thread (no interleaved
+# tmp-file replaces under concurrency) while different sessions' writes land
+# on different shards and proceed in parallel. A burst of saves also can't
+# monopolize the shared pool that other to_thread work depends on.
+_WRITE_SHARDS = int(os.getenv('FILE_DB_WRITE_SHARDS', 4))
+_write_pools = tuple(
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'file-db-write-{i}')
+    for i in range(_WRITE_SHARDS)
+)
+
+
+def _run_write(key: str, fn, *args):
+    """Run a blocking write on the writer shard owning key (stable per key,
+    so per-entity write ordering is preserved)"""
+    pool = _write_pools[hash(key) % _WRITE_SHARDS]
+    return asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+
+# Meta fields that move on every message append; recovered from the message
+# log at load instead of forcing a sidecar rewrite per message
+_VOLATILE_META_KEYS = frozenset({'updatedAt', 'lastMessageAt'})
+
+# A burst of updates to the same conversation (user message, bot reply,
+# title change landing within this window) is coalesced into one disk write
+CONVERSATION_FLUSH_DELAY_SECONDS = 0.1
+
+# The shared memory log is rewritten once dead entries (superseded updates,
+# tombstones) outnumber live memories and the log is past this floor - below
+# it the garbage is too small to be worth a rewrite
+MEMORY_LOG_COMPACT_MIN_ENTRIES = 64
+
+
+# Exact types that can never contain a datetime - the overwhelming
+# majority of values in a document. One set lookup on type() short-circuits
+# the isinstance chain below for them.
+_DATETIME_FREE_TYPES = {str, int, float, bool, type(None)}
+
 
 def serialize_datetime(obj: Any) -> Any:
-    """Convert datetime objects to ISO format strings recursively"""
+    """Convert datetime objects to ISO format strings recursively
+
+    Copy-on-write: containers are only rebuilt when something inside them
+    actually needed conversion, so already-plain documents pass through
+    without allocating duplicate dicts and lists.
+    """
+    if type(obj) in _DATETIME_FREE_TYPES:
+        return obj
     if isinstance(obj, datetime):
         iso_str = obj.isoformat()
         return iso_str + 'Z' if not iso_str.endswith('Z') else iso_str
     elif isinstance(obj, dict):
-        return {k: serialize_datetime(v) for k, v in obj.items()}
+        converted = None
+        for key, value in obj.items():
+            new_value = serialize_datetime(value)
+            if new_value is not value:
+                if converted is None:
+                    converted = dict(obj)
+                converted[key] = new_value
+        return converted if converted is not None else obj
     elif isinstance(obj, list):
-        return [serialize_datetime(item) for item in obj]
+        converted = None
+        for index, item in enumerate(obj):
+            new_item = serialize_datetime(item)
+            if new_item is not item:
+                if converted is None:
+                    converted = list(obj)
+                converted[index] = new_item
+        return converted if converted is not None else obj
     return obj
 
 
 def ensure_json_serializable(data: Dict[str, Any]) -> Dict[str, Any]:
     """Ensure all data is JSON serializable before saving"""
-    try:
-        # Try to serialize and deserialize to catch any issues
-        json_str = json.dumps(data, default=str)
-        return json.loads(json_str)
-    except Exception:
-        # Fallback to recursive serialization
-        return serialize_datetime(data)
+    # A single recursive pass converting datetimes is enough here; the file
+    # writers already fall back to str() for anything else via default=str.
+    # The old dumps+loads round trip serialized every document twice.
+    return serialize_datetime(data)
 
 
 class FileDatabase:
@@ -56,54 +202,346 @@ class FileDatabase:
         self.conversations_dir.mkdir(exist_ok=True)
         self.memories_dir.mkdir(exist_ok=True)
         
-        # In-memory cache for faster access
+        # In-memory cache for faster access. Invariant: cached documents are
+        # always JSON-plain (datetimes already ISO strings) — writes normalize
+        # incoming data at the boundary and load_cache reads plain JSON — so
+        # reads never need to re-serialize whole documents.
         self._cache: Dict[str, Dict[str, Any]] = {
             'conversations': {},
             'memories': {}
         }
-        
-        # Lock for thread-safe operations
-        self._lock = asyncio.Lock()
+
+        # Secondary index: userId -> set of session ids, so per-user queries
+        # don't scan every conversation
+        self._user_sessions: Dict[str, set] = {}
+
+        # Same index for memories: every retrieval ranks one user's memories,
+        # so the candidate set should never be the whole collection
+        self._user_memories: Dict[str, set] = {}
+
+        # Messages already appended to each conversation's JSONL log, so a
+        # save only writes the new tail instead of the whole history
+        self._persisted_counts: Dict[str, int] = {}
+
+        # Stable (non-timestamp) meta fields as last written per session, so
+        # a plain message append skips the meta sidecar rewrite entirely
+        self._persisted_meta: Dict[str, Dict[str, Any]] = {}
+
+        # High-water mark for memory id allocation (millisecond component)
+        self._last_memory_ms = 0
+
+        # All memories live in one append-only JSONL log instead of one file
+        # per memory: an insert or update is a single line append, startup is
+        # one sequential read instead of a glob plus an open per memory, and
+        # the file count no longer grows with the collection. Lines are full
+        # documents (later lines win); deletes append a tombstone. The entry
+        # count tracks live + dead lines to decide when to compact.
+        self._memories_log = self.memories_dir / "memories.jsonl"
+        self._memory_log_entries = 0
+
+        # Reads are served straight from the cache on the event loop and need
+        # no locking. Mutations hold a lock only for the entity they touch -
+        # one lock per conversation plus one for the memories collection - so
+        # concurrent sessions' writes no longer queue behind a global lock.
+        self._lock = asyncio.Lock()  # startup cache load only
+        self._conversation_locks: Dict[str, asyncio.Lock] = {}
+        self._memories_lock = asyncio.Lock()
+
+        # Pending debounced conversation disk writes per session
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
         
         logger.info(f"✅ File-based database initialized at: {self.data_dir}")
     
+    def _meta_path(self, session_id: str) -> Path:
+        """Metadata sidecar for a conversation (everything except messages)"""
+        return self.conversations_dir / f"{session_id}.meta.json"
+
+    def _messages_path(self, session_id: str) -> Path:
+        """Append-only JSONL message log for a conversation"""
+        return self.conversations_dir / f"{session_id}.messages.jsonl"
+
+    def _legacy_path(self, session_id: str) -> Path:
+        """Old whole-document conversation file (pre-JSONL format)"""
+        return self.conversations_dir / f"{session_id}.json"
+
+    def _write_conversation_files(self, session_id: str, conversation: Dict[str, Any]) -> None:
+        """Persist a conversation as meta sidecar + append-only message log
+
+        Only messages beyond the already-persisted count are appended, so a
+        save on turn N costs O(new messages) instead of re-serializing the
+        whole history. Runs in a worker thread.
+        """
+        meta = {k: v for k, v in conversation.items() if k != 'messages'}
+
+        # updatedAt/lastMessageAt change on every message append, but they
+        # are recovered from the newest message timestamp at load - so the
+        # meta sidecar only needs rewriting when something durable changed
+        # (title, persona, isActive, ...). A plain append is then one file
+        # write instead of two.
+        stable_meta = {k: v for k, v in meta.items() if k not in _VOLATILE_META_KEYS}
+        if stable_meta != self._persisted_meta.get(session_id):
+            _write_document(self._meta_path(session_id), meta)
+            self._persisted_meta[session_id] = stable_meta
+
+        messages = conversation.get('messages', [])
+        messages_path = self._messages_path(session_id)
+        persisted = self._persisted_counts.get(session_id)
+
+        if persisted is None or persisted > len(messages) or not messages_path.exists():
+            # First write, legacy migration, or truncated/replaced history -
+            # rewrite the log atomically
+            tmp = messages_path.with_name(messages_path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for msg in messages:
+                    f.write(_dumps_compact(msg) + '\n')
+                # fsync before rename so a crash can't swap in a tmp file
+                # whose data never reached disk
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, messages_path)
+        elif persisted < len(messages):
+            with open(messages_path, 'a', encoding='utf-8') as f:
+                for msg in messages[persisted:]:
+                    f.write(_dumps_compact(msg) + '\n')
+
+        self._persisted_counts[session_id] = len(messages)
+
+        # Drop the legacy whole-document file once the new format is on disk
+        legacy = self._legacy_path(session_id)
+        if legacy.exists():
+            legacy.unlink()
+
     async def load_cache(self):
-        """Load all data into memory cache"""
+        """Load all data into memory cache
+
+        Per-file loads are independent, so each group is fanned out with
+        asyncio.gather instead of paying every file's read latency in
+        sequence - startup cost grows with the slowest file, not the sum.
+        """
         async with self._lock:
-            # Load conversations
-            for file_path in self.conversations_dir.glob("*.json"):
-                try:
-                    async with aiofiles.open(file_path, 'r') as f:
-                        content = await f.read()
-                        data = json.loads(content)
-                        self._cache['conversations'][data['sessionId']] = data
-                except Exception as e:
-                    logger.error(f"Error loading conversation {file_path}: {e}")
-            
-            # Load memories
-            for file_path in self.memories_dir.glob("*.json"):
-                try:
-                    async with aiofiles.open(file_path, 'r') as f:
-                        content = await f.read()
-                        data = json.loads(content)
-                        memory_id = file_path.stem
-                        self._cache['memories'][memory_id] = data
-                except Exception as e:
-                    logger.error(f"Error loading memory {file_path}: {e}")
-            
+            # Load conversations (meta sidecar + JSONL message log)
+            await asyncio.gather(*(
+                self._load_conversation(file_path)
+                for file_path in self.conversations_dir.glob("*.meta.json")
+            ))
+
+            # Legacy whole-document conversations (migrated on next save);
+            # loaded after the new format so it never wins a collision
+            await asyncio.gather(*(
+                self._load_legacy_conversation(file_path)
+                for file_path in self.conversations_dir.glob("*.json")
+                if not file_path.name.endswith('.meta.json')
+            ))
+
+            # Load memories: shared JSONL log first, then legacy per-memory
+            # files (the log is authoritative on a collision)
+            await self._load_memories_log()
+
+            legacy_memory_files = [
+                file_path for file_path in self.memories_dir.glob("*.json")
+            ]
+            await asyncio.gather(*(
+                self._load_memory(file_path)
+                for file_path in legacy_memory_files
+            ))
+
+            # Fold legacy files into the log, and drop dead log entries
+            # accumulated before shutdown, in one rewrite
+            live = len(self._cache['memories'])
+            if legacy_memory_files or self._memory_log_entries > max(
+                MEMORY_LOG_COMPACT_MIN_ENTRIES, 2 * live
+            ):
+                await _run_write(
+                    'memories',
+                    self._compact_memories_log,
+                    list(self._cache['memories'].values()),
+                    legacy_memory_files
+                )
+                self._memory_log_entries = live
+
             logger.info(f"Loaded {len(self._cache['conversations'])} conversations and {len(self._cache['memories'])} memories")
+
+    async def _load_conversation(self, file_path: Path) -> None:
+        """Load one conversation (meta sidecar + JSONL message log)"""
+        try:
+            async with aiofiles.open(file_path, 'r') as f:
+                data = _loads(await f.read())
+            session_id = data['sessionId']
+
+            messages = []
+            messages_path = self._messages_path(session_id)
+            if messages_path.exists():
+                async with aiofiles.open(messages_path, 'r') as f:
+                    content = await f.read()
+                for line in content.splitlines():
+                    if line.strip():
+                        messages.append(_loads(line))
+            data['messages'] = messages
+
+            # Meta timestamps may be stale (appends skip the sidecar
+            # rewrite) - the newest message timestamp is authoritative
+            if messages:
+                last_ts = messages[-1].get('timestamp')
+                if last_ts:
+                    if not data.get('lastMessageAt') or last_ts > data['lastMessageAt']:
+                        data['lastMessageAt'] = last_ts
+                    if not data.get('updatedAt') or last_ts > data['updatedAt']:
+                        data['updatedAt'] = last_ts
+
+            self._cache['conversations'][session_id] = data
+            self._persisted_counts[session_id] = len(messages)
+            self._persisted_meta[session_id] = {
+                k: v for k, v in data.items()
+                if k != 'messages' and k not in _VOLATILE_META_KEYS
+            }
+            self._index_conversation(data)
+        except Exception as e:
+            logger.error(f"Error loading conversation {file_path}: {e}")
+
+    async def _load_legacy_conversation(self, file_path: Path) -> None:
+        """Load one legacy whole-document conversation file"""
+        try:
+            async with aiofiles.open(file_path, 'r') as f:
+                content = await f.read()
+            data = _loads(content)
+            if data['sessionId'] in self._cache['conversations']:
+                return
+            self._cache['conversations'][data['sessionId']] = data
+            self._index_conversation(data)
+        except Exception as e:
+            logger.error(f"Error loading conversation {file_path}: {e}")
+
+    async def _load_memories_log(self) -> None:
+        """Replay the shared memory log (later lines win, tombstones delete)"""
+        if not self._memories_log.exists():
+            return
+        try:
+            async with aiofiles.open(self._memories_log, 'r') as f:
+                content = await f.read()
+        except Exception as e:
+            logger.error(f"Error reading memory log {self._memories_log}: {e}")
+            return
+
+        entries = 0
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                data = _loads(line)
+            except Exception as e:
+                logger.error(f"Error parsing memory log line: {e}")
+                continue
+            entries += 1
+            memory_id = data.get('_id')
+            if not memory_id:
+                continue
+            existing = self._cache['memories'].pop(memory_id, None)
+            if existing is not None:
+                self._unindex_memory(memory_id, existing)
+            if data.get('_deleted'):
+                continue
+            self._cache['memories'][memory_id] = data
+            self._index_memory(memory_id, data)
+        self._memory_log_entries = entries
+
+    async def _load_memory(self, file_path: Path) -> None:
+        """Load one legacy per-memory file (folded into the log on compaction)"""
+        if file_path.stem in self._cache['memories']:
+            return
+        try:
+            async with aiofiles.open(file_path, 'r') as f:
+                content = await f.read()
+            data = _loads(content)
+            self._cache['memories'][file_path.stem] = data
+            self._index_memory(file_path.stem, data)
+        except Exception as e:
+            logger.error(f"Error loading memory {file_path}: {e}")
+
+    def _append_memory_lines(self, docs: List[Dict[str, Any]]) -> None:
+        """Append document (or tombstone) lines to the shared memory log
+
+        Runs on the memory writer shard, so appends never interleave.
+        """
+        with open(self._memories_log, 'a', encoding='utf-8') as f:
+            for doc in docs:
+                f.write(_dumps_compact(doc) + '\n')
+
+    def _compact_memories_log(
+        self,
+        memories: List[Dict[str, Any]],
+        legacy_paths: List[Path] = ()
+    ) -> None:
+        """Rewrite the memory log with only live documents (atomic replace),
+        removing any legacy per-memory files that were folded in"""
+        tmp = self._memories_log.with_name(self._memories_log.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for doc in memories:
+                f.write(_dumps_compact(doc) + '\n')
+            # fsync before rename: the compacted log replaces the only copy
+            # of every memory, so its data must be on disk first
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._memories_log)
+        for path in legacy_paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    async def _maybe_compact_memories_log(self) -> None:
+        """Compact the memory log once dead entries outnumber live ones
+
+        Called with the memories lock held; the rewrite lands on the same
+        writer shard as the appends, so it can't reorder around them.
+        """
+        live = len(self._cache['memories'])
+        if self._memory_log_entries <= max(MEMORY_LOG_COMPACT_MIN_ENTRIES, 2 * live):
+            return
+        self._memory_log_entries = live
+        await _run_write(
+            'memories',
+            self._compact_memories_log,
+            list(self._cache['memories'].values())
+        )
     
     # Conversation methods
-    
+
+    def _index_conversation(self, data: Dict[str, Any]) -> None:
+        """Add a conversation to the userId index"""
+        user_id = data.get('userId')
+        if user_id:
+            self._user_sessions.setdefault(user_id, set()).add(data['sessionId'])
+
+    def _unindex_conversation(self, data: Dict[str, Any]) -> None:
+        """Remove a conversation from the userId index"""
+        user_id = data.get('userId')
+        sessions = self._user_sessions.get(user_id)
+        if sessions:
+            sessions.discard(data.get('sessionId'))
+            if not sessions:
+                del self._user_sessions[user_id]
+
+    def _conversations_for_query(self, query: Dict[str, Any]):
+        """Candidate conversations for a query, using the userId index when possible"""
+        user_id = query.get('userId')
+        if isinstance(user_id, str):
+            cache = self._cache['conversations']
+            return [
+                cache[session_id]
+                for session_id in self._user_sessions.get(user_id, ())
+                if session_id in cache
+            ]
+        return self._cache['conversations'].values()
+
     async def find_conversation(self, query: Dict[str, Any], sort: List[tuple] = None) -> Optional[Dict[str, Any]]:
         """Find a single conversation matching the query"""
         session_id = query.get('sessionId')
         if session_id and session_id in self._cache['conversations']:
-            return serialize_datetime(self._cache['conversations'][session_id].copy())
+            return self._cache['conversations'][session_id].copy()
         
-        # If no direct session_id match, search all conversations
+        # If no direct session_id match, search candidate conversations
         results = []
-        for conv in self._cache['conversations'].values():
+        for conv in self._conversations_for_query(query):
             match = True
             for key, value in query.items():
                 if not self._match_field(conv, key, value):
@@ -114,14 +552,20 @@ class FileDatabase:
         
         if not results:
             return None
-        
-        # Sort if specified
+
+        # Only one document is returned, so a single-key sort can be a
+        # linear min/max instead of sorting the whole result set
         if sort:
+            if len(sort) == 1:
+                field, direction = sort[0]
+                if direction == -1:
+                    return max(results, key=_sort_key(field))
+                return min(results, key=_sort_key(field))
             for field, direction in reversed(sort):
                 reverse = (direction == -1)
-                results.sort(key=lambda x: x.get(field, ''), reverse=reverse)
-        
-        return serialize_datetime(results[0]) if results else None
+                results.sort(key=_sort_key(field), reverse=reverse)
+
+        return results[0]
     
     async def find_conversations(self, query: Dict[str, Any] = None, sort: List[tuple] = None, limit: int = 0, projection: Dict[str, int] = None) -> List[Dict[str, Any]]:
         """Find multiple conversations matching the query"""
@@ -129,11 +573,14 @@ class FileDatabase:
             query = {}
         
         results = []
-        
+
+        # Materialized once instead of re-walking the query dict per document
+        query_items = list(query.items())
+
         # Filter by query
-        for conv in self._cache['conversations'].values():
+        for conv in self._conversations_for_query(query):
             match = True
-            for key, value in query.items():
+            for key, value in query_items:
                 # Handle MongoDB operators
                 if key == "messages.0":
                     # Check if first message exists
@@ -162,26 +609,41 @@ class FileDatabase:
                     break
             
             if match:
-                # Apply projection if specified
-                if projection:
-                    filtered_conv = {}
-                    for field, include in projection.items():
-                        if include and field in conv:
-                            filtered_conv[field] = conv[field]
-                    results.append(serialize_datetime(filtered_conv))
-                else:
-                    results.append(serialize_datetime(conv.copy()))
-        
-        # Sort results
+                # References only at this point - copies and projections are
+                # built just for the documents that survive sort + limit
+                results.append(conv)
+
+        results = self._sort_and_limit(results, sort, limit)
+
+        # Apply projection (or copy) only to the returned slice
+        if projection:
+            projected = []
+            for conv in results:
+                filtered_conv = {}
+                for field, include in projection.items():
+                    if include and field in conv:
+                        filtered_conv[field] = conv[field]
+                projected.append(filtered_conv)
+            return projected
+        return [conv.copy() for conv in results]
+
+    @staticmethod
+    def _sort_and_limit(results: List[Dict[str, Any]], sort: List[tuple], limit: int) -> List[Dict[str, Any]]:
+        """Order and truncate query results
+
+        The common single-key sort with a limit uses a heap to pick the
+        top N in one linear pass instead of sorting every match.
+        """
         if sort:
+            if limit > 0 and len(sort) == 1:
+                field, direction = sort[0]
+                if direction == -1:
+                    return heapq.nlargest(limit, results, key=_sort_key(field))
+                return heapq.nsmallest(limit, results, key=_sort_key(field))
             for field, direction in reversed(sort):
-                reverse = (direction == -1)
-                results.sort(key=lambda x: x.get(field, ''), reverse=reverse)
-        
-        # Limit results
+                results.sort(key=_sort_key(field), reverse=(direction == -1))
         if limit > 0:
-            results = results[:limit]
-        
+            return results[:limit]
         return results
     
     def _match_field(self, doc: Dict[str, Any], key: str, value: Any) -> bool:
@@ -194,14 +656,14 @@ class FileDatabase:
         # Handle MongoDB operators
         if isinstance(value, dict):
             if "$regex" in value:
-                # Simple regex match (case-insensitive if $options: "i")
-                import re
-                pattern = value["$regex"]
+                # Simple regex match (case-insensitive if $options: "i");
+                # patterns are compiled once and reused across documents
                 flags = re.IGNORECASE if value.get("$options") == "i" else 0
-                
+                pattern = _compile_pattern(value["$regex"], flags)
+
                 # Handle nested field searches (e.g., messages.content)
                 if "." in key:
-                    parts = key.split(".")
+                    parts = _split_path(key)
                     nested_value = doc
                     for part in parts:
                         if isinstance(nested_value, dict):
@@ -210,21 +672,28 @@ class FileDatabase:
                             # Search in list items
                             for item in nested_value:
                                 if isinstance(item, dict) and part in item:
-                                    if re.search(pattern, str(item[part]), flags):
+                                    if pattern.search(str(item[part])):
                                         return True
                             return False
                         else:
                             return False
-                    return bool(re.search(pattern, str(nested_value), flags))
+                    return bool(pattern.search(str(nested_value)))
                 else:
-                    return bool(re.search(pattern, str(doc_value), flags))
+                    return bool(pattern.search(str(doc_value)))
         
         return doc_value == value
     
+    def _conversation_lock(self, session_id: str) -> asyncio.Lock:
+        """Per-conversation mutation lock (created on first use)"""
+        lock = self._conversation_locks.get(session_id)
+        if lock is None:
+            lock = self._conversation_locks[session_id] = asyncio.Lock()
+        return lock
+
     async def insert_conversation(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a new conversation"""
-        async with self._lock:
-            session_id = data['sessionId']
+        session_id = data['sessionId']
+        async with self._conversation_lock(session_id):
             
             # Ensure all data is JSON serializable
             data = ensure_json_serializable(data)
@@ -237,68 +706,158 @@ class FileDatabase:
             
             # Save to cache
             self._cache['conversations'][session_id] = data
-            
-            # Save to file
-            file_path = self.conversations_dir / f"{session_id}.json"
-            async with aiofiles.open(file_path, 'w') as f:
-                await f.write(json.dumps(data, indent=2))
-            
+            self._index_conversation(data)
+
+            # Save to file (serialize + write off the event loop)
+            await _run_write(session_id, self._write_conversation_files, session_id, data)
+
             return data
     
-    async def update_conversation(self, session_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Update a conversation"""
-        async with self._lock:
+    async def update_conversation(
+        self,
+        session_id: str,
+        update_data: Dict[str, Any],
+        push_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Update a conversation, optionally appending to list fields ($push)"""
+        async with self._conversation_lock(session_id):
             if session_id not in self._cache['conversations']:
                 return None
-            
+
             # Ensure update data is JSON serializable
             update_data = ensure_json_serializable(update_data)
-            
-            # Update cache
+
+            # A wholesale messages replacement invalidates the append-only
+            # log; force a rewrite on this save
+            if 'messages' in update_data:
+                self._persisted_counts.pop(session_id, None)
+
+            # Update cache (reindex if the owning user changes)
             conversation = self._cache['conversations'][session_id]
-            conversation.update(update_data)
+            if 'userId' in update_data and update_data['userId'] != conversation.get('userId'):
+                self._unindex_conversation(conversation)
+                conversation.update(update_data)
+                self._index_conversation(conversation)
+            else:
+                conversation.update(update_data)
+            if push_data:
+                push_data = ensure_json_serializable(push_data)
+                for key, value in push_data.items():
+                    conversation.setdefault(key, []).append(value)
             conversation['updatedAt'] = datetime.utcnow().isoformat() + 'Z'
-            
-            # Save to file
-            file_path = self.conversations_dir / f"{session_id}.json"
-            async with aiofiles.open(file_path, 'w') as f:
-                await f.write(json.dumps(conversation, indent=2))
-            
+
+            # The cache is authoritative; the disk write is debounced so a
+            # burst of updates to this conversation costs one save
+            self._schedule_conversation_flush(session_id)
+
             return conversation
     
+    def _schedule_conversation_flush(self, session_id: str) -> None:
+        """Schedule a debounced disk write for a conversation (no-op when
+        one is already pending)"""
+        if session_id in self._flush_tasks:
+            return
+        self._flush_tasks[session_id] = asyncio.create_task(
+            self._flush_conversation(session_id)
+        )
+
+    async def _flush_conversation(self, session_id: str) -> None:
+        """Write a conversation to disk once the debounce window closes"""
+        try:
+            await asyncio.sleep(CONVERSATION_FLUSH_DELAY_SECONDS)
+            async with self._conversation_lock(session_id):
+                conversation = self._cache['conversations'].get(session_id)
+                if conversation is not None:
+                    await _run_write(session_id, self._write_conversation_files, session_id, conversation)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error flushing conversation {session_id}: {e}")
+        finally:
+            self._flush_tasks.pop(session_id, None)
+
+    async def flush(self) -> None:
+        """Wait for all pending debounced conversation writes (shutdown)"""
+        tasks = list(self._flush_tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def delete_conversation(self, session_id: str) -> bool:
         """Delete a conversation"""
-        async with self._lock:
+        flush_task = self._flush_tasks.pop(session_id, None)
+        if flush_task is not None:
+            flush_task.cancel()
+        async with self._conversation_lock(session_id):
             if session_id not in self._cache['conversations']:
                 return False
             
             # Remove from cache
+            self._unindex_conversation(self._cache['conversations'][session_id])
             del self._cache['conversations'][session_id]
-            
-            # Delete file
-            file_path = self.conversations_dir / f"{session_id}.json"
-            if file_path.exists():
-                file_path.unlink()
-            
+            self._persisted_counts.pop(session_id, None)
+            self._persisted_meta.pop(session_id, None)
+
+            # Delete files (both formats)
+            for file_path in (
+                self._meta_path(session_id),
+                self._messages_path(session_id),
+                self._legacy_path(session_id)
+            ):
+                if file_path.exists():
+                    file_path.unlink()
+
+            self._conversation_locks.pop(session_id, None)
             return True
     
     # Memory methods
-    
+
+    def _index_memory(self, memory_id: str, data: Dict[str, Any]) -> None:
+        """Add a memory to the userId index"""
+        user_id = data.get('userId')
+        if user_id:
+            self._user_memories.setdefault(user_id, set()).add(memory_id)
+
+    def _unindex_memory(self, memory_id: str, data: Dict[str, Any]) -> None:
+        """Remove a memory from the userId index"""
+        user_id = data.get('userId')
+        memories = self._user_memories.get(user_id)
+        if memories:
+            memories.discard(memory_id)
+            if not memories:
+                del self._user_memories[user_id]
+
+    def _memories_for_query(self, query: Dict[str, Any]):
+        """Candidate memories for a query, using the userId index when possible
+
+        Per-user lookups were a scan over every stored memory, so retrieval
+        cost grew with the whole collection rather than with one user's
+        share of it.
+        """
+        user_id = query.get('userId')
+        if isinstance(user_id, str):
+            cache = self._cache['memories']
+            return [
+                cache[memory_id]
+                for memory_id in self._user_memories.get(user_id, ())
+                if memory_id in cache
+            ]
+        return self._cache['memories'].values()
+
     async def find_memory(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find a single memory matching the query"""
         memory_id = query.get('_id')
         if memory_id and memory_id in self._cache['memories']:
-            return serialize_datetime(self._cache['memories'][memory_id].copy())
-        
+            return self._cache['memories'][memory_id].copy()
+
         # Search by other fields
-        for memory in self._cache['memories'].values():
+        for memory in self._memories_for_query(query):
             match = True
             for key, value in query.items():
                 if key not in memory or memory[key] != value:
                     match = False
                     break
             if match:
-                return serialize_datetime(memory.copy())
+                return memory.copy()
         
         return None
     
@@ -309,33 +868,42 @@ class FileDatabase:
         
         results = []
         
-        # Filter by query
-        for memory in self._cache['memories'].values():
+        # Filter by query (references only; copies are made after sort+limit)
+        for memory in self._memories_for_query(query):
             match = True
             for key, value in query.items():
                 if key not in memory or memory[key] != value:
                     match = False
                     break
             if match:
-                results.append(serialize_datetime(memory.copy()))
-        
-        # Sort results
-        if sort:
-            for field, direction in reversed(sort):
-                reverse = (direction == -1)
-                results.sort(key=lambda x: x.get(field, ''), reverse=reverse)
-        
-        # Limit results
-        if limit > 0:
-            results = results[:limit]
-        
-        return results
+                results.append(memory)
+
+        results = self._sort_and_limit(results, sort, limit)
+        return [memory.copy() for memory in results]
     
+    def _allocate_memory_id(self, session_id: str) -> str:
+        """Allocate a unique memory id
+
+        The id is still timestamp-based for readability, but a monotonic
+        high-water mark (plus a cache check for ids persisted before a
+        restart) guarantees uniqueness - two inserts landing in the same
+        millisecond used to get the same id and silently overwrite each
+        other.
+        """
+        ms = int(datetime.utcnow().timestamp() * 1000)
+        if ms <= self._last_memory_ms:
+            ms = self._last_memory_ms + 1
+        memory_id = f"{session_id}_{ms}"
+        while memory_id in self._cache['memories']:
+            ms += 1
+            memory_id = f"{session_id}_{ms}"
+        self._last_memory_ms = ms
+        return memory_id
+
     async def insert_memory(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a new memory"""
-        async with self._lock:
-            # Generate ID
-            memory_id = f"{data['sessionId']}_{int(datetime.utcnow().timestamp() * 1000)}"
+        async with self._memories_lock:
+            memory_id = self._allocate_memory_id(data['sessionId'])
             data['_id'] = memory_id
             
             # Ensure all data is JSON serializable
@@ -350,52 +918,109 @@ class FileDatabase:
             
             # Save to cache
             self._cache['memories'][memory_id] = data
-            
-            # Save to file
-            file_path = self.memories_dir / f"{memory_id}.json"
-            async with aiofiles.open(file_path, 'w') as f:
-                await f.write(json.dumps(data, indent=2))
-            
+            self._index_memory(memory_id, data)
+
+            # One line appended to the shared log (all memory writes route
+            # to the same shard, keeping the log strictly ordered)
+            await _run_write('memories', self._append_memory_lines, [data])
+            self._memory_log_entries += 1
+            await self._maybe_compact_memories_log()
+
             return data
     
     async def update_memory(self, memory_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a memory"""
-        async with self._lock:
+        async with self._memories_lock:
             if memory_id not in self._cache['memories']:
                 return None
             
             # Ensure update data is JSON serializable
             update_data = ensure_json_serializable(update_data)
             
-            # Update cache
+            # Update cache (reindex if the owning user changes)
             memory = self._cache['memories'][memory_id]
-            memory.update(update_data)
+            if 'userId' in update_data and update_data['userId'] != memory.get('userId'):
+                self._unindex_memory(memory_id, memory)
+                memory.update(update_data)
+                self._index_memory(memory_id, memory)
+            else:
+                memory.update(update_data)
             
             if 'metadata' not in memory:
                 memory['metadata'] = {}
             memory['metadata']['updatedAt'] = datetime.utcnow().isoformat() + 'Z'
-            
-            # Save to file
-            file_path = self.memories_dir / f"{memory_id}.json"
-            async with aiofiles.open(file_path, 'w') as f:
-                await f.write(json.dumps(memory, indent=2))
-            
+
+            # The full updated document supersedes earlier log lines
+            await _run_write('memories', self._append_memory_lines, [memory])
+            self._memory_log_entries += 1
+            await self._maybe_compact_memories_log()
+
             return memory
     
+    async def update_memories(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Update several memories in one locked pass and one log append
+
+        The access-metadata bumps after a retrieval touch every returned
+        memory; issued as individual update_memory calls they paid a lock
+        acquisition, a writer-shard hop and a log append per document.
+        Batched, the whole set costs one of each.
+
+        Args:
+            updates: Mapping of memory id to the fields to merge in
+
+        Returns:
+            Number of memories actually updated
+        """
+        if not updates:
+            return 0
+        async with self._memories_lock:
+            now = datetime.utcnow().isoformat() + 'Z'
+            changed = []
+            for memory_id, update_data in updates.items():
+                memory = self._cache['memories'].get(memory_id)
+                if memory is None:
+                    continue
+                update_data = ensure_json_serializable(update_data)
+                if 'userId' in update_data and update_data['userId'] != memory.get('userId'):
+                    self._unindex_memory(memory_id, memory)
+                    memory.update(update_data)
+                    self._index_memory(memory_id, memory)
+                else:
+                    memory.update(update_data)
+                if 'metadata' not in memory:
+                    memory['metadata'] = {}
+                memory['metadata']['updatedAt'] = now
+                changed.append(memory)
+
+            if changed:
+                await _run_write('memories', self._append_memory_lines, changed)
+                self._memory_log_entries += len(changed)
+                await self._maybe_compact_memories_log()
+            return len(changed)
+
     async def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory"""
-        async with self._lock:
+        async with self._memories_lock:
             if memory_id not in self._cache['memories']:
                 return False
             
             # Remove from cache
+            self._unindex_memory(memory_id, self._cache['memories'][memory_id])
             del self._cache['memories'][memory_id]
-            
-            # Delete file
-            file_path = self.memories_dir / f"{memory_id}.json"
-            if file_path.exists():
-                file_path.unlink()
-            
+
+            # Tombstone in the shared log; also drop any legacy per-memory
+            # file so it can't resurrect the document on the next load
+            await _run_write(
+                'memories',
+                self._append_memory_lines,
+                [{'_id': memory_id, '_deleted': True}]
+            )
+            self._memory_log_entries += 1
+            legacy = self.memories_dir / f"{memory_id}.json"
+            if legacy.exists():
+                legacy.unlink()
+            await self._maybe_compact_memories_log()
+
             return True
     
     async def count_documents(self, collection: str, query: Dict[str, Any] = None) -> int:
@@ -426,7 +1051,11 @@ class FileDatabase:
 
 class FileCollection:
     """File collection wrapper for MongoDB-like API"""
-    
+
+    # These wrappers are created per operation on the hot path; slots skip
+    # the per-instance __dict__ each construction would otherwise allocate
+    __slots__ = ('db', 'name')
+
     def __init__(self, db: FileDatabase, name: str):
         self.db = db
         self.name = name
@@ -456,12 +1085,16 @@ class FileCollection:
     
     async def update_one(self, query: Dict[str, Any], update: Dict[str, Any]) -> 'FileUpdateResult':
         """Update one document"""
-        # Extract the actual update data from $set operator
-        update_data = update.get('$set', update)
-        
+        # Extract the actual update data from $set/$push operators
+        push_data = update.get('$push')
+        if '$set' in update or push_data:
+            update_data = update.get('$set', {})
+        else:
+            update_data = update
+
         if self.name == 'conversations':
             session_id = query.get('sessionId')
-            result = await self.db.update_conversation(session_id, update_data)
+            result = await self.db.update_conversation(session_id, update_data, push_data)
         elif self.name == 'memories':
             memory_id = query.get('_id')
             result = await self.db.update_memory(memory_id, update_data)
@@ -490,7 +1123,9 @@ class FileCollection:
 
 class FileCursor:
     """Cursor for iterating over query results"""
-    
+
+    __slots__ = ('db', 'collection', 'query', 'projection', '_sort', '_limit')
+
     def __init__(self, db: FileDatabase, collection: str, query: Dict[str, Any], projection: Dict[str, int] = None):
         self.db = db
         self.collection = collection
@@ -525,7 +1160,9 @@ class FileCursor:
 
 class FileInsertResult:
     """Result of insert operation"""
-    
+
+    __slots__ = ('inserted_id', 'acknowledged')
+
     def __init__(self, document: Optional[Dict[str, Any]]):
         self.inserted_id = document.get('_id') if document else None
         self.acknowledged = document is not None
@@ -533,7 +1170,9 @@ class FileInsertResult:
 
 class FileUpdateResult:
     """Result of update operation"""
-    
+
+    __slots__ = ('modified_count', 'acknowledged')
+
     def __init__(self, success: bool):
         self.modified_count = 1 if success else 0
         self.acknowledged = success
@@ -541,7 +1180,9 @@ class FileUpdateResult:
 
 class FileDeleteResult:
     """Result of delete operation"""
-    
+
+    __slots__ = ('deleted_count', 'acknowledged')
+
     def __init__(self, count: int):
         self.deleted_count = count
         self.acknowledged = count > 0
@@ -566,9 +1207,10 @@ async def connect_file_db(data_dir: str = "data") -> FileDatabase:
 
 
 async def disconnect_file_db():
-    """Disconnect from file database (no-op for file-based)"""
+    """Disconnect from file database, draining any pending writes"""
     global file_db
     if file_db:
+        await file_db.flush()
         logger.info("✅ File database closed")
         file_db = None
 
@@ -3,6 +3,7 @@ Emotion detection engine for analyzing user emotions
 """
 
 import json
+import asyncio
 from pathlib import Path
 from typing import Dict, Any, Optional
 from app.config.constants import (
@@ -11,6 +12,77 @@ from app.config.constants import (
     EMOTION_KEYWORDS
 )
 from app.utils.logger import logger
+from app.utils.llm_json import parse_llm_json
+
+
+# Static lookup tables, built once at import instead of being rebuilt as
+# literals on every call
+EMOTIONAL_CONTEXTS = {
+    EmotionType.SAD.value: 'The user seems to be feeling down. Respond with empathy and gentle support.',
+    EmotionType.ANXIOUS.value: 'The user appears anxious or worried. Provide calm reassurance and practical help.',
+    EmotionType.EXCITED.value: 'The user is excited! Match their energy with enthusiasm.',
+    EmotionType.ANGRY.value: 'The user seems frustrated or angry. Stay calm and validate their feelings.',
+    EmotionType.HAPPY.value: 'The user is in a positive mood. Share in their happiness.',
+    EmotionType.GRATEFUL.value: 'The user is expressing gratitude. Acknowledge it warmly.',
+    EmotionType.CONFUSED.value: 'The user seems confused. Provide clear, patient explanations.',
+    EmotionType.NEUTRAL.value: 'The user has a neutral tone. Respond naturally and helpfully.'
+}
+
+POSITIVE_EMOTIONS = frozenset({
+    EmotionType.HAPPY,
+    EmotionType.EXCITED,
+    EmotionType.GRATEFUL
+})
+NEGATIVE_EMOTIONS = frozenset({
+    EmotionType.SAD,
+    EmotionType.ANXIOUS,
+    EmotionType.ANGRY,
+    EmotionType.CONFUSED
+})
+SIGNIFICANT_EMOTIONS = frozenset({
+    EmotionType.SAD.value,
+    EmotionType.ANXIOUS.value,
+    EmotionType.EXCITED.value,
+    EmotionType.ANGRY.value,
+    EmotionType.GRATEFUL.value
+})
+
+# Below this many words the LLM emotion pass is skipped: inputs like "ok"
+# or "yes please" carry no emotional signal the keyword scan would miss,
+# and the round trip was the single biggest cost of handling them
+MIN_WORDS_FOR_LLM_EMOTION = 3
+
+# Static analyzer instructions live entirely in the system message so the
+# prompt prefix is byte-identical across calls - providers with prefix
+# caching then only reprocess the short user text
+EMOTION_ANALYSIS_SYSTEM_PROMPT = """You are an expert emotion analyzer. Respond only with valid JSON.
+
+Analyze the emotional content of the user's text. Identify:
+1. Primary emotion (happy, sad, anxious, excited, angry, neutral, confused, grateful)
+2. Sentiment (positive, negative, neutral)
+3. Intensity (low, medium, high)
+4. Confidence score (0-1)
+
+Respond in JSON format:
+{
+  "emotion": "emotion_name",
+  "sentiment": "sentiment_type",
+  "intensity": "intensity_level",
+  "confidence": 0.0,
+  "details": {
+    "reasoning": "brief explanation"
+  }
+}"""
+
+# Constant analyzer request settings, built once instead of per call; all
+# keys the LLM service reads are pinned, so the dict is never mutated.
+# Temperature 0: the output is parsed as strict JSON, so determinism only
+# helps - and it makes the response cache eligible for analyzer reruns
+_LLM_EMOTION_OPTIONS = {
+    'temperature': 0,
+    'max_tokens': 200,
+    'response_format': {'type': 'json_object'}
+}
 
 
 class EmotionEngine:
@@ -20,6 +92,12 @@ class EmotionEngine:
         self.llm_service = llm_service
         self.audio_emotion_service = audio_emotion_service
         self.emotion_keywords = self._initialize_emotion_keywords()
+        # Lowercased once here so the per-message scan doesn't re-lower
+        # every keyword on every call
+        self._keyword_table = [
+            (emotion, tuple(keyword.lower() for keyword in keywords))
+            for emotion, keywords in self.emotion_keywords.items()
+        ]
     
     def _initialize_emotion_keywords(self) -> Dict[EmotionType, list]:
         """Initialize emotion keywords with emojis"""
@@ -79,12 +157,31 @@ class EmotionEngine:
         """
         try:
             quick_emotion = self.quick_emotion_detection(text)
-            
-            llm_emotion = await self.llm_emotion_detection(text)
-            
-            # Get audio emotion if available
+
+            # Several keyword hits is an unambiguous signal - route on the
+            # precomputed table alone and skip the LLM round trip. The same
+            # goes for trivially short inputs, where the keyword fallback is
+            # as good as the model's guess.
+            llm_needed = (
+                quick_emotion['confidence'] < 0.9
+                and len(text.split()) >= MIN_WORDS_FOR_LLM_EMOTION
+            )
+            if not llm_needed:
+                logger.debug('Skipping LLM emotion pass (confident keywords or trivial input)')
+            audio_needed = bool(audio_path and self.audio_emotion_service)
+
+            # The LLM pass and the audio pass are independent analyses of
+            # the same turn - run them concurrently rather than in sequence
+            llm_emotion: Dict[str, Any] = {}
             audio_emotion = None
-            if audio_path and self.audio_emotion_service:
+            if llm_needed and audio_needed:
+                llm_emotion, audio_emotion = await asyncio.gather(
+                    self.llm_emotion_detection(text),
+                    self.audio_emotion_service.detect_emotion_from_audio(audio_path)
+                )
+            elif llm_needed:
+                llm_emotion = await self.llm_emotion_detection(text)
+            elif audio_needed:
                 audio_emotion = await self.audio_emotion_service.detect_emotion_from_audio(audio_path)
             
             # Combine emotions with priority: audio > LLM > quick
@@ -144,18 +241,12 @@ class EmotionEngine:
             Dictionary with emotion, sentiment, confidence, and intensity
         """
         lower_text = text.lower()
-        emotion_scores = {}
-        
-        for emotion, keywords in self.emotion_keywords.items():
-            emotion_scores[emotion] = 0
-            for keyword in keywords:
-                if keyword.lower() in lower_text:
-                    emotion_scores[emotion] += 1
-        
+
         max_score = 0
         detected_emotion = EmotionType.NEUTRAL
-        
-        for emotion, score in emotion_scores.items():
+
+        for emotion, keywords in self._keyword_table:
+            score = sum(1 for keyword in keywords if keyword in lower_text)
             if score > max_score:
                 max_score = score
                 detected_emotion = emotion
@@ -180,49 +271,19 @@ class EmotionEngine:
             Dictionary with emotion analysis results
         """
         try:
-            prompt = f"""Analyze the emotional content of the following text. Identify:
-1. Primary emotion (happy, sad, anxious, excited, angry, neutral, confused, grateful)
-2. Sentiment (positive, negative, neutral)
-3. Intensity (low, medium, high)
-4. Confidence score (0-1)
-
-Text: "{text}"
-
-Respond in JSON format:
-{{
-  "emotion": "emotion_name",
-  "sentiment": "sentiment_type",
-  "intensity": "intensity_level",
-  "confidence": 0.0,
-  "details": {{
-    "reasoning": "brief explanation"
-  }}
-}}"""
-
             response = await self.llm_service.generate_completion([
-                {'role': 'system', 'content': 'You are an expert emotion analyzer. Respond only with valid JSON.'},
-                {'role': 'user', 'content': prompt}
-            ], {
-                'temperature': 0.3,
-                'max_tokens': 200
-            })
+                {'role': 'system', 'content': EMOTION_ANALYSIS_SYSTEM_PROMPT},
+                {'role': 'user', 'content': f'Text: "{text}"'}
+            ], _LLM_EMOTION_OPTIONS)
 
             logger.debug(f'LLM emotion response: {response}')
-            
-            # Try to extract JSON if wrapped in markdown code blocks
-            response_text = response.strip()
-            if response_text.startswith('```'):
-                # Extract JSON from code block
-                lines = response_text.split('\n')
-                json_lines = [line for line in lines if line and not line.startswith('```')]
-                response_text = '\n'.join(json_lines)
-            
-            result = json.loads(response_text)
+
+            result = parse_llm_json(response)
+            if result is None:
+                logger.error('LLM emotion detection failed - invalid JSON')
+                logger.debug(f'Response was: {response[:200]}...')
+                return {}
             return result
-        except json.JSONDecodeError as error:
-            logger.error(f'LLM emotion detection failed - invalid JSON: {error}')
-            logger.debug(f'Response was: {response[:200]}...')
-            return {}
         except Exception as error:
             logger.error(f'LLM emotion detection failed: {error}')
             return {}
@@ -237,23 +298,11 @@ Respond in JSON format:
         Returns:
             Sentiment type
         """
-        positive_emotions = [
-            EmotionType.HAPPY,
-            EmotionType.EXCITED,
-            EmotionType.GRATEFUL
-        ]
-        negative_emotions = [
-            EmotionType.SAD,
-            EmotionType.ANXIOUS,
-            EmotionType.ANGRY,
-            EmotionType.CONFUSED
-        ]
-        
-        if emotion in positive_emotions:
+        if emotion in POSITIVE_EMOTIONS:
             return SentimentType.POSITIVE
-        elif emotion in negative_emotions:
+        elif emotion in NEGATIVE_EMOTIONS:
             return SentimentType.NEGATIVE
-        
+
         return SentimentType.NEUTRAL
     
     def generate_emotional_context(self, emotion_data: Dict[str, Any]) -> str:
@@ -269,18 +318,7 @@ Respond in JSON format:
         emotion = emotion_data.get('emotion', 'neutral')
         intensity = emotion_data.get('intensity', 'medium')
         
-        contexts = {
-            EmotionType.SAD.value: 'The user seems to be feeling down. Respond with empathy and gentle support.',
-            EmotionType.ANXIOUS.value: 'The user appears anxious or worried. Provide calm reassurance and practical help.',
-            EmotionType.EXCITED.value: 'The user is excited! Match their energy with enthusiasm.',
-            EmotionType.ANGRY.value: 'The user seems frustrated or angry. Stay calm and validate their feelings.',
-            EmotionType.HAPPY.value: 'The user is in a positive mood. Share in their happiness.',
-            EmotionType.GRATEFUL.value: 'The user is expressing gratitude. Acknowledge it warmly.',
-            EmotionType.CONFUSED.value: 'The user seems confused. Provide clear, patient explanations.',
-            EmotionType.NEUTRAL.value: 'The user has a neutral tone. Respond naturally and helpfully.'
-        }
-        
-        context = contexts.get(emotion, contexts[EmotionType.NEUTRAL.value])
+        context = EMOTIONAL_CONTEXTS.get(emotion, EMOTIONAL_CONTEXTS[EmotionType.NEUTRAL.value])
         
         if intensity == 'high':
             context += ' The emotion is quite strong, so be especially mindful in your response.'
@@ -300,12 +338,4 @@ Respond in JSON format:
         emotion = emotion_data.get('emotion', 'neutral')
         intensity = emotion_data.get('intensity', 'low')
         
-        significant_emotions = [
-            EmotionType.SAD.value,
-            EmotionType.ANXIOUS.value,
-            EmotionType.EXCITED.value,
-            EmotionType.ANGRY.value,
-            EmotionType.GRATEFUL.value
-        ]
-        
-        return emotion in significant_emotions and intensity != 'low'
+        return emotion in SIGNIFICANT_EMOTIONS and intensity != 'low'
@@ -2,12 +2,142 @@
 Memory management engine for short-term and long-term memory
 """
 
+import re
 import json
+import asyncio
+from bson import ObjectId
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from app.config.database import get_database, get_redis
-from app.config.constants import MAX_SHORT_TERM_MEMORY, MemoryTag
+from app.database.file_db import FileCollection
+from app.config.constants import MAX_SHORT_TERM_MEMORY, MAX_CONTEXT_TOKENS, MemoryTag
 from app.utils.logger import logger
+from app.utils.token_counter import exceeds_token_limit, trim_messages_to_budget
+from app.utils.llm_json import parse_llm_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bind the snapshot serializer once at import instead of re-checking orjson
+# availability on every Redis flush
+if orjson is not None:
+    def _dumps_session(data: Dict[str, Any]) -> str:
+        """Serialize a session snapshot (orjson)"""
+        return orjson.dumps(data, default=str).decode('utf-8')
+else:
+    def _dumps_session(data: Dict[str, Any]) -> str:
+        """Serialize a session snapshot (stdlib fallback)"""
+        return json.dumps(data, default=str)
+
+
+# Static analyzer instructions, built once instead of per call; only the
+# conversation text slot changes between runs
+MEMORY_ANALYSIS_PROMPT = """Analyze this conversation and identify if there are any important moments worth saving to long-term memory.
+
+Important moments include:
+- Goals or aspirations mentioned
+- Significant achievements
+- Emotional breakthroughs or vulnerable moments
+- Important decisions
+- Meaningful insights or realizations
+
+Conversation:
+{conversation_text}
+
+If there's an important moment, respond with JSON:
+{{
+  "hasImportantMoment": true,
+  "title": "Brief title",
+  "summary": "Summary of the moment",
+  "importance": 7,
+  "tags": ["goal", "achievement", "emotional_moment", "important", "casual"],
+  "relatedTopics": ["topic1", "topic2"]
+}}
+
+IMPORTANT: Use ONLY these exact tags: "goal", "achievement", "emotional_moment", "important", "casual"
+
+If no important moment, respond with: {{"hasImportantMoment": false}}"""
+
+# Constant analyzer request settings, built once instead of per call; all
+# keys the LLM service reads are pinned, so the dict is never mutated.
+# Temperature 0: the output is parsed as strict JSON, so determinism only
+# helps - and it makes the response cache eligible for analyzer reruns
+_MEMORY_ANALYSIS_OPTIONS = {
+    'temperature': 0,
+    'max_tokens': 300,
+    'response_format': {'type': 'json_object'}
+}
+
+# Translate table for tag normalization - one C-level pass instead of
+# chained str.replace allocations per tag
+_TAG_SEPARATOR_TABLE = str.maketrans(' -', '__')
+
+# Every accepted tag spelling resolved to its canonical value in one flat
+# map built at import: after separator translation a single dict lookup
+# replaces the old membership test plus two alias-mapping fallbacks per tag
+_TAG_ALIASES = {
+    'emotional breakthrough': 'emotional_moment',
+    'emotional_breakthrough': 'emotional_moment',
+    'breakthrough': 'emotional_moment',
+    'emotion': 'emotional_moment',
+    'emotional': 'emotional_moment',
+    'decision': 'important',
+    'insight': 'important',
+    'realization': 'important',
+    'milestone': 'achievement',
+    'success': 'achievement',
+    'accomplishment': 'achievement',
+    'aspiration': 'goal',
+    'objective': 'goal',
+    'target': 'goal',
+    'plan': 'goal'
+}
+_TAG_NORMAL_MAP = {
+    tag: tag
+    for tag in ('goal', 'achievement', 'emotional_moment', 'important', 'casual')
+}
+_TAG_NORMAL_MAP.update(
+    (alias.translate(_TAG_SEPARATOR_TABLE), canonical)
+    for alias, canonical in _TAG_ALIASES.items()
+)
+
+# Chat traffic is repetitive, so formatted context strings for recent
+# (user, message) pairs are worth keeping around
+CONTEXT_CACHE_MAX_SIZE = 256
+
+# Pre-lowered memory text kept for relevance scoring; sized to hold every
+# memory the ranking path can touch for a healthy number of active users
+LOWERED_CACHE_MAX_SIZE = 2048
+
+# Messages arriving close together (several quick user messages, or bursts
+# of session updates) are coalesced into one Redis snapshot write
+REDIS_FLUSH_DELAY_SECONDS = 0.1
+
+def _format_memory_line(mem: Dict[str, Any]) -> str:
+    """One prompt line for a memory; content wins over summary so exact
+    dates/facts (e.g. "August 5th") reach the prompt"""
+    content = mem.get('content') or mem.get('summary') or ''
+    if len(content) > 500:
+        content = content[:500] + '...'
+    return f"- [{mem.get('title') or 'Untitled'}]: {content}"
+
+
+# Filler words carry no retrieval signal but match almost every memory, so
+# scoring on them wastes the whole ranking pass; a greeting like "ok thanks"
+# reduces to no query words at all and takes the cheap importance path
+_STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'am',
+    'i', 'me', 'my', 'you', 'your', 'we', 'our', 'it', 'its', 'this',
+    'that', 'these', 'those', 'and', 'or', 'but', 'so', 'if', 'then',
+    'to', 'of', 'in', 'on', 'at', 'for', 'with', 'about', 'from', 'by',
+    'do', 'does', 'did', 'can', 'could', 'will', 'would', 'should',
+    'have', 'has', 'had', 'not', 'no', 'yes', 'ok', 'okay', 'hi',
+    'hey', 'hello', 'thanks', 'thank', 'please', 'what', 'when',
+    'where', 'who', 'how', 'why', 'just', 'really', 'very', 'some'
+])
 
 
 class MemoryEngine:
@@ -16,35 +146,41 @@ class MemoryEngine:
     def __init__(self, llm_service):
         self.llm_service = llm_service
         self.short_term_memory: Dict[str, Dict[str, Any]] = {}
-        
-        self.valid_tags = ['goal', 'achievement', 'emotional_moment', 'important', 'casual']
-        self.tag_mapping = {
-            'emotional breakthrough': 'emotional_moment',
-            'emotional_breakthrough': 'emotional_moment',
-            'breakthrough': 'emotional_moment',
-            'emotion': 'emotional_moment',
-            'emotional': 'emotional_moment',
-            'decision': 'important',
-            'insight': 'important',
-            'realization': 'important',
-            'milestone': 'achievement',
-            'success': 'achievement',
-            'accomplishment': 'achievement',
-            'aspiration': 'goal',
-            'objective': 'goal',
-            'target': 'goal',
-            'plan': 'goal'
-        }
-    
+        # Message count per session at the last analyzer run, so repeat
+        # triggers on an unchanged conversation skip the LLM entirely
+        self._last_analyzed_len: Dict[str, int] = {}
+        # Collection handles, resolved once per name - the database is a
+        # process-wide singleton, so re-resolving per operation was waste
+        self._collections: Dict[str, Any] = {}
+        # Formatted context strings keyed by (user_id, limit, message), so a
+        # repeated query skips the memory fetch and ranking entirely; entries
+        # for a user are dropped whenever their memories change
+        self._context_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        # Pending debounced Redis snapshot writes per session
+        self._redis_flush_tasks: Dict[str, asyncio.Task] = {}
+        # Lowercased (title, summary, content) per memory id, so the scoring
+        # loop doesn't re-lower up to 500 chars of content per memory on
+        # every query; entries carry the memory's updatedAt stamp and are
+        # refreshed when it moves
+        self._lowered_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # Users known to have no long-term memories at all - brand-new users
+        # hit memory retrieval on every message, so the empty answer is
+        # remembered until their first memory is saved
+        self._empty_memory_users: set = set()
+
     def _get_collection(self, collection_name: str):
         """Get collection from database (supports both MongoDB and file-based)"""
-        db = get_database()
-        
-        # Support both MongoDB and file-based DB
-        if hasattr(db, 'get_collection'):
-            return db.get_collection(collection_name)
-        else:
-            return db[collection_name]
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            db = get_database()
+
+            # Support both MongoDB and file-based DB
+            if hasattr(db, 'get_collection'):
+                collection = db.get_collection(collection_name)
+            else:
+                collection = db[collection_name]
+            self._collections[collection_name] = collection
+        return collection
     
     def normalize_tags(self, tags: Optional[List[str]]) -> List[str]:
         """
@@ -61,20 +197,18 @@ class MemoryEngine:
         
         normalized = []
         for tag in tags:
-            normalized_tag = tag.lower().strip().replace(' ', '_')
-            
-            if normalized_tag in self.valid_tags:
-                normalized.append(normalized_tag)
-            else:
-                mapped_tag = self.tag_mapping.get(tag.lower().strip()) or \
-                            self.tag_mapping.get(normalized_tag)
-                
-                if mapped_tag:
-                    normalized.append(mapped_tag)
-                else:
-                    normalized.append(MemoryTag.CASUAL.value)
-        
+            key = tag.lower().strip().translate(_TAG_SEPARATOR_TABLE)
+            normalized.append(_TAG_NORMAL_MAP.get(key, MemoryTag.CASUAL.value))
+
         return list(dict.fromkeys(normalized))
+
+    def _invalidate_context_cache(self, user_id: Optional[str] = None) -> None:
+        """Drop cached context strings after a user's memories change"""
+        if user_id is None:
+            self._context_cache.clear()
+            return
+        for key in [k for k in self._context_cache if k[0] == user_id]:
+            del self._context_cache[key]
     
     async def initialize_session(
         self,
@@ -112,7 +246,11 @@ class MemoryEngine:
                             'role': msg.get('role'),
                             'content': msg.get('content'),
                             'emotion': msg.get('emotion'),
-                            'timestamp': msg.get('timestamp')
+                            'timestamp': msg.get('timestamp'),
+                            'chat': {
+                                'role': msg.get('role'),
+                                'content': msg.get('content') or ''
+                            }
                         }
                         for msg in recent_messages
                     ],
@@ -155,26 +293,57 @@ class MemoryEngine:
                     'content': content,
                     'emotion': emotion,
                     'sentiment': sentiment,
-                    'timestamp': datetime.utcnow()
+                    'timestamp': datetime.utcnow(),
+                    # Chat-format projection built once at append time;
+                    # history assembly reuses it every turn instead of
+                    # re-projecting the whole window
+                    'chat': {'role': role, 'content': content or ''}
                 }
                 
                 session_memory['messages'].append(message)
                 
                 if len(session_memory['messages']) > MAX_SHORT_TERM_MEMORY:
                     session_memory['messages'] = session_memory['messages'][-MAX_SHORT_TERM_MEMORY:]
-                
-                redis_client = get_redis()
-                if redis_client:
-                    await redis_client.setex(
-                        f"session:{session_id}",
-                        3600,
-                        json.dumps(session_memory, default=str)
-                    )
-            
+
+                self._schedule_redis_flush(session_id)
+
             return True
         except Exception as error:
             logger.error(f'Error adding message to memory: {error}')
             raise
+
+    def _schedule_redis_flush(self, session_id: str) -> None:
+        """Debounce the Redis session snapshot
+
+        Every add_message used to serialize and SETEX the whole session
+        immediately, so messages landing close together paid one full
+        snapshot write each. A short deferral lets a burst collapse into a
+        single write of the latest state.
+        """
+        if get_redis() is None or session_id in self._redis_flush_tasks:
+            return
+        self._redis_flush_tasks[session_id] = asyncio.create_task(
+            self._flush_session_to_redis(session_id)
+        )
+
+    async def _flush_session_to_redis(self, session_id: str) -> None:
+        """Write the current session snapshot to Redis after the debounce window"""
+        try:
+            await asyncio.sleep(REDIS_FLUSH_DELAY_SECONDS)
+            session_memory = self.short_term_memory.get(session_id)
+            redis_client = get_redis()
+            if session_memory is not None and redis_client:
+                await redis_client.setex(
+                    f"session:{session_id}",
+                    3600,
+                    _dumps_session(session_memory)
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logger.error(f'Error flushing session memory to Redis: {error}')
+        finally:
+            self._redis_flush_tasks.pop(session_id, None)
     
     def get_short_term_memory(self, session_id: str) -> Dict[str, Any]:
         """
@@ -186,11 +355,12 @@ class MemoryEngine:
         Returns:
             Short-term memory dictionary
         """
-        return self.short_term_memory.get(session_id, {
-            'messages': [],
-            'persona': 'friend',
-            'context': {}
-        })
+        session_memory = self.short_term_memory.get(session_id)
+        if session_memory is None:
+            # Built only on a miss - as a .get() default it was allocated
+            # (three fresh containers) on every call of the chat hot path
+            return {'messages': [], 'persona': 'friend', 'context': {}}
+        return session_memory
     
     async def get_conversation_context(self, session_id: str, limit: int = 10) -> str:
         """
@@ -204,18 +374,52 @@ class MemoryEngine:
             Formatted conversation context
         """
         try:
-            session_memory = self.get_short_term_memory(session_id)
-            recent_messages = session_memory['messages'][-limit:] if session_memory['messages'] else []
-            
-            context = '\n'.join([
+            kept = await self.get_conversation_messages(session_id, limit)
+
+            # Generator feeds the join directly - no intermediate list
+            context = '\n'.join(
                 f"{msg['role']}: {msg['content']}"
-                for msg in recent_messages
-            ])
-            
+                for msg in kept
+            )
+
             return context
         except Exception as error:
             logger.error(f'Error getting conversation context: {error}')
             return ''
+
+    async def get_conversation_messages(self, session_id: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Get recent conversation messages as chat-format dicts, ready to be
+        passed straight to the LLM without string round trips
+
+        Args:
+            session_id: Session identifier
+            limit: Maximum number of messages to include
+
+        Returns:
+            List of {'role', 'content'} dicts within the token budget
+        """
+        try:
+            session_memory = self.get_short_term_memory(session_id)
+            messages = session_memory['messages']
+            # Slicing copies the list, so skip it when the history already
+            # fits the window (the common case: MAX_SHORT_TERM_MEMORY caps
+            # the history near the default limit anyway)
+            recent_messages = messages if len(messages) <= limit else messages[-limit:]
+
+            # Keep the most recent messages that fit the token budget; skip
+            # the trimming pass entirely when the window is clearly under it
+            if exceeds_token_limit(recent_messages, MAX_CONTEXT_TOKENS):
+                kept = trim_messages_to_budget(recent_messages, MAX_CONTEXT_TOKENS)
+            else:
+                kept = recent_messages
+
+            # Both construction sites attach the 'chat' projection, so no
+            # dicts are allocated here beyond the list itself
+            return [msg['chat'] for msg in kept]
+        except Exception as error:
+            logger.error(f'Error getting conversation messages: {error}')
+            return []
     
     async def save_long_term_memory(
         self,
@@ -263,7 +467,10 @@ class MemoryEngine:
             
             result = await memories_collection.insert_one(memory_doc)
             memory_doc['_id'] = str(result.inserted_id)
-            
+
+            self._invalidate_context_cache(user_id)
+            self._empty_memory_users.discard(user_id)
+
             logger.info(f"Long-term memory saved: {memory_doc['_id']}")
             return memory_doc
         except Exception as error:
@@ -303,26 +510,49 @@ class MemoryEngine:
             logger.error(f'Error retrieving long-term memories: {error}')
             return []
     
+    def _lowered_fields(self, memory: Dict[str, Any]) -> tuple:
+        """Lowercased (title, summary, content) for a memory, cached by id
+
+        Memories are effectively immutable between edits, so the lowered
+        text is computed once per (id, updatedAt) instead of on every
+        scoring pass over every candidate.
+        """
+        key = memory.get('_id')
+        stamp = (memory.get('metadata') or {}).get('updatedAt')
+        if key is not None:
+            cached = self._lowered_cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                self._lowered_cache.move_to_end(key)
+                return cached[1]
+
+        fields = (
+            ((memory.get('title') or '') + ' ').lower(),
+            ((memory.get('summary') or '') + ' ').lower(),
+            ((memory.get('content') or '') + ' ').lower()
+        )
+        if key is not None:
+            self._lowered_cache[key] = (stamp, fields)
+            self._lowered_cache.move_to_end(key)
+            while len(self._lowered_cache) > LOWERED_CACHE_MAX_SIZE:
+                self._lowered_cache.popitem(last=False)
+        return fields
+
     def _memory_relevance_score(self, memory: Dict[str, Any], query_words: List[str]) -> int:
         """
-        Score memory by query words. Title matches rank much higher so e.g.
-        "Reminding User of Mom's Birthday" beats a memory that only mentions mom in content.
+        Score memory by pre-lowered query words. Title matches rank much higher
+        so e.g. "Reminding User of Mom's Birthday" beats a memory that only
+        mentions mom in content.
         """
         if not query_words:
             return 0
-        title = ((memory.get('title') or '') + ' ').lower()
-        summary = ((memory.get('summary') or '') + ' ').lower()
-        content = ((memory.get('content') or '') + ' ').lower()
+        title, summary, content = self._lowered_fields(memory)
         score = 0
-        for w in query_words:
-            if not w or len(w) < 2:
-                continue
-            wl = w.lower()
-            if wl in title:
+        for word in query_words:
+            if word in title:
                 score += 10
-            if wl in summary:
+            if word in summary:
                 score += 3
-            if wl in content:
+            if word in content:
                 score += 1
         return score
 
@@ -338,6 +568,11 @@ class MemoryEngine:
         Works with both MongoDB and file-based DB (no $gte filter).
         """
         try:
+            # Users with no memories at all skip the fetch-and-rank pipeline
+            # entirely until save_long_term_memory stores their first one
+            if user_id in self._empty_memory_users:
+                return []
+
             memories_collection = self._get_collection('memories')
             # Query by userId only so file DB works (no $gte)
             cursor = memories_collection.find({'userId': user_id})
@@ -346,6 +581,7 @@ class MemoryEngine:
 
             if not memories:
                 logger.debug(f'No long-term memories found for user_id={user_id}')
+                self._empty_memory_users.add(user_id)
                 return []
 
             for m in memories:
@@ -353,14 +589,26 @@ class MemoryEngine:
                     m['_id'] = str(m['_id'])
 
             # If we have current message, prefer memories that mention similar words (e.g. "mom birthday" -> "Mom's Birthday")
+            # Query terms are lowered, length-filtered and stop-word-filtered
+            # once here instead of per memory inside the scoring loop; trivial
+            # prompts ("ok thanks") reduce to no terms and skip scoring
             query_words = []
             if current_context and isinstance(current_context, str):
-                query_words = [w.strip() for w in current_context.replace("'", " ").split() if len(w.strip()) > 1]
+                query_words = [
+                    lowered for w in current_context.replace("'", " ").split()
+                    if len(w) > 1 and (lowered := w.lower()) not in _STOP_WORDS
+                ]
 
             if query_words:
                 scored = [(self._memory_relevance_score(m, query_words), m) for m in memories]
                 scored.sort(key=lambda x: (-x[0], -(x[1].get('importance') or 0)))
-                relevant_memories = [m for s, m in scored if s > 0][:limit]
+                # Scores are sorted descending, so stop at the first zero
+                # instead of filtering the whole list and slicing
+                relevant_memories = []
+                for score, memory in scored:
+                    if score <= 0 or len(relevant_memories) >= limit:
+                        break
+                    relevant_memories.append(memory)
                 # If no keyword match, fall back to top by importance
                 if not relevant_memories:
                     relevant_memories = [m for _, m in scored[:limit]]
@@ -369,18 +617,29 @@ class MemoryEngine:
             else:
                 relevant_memories = memories[:limit]
 
-            # Update access metadata (best-effort; file DB supports update_one)
+            # Update access metadata (best-effort). The file DB takes the
+            # whole batch in one locked pass and one log append; MongoDB
+            # falls back to concurrent per-document updates.
+            updates = {}
             for memory in relevant_memories:
                 metadata = memory.get('metadata', {}) or {}
                 metadata['accessCount'] = metadata.get('accessCount', 0) + 1
                 metadata['lastAccessed'] = datetime.utcnow()
-                try:
-                    await memories_collection.update_one(
-                        {'_id': memory['_id']},
-                        {'$set': {'metadata': metadata}}
-                    )
-                except Exception:
-                    pass
+                updates[memory['_id']] = {'metadata': metadata}
+            if updates:
+                # Explicit backend check: probing attributes doesn't work on
+                # Motor collections, whose __getattr__ materializes a
+                # sub-collection for any attribute name
+                if isinstance(memories_collection, FileCollection):
+                    await memories_collection.db.update_memories(updates)
+                else:
+                    await asyncio.gather(*(
+                        memories_collection.update_one(
+                            {'_id': memory_id},
+                            {'$set': update_data}
+                        )
+                        for memory_id, update_data in updates.items()
+                    ), return_exceptions=True)
 
             return relevant_memories
         except Exception as error:
@@ -400,13 +659,16 @@ class MemoryEngine:
         """
         try:
             memories_collection = self._get_collection('memories')
-            
+
+            # Escape the user's text so it matches literally - unbalanced
+            # regex metacharacters would otherwise fail the search outright
+            pattern = re.escape(search_text)
             cursor = memories_collection.find({
                 'userId': user_id,
                 '$or': [
-                    {'title': {'$regex': search_text, '$options': 'i'}},
-                    {'content': {'$regex': search_text, '$options': 'i'}},
-                    {'summary': {'$regex': search_text, '$options': 'i'}}
+                    {'title': {'$regex': pattern, '$options': 'i'}},
+                    {'content': {'$regex': pattern, '$options': 'i'}},
+                    {'summary': {'$regex': pattern, '$options': 'i'}}
                 ]
             }).sort('metadata.createdAt', -1)
             
@@ -433,8 +695,6 @@ class MemoryEngine:
             Updated memory document
         """
         try:
-            from bson import ObjectId
-            
             memories_collection = self._get_collection('memories')
             
             memory = await memories_collection.find_one({'_id': ObjectId(memory_id)})
@@ -442,16 +702,29 @@ class MemoryEngine:
                 raise ValueError('Memory not found')
             
             updates['metadata.updatedAt'] = datetime.utcnow()
-            
+
             await memories_collection.update_one(
                 {'_id': ObjectId(memory_id)},
                 {'$set': updates}
             )
-            
-            updated_memory = await memories_collection.find_one({'_id': ObjectId(memory_id)})
+
+            # The updated values are already known in-process - merge them
+            # into the fetched document instead of re-querying
+            updated_memory = dict(memory)
+            for key, value in updates.items():
+                if '.' in key:
+                    parts = key.split('.')
+                    target = updated_memory
+                    for part in parts[:-1]:
+                        target = target.setdefault(part, {})
+                    target[parts[-1]] = value
+                else:
+                    updated_memory[key] = value
             if '_id' in updated_memory:
                 updated_memory['_id'] = str(updated_memory['_id'])
-            
+
+            self._invalidate_context_cache(updated_memory.get('userId'))
+
             logger.info(f"Memory updated: {memory_id}")
             return updated_memory
         except Exception as error:
@@ -469,11 +742,14 @@ class MemoryEngine:
             True if successful
         """
         try:
-            from bson import ObjectId
-            
             memories_collection = self._get_collection('memories')
             
             await memories_collection.delete_one({'_id': ObjectId(memory_id)})
+            self._invalidate_context_cache()
+            # Reclaim the dead lowered-text entry right away - a run of
+            # deletions would otherwise leave the LRU packed with entries
+            # that can never hit again, evicting live ones instead
+            self._lowered_cache.pop(str(memory_id), None)
             logger.info(f"Memory deleted: {memory_id}")
             return True
         except Exception as error:
@@ -501,57 +777,61 @@ class MemoryEngine:
             conversation = await conversations_collection.find_one({'sessionId': session_id})
             if not conversation or len(conversation.get('messages', [])) < 5:
                 return None
-            
-            messages = conversation.get('messages', [])
-            recent_messages = messages[-20:] if len(messages) > 20 else messages
-            conversation_text = '\n'.join([
-                f"{msg.get('role')}: {msg.get('content')}"
-                for msg in recent_messages
-            ])
-            
-            prompt = f"""Analyze this conversation and identify if there are any important moments worth saving to long-term memory.
 
-Important moments include:
-- Goals or aspirations mentioned
-- Significant achievements
-- Emotional breakthroughs or vulnerable moments
-- Important decisions
-- Meaningful insights or realizations
+            messages = conversation.get('messages', [])
 
-Conversation:
-{conversation_text}
+            # Nothing new since the last analysis - skip the whole pass
+            if self._last_analyzed_len.get(session_id) == len(messages):
+                logger.debug('Skipping memory analysis: no new messages since last run')
+                return None
+            self._last_analyzed_len[session_id] = len(messages)
+            recent_messages = messages[-20:] if len(messages) > 20 else messages
+            # Bound the analyzer prompt so long messages don't blow past the
+            # provider's context window
+            if exceeds_token_limit(recent_messages, MAX_CONTEXT_TOKENS):
+                recent_messages = trim_messages_to_budget(recent_messages, MAX_CONTEXT_TOKENS)
 
-If there's an important moment, respond with JSON:
-{{
-  "hasImportantMoment": true,
-  "title": "Brief title",
-  "summary": "Summary of the moment",
-  "importance": 7,
-  "tags": ["goal", "achievement", "emotional_moment", "important", "casual"],
-  "relatedTopics": ["topic1", "topic2"]
-}}
+            # Drop exact-duplicate adjacent messages (retries, repeated
+            # greetings) so the analyzer isn't called on noise
+            deduped = []
+            prev_key = None
+            for msg in recent_messages:
+                key = (msg.get('role'), msg.get('content'))
+                if key != prev_key:
+                    deduped.append(msg)
+                prev_key = key
+            recent_messages = deduped
 
-IMPORTANT: Use ONLY these exact tags: "goal", "achievement", "emotional_moment", "important", "casual"
+            conversation_text = '\n'.join(
+                f"{msg.get('role')}: {msg.get('content')}"
+                for msg in recent_messages
+            )
 
-If no important moment, respond with: {{"hasImportantMoment": false}}"""
+            # Too little substance after dedup to contain an important
+            # moment - skip the LLM round trip entirely
+            if len(conversation_text) < 200:
+                logger.debug('Skipping memory analysis: conversation too short after dedup')
+                return None
+            
+            prompt = MEMORY_ANALYSIS_PROMPT.format(conversation_text=conversation_text)
 
             response = await self.llm_service.generate_completion([
                 {'role': 'system', 'content': 'You are a memory analyzer. Respond only with valid JSON.'},
                 {'role': 'user', 'content': prompt}
-            ], {
-                'temperature': 0.3,
-                'max_tokens': 300
-            })
+            ], _MEMORY_ANALYSIS_OPTIONS)
+
+            analysis = parse_llm_json(response)
+            if analysis is None:
+                logger.error('Memory analysis failed - invalid JSON from LLM')
+                return None
 
-            analysis = json.loads(response)
-            
             if analysis.get('hasImportantMoment'):
                 normalized_tags = self.normalize_tags(analysis.get('tags', []))
                 
-                conversation_snippet = ' '.join([
+                conversation_snippet = ' '.join(
                     msg.get('content', '')
                     for msg in recent_messages[-3:]
-                ])
+                )
                 
                 memory = await self.save_long_term_memory(session_id, user_id, {
                     'title': analysis.get('title'),
@@ -581,14 +861,14 @@ If no important moment, respond with: {{"hasImportantMoment": false}}"""
         """
         try:
             conversations_collection = self._get_collection('conversations')
-            
-            conversation = await conversations_collection.find_one({'sessionId': session_id})
-            if conversation:
-                await conversations_collection.update_one(
-                    {'sessionId': session_id},
-                    {'$set': {'persona': new_persona}}
-                )
-            
+
+            # A no-match update is harmless, so skip the existence pre-check
+            # and its extra round trip
+            await conversations_collection.update_one(
+                {'sessionId': session_id},
+                {'$set': {'persona': new_persona}}
+            )
+
             session_memory = self.short_term_memory.get(session_id)
             if session_memory:
                 session_memory['persona'] = new_persona
@@ -603,26 +883,39 @@ If no important moment, respond with: {{"hasImportantMoment": false}}"""
         memories (e.g. "Mom's Birthday" when user asks about mom) are included.
         """
         try:
+            cache_key = (user_id, limit, current_message)
+            cached = self._context_cache.get(cache_key)
+            if cached is not None:
+                self._context_cache.move_to_end(cache_key)
+                return cached
+
             relevant_memories = await self.get_relevant_memories(user_id, current_message or '', limit)
             if not relevant_memories:
                 logger.debug(f'get_memory_context: no memories for user_id={user_id}')
+                self._cache_context(cache_key, '')
                 return ''
-            # Prefer content over summary so exact dates/facts (e.g. "August 5th") are in the prompt
-            lines = []
-            for mem in relevant_memories:
-                content = mem.get('content') or mem.get('summary') or ''
-                if len(content) > 500:
-                    content = content[:500] + '...'
-                lines.append(f"- [{mem.get('title') or 'Untitled'}]: {content}")
-            context = '\n'.join(lines)
-            return (
+            # Joining over a generator feeds str.join directly without
+            # materializing an intermediate list of lines
+            context = '\n'.join(
+                _format_memory_line(mem) for mem in relevant_memories
+            )
+            result = (
                 "\n\n--- RELEVANT MEMORIES (use these to answer; state the exact date or fact when it appears below) ---\n"
                 + context
                 + "\n--- END MEMORIES ---"
             )
+            self._cache_context(cache_key, result)
+            return result
         except Exception as error:
             logger.error(f'Error getting memory context: {error}')
             return ''
+
+    def _cache_context(self, cache_key: tuple, context: str) -> None:
+        """Remember a formatted context, evicting the least recently used"""
+        self._context_cache[cache_key] = context
+        self._context_cache.move_to_end(cache_key)
+        while len(self._context_cache) > CONTEXT_CACHE_MAX_SIZE:
+            self._context_cache.popitem(last=False)
     
     def clear_short_term_memory(self, session_id: str) -> None:
         """
@@ -633,4 +926,8 @@ If no important moment, respond with: {{"hasImportantMoment": false}}"""
         """
         if session_id in self.short_term_memory:
             del self.short_term_memory[session_id]
+        self._last_analyzed_len.pop(session_id, None)
+        flush_task = self._redis_flush_tasks.pop(session_id, None)
+        if flush_task is not None:
+            flush_task.cancel()
         logger.info(f"Short-term memory cleared for session: {session_id}")
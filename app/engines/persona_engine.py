@@ -13,6 +13,16 @@ class PersonaEngine:
     def __init__(self):
         self.personas = self._initialize_personas()
         self.current_persona = PersonaType.FRIEND
+        # Precompute the static prompt prefix per persona so get_system_prompt
+        # doesn't rebuild the same concatenation on every request
+        self._static_prompts = {
+            persona_type: (
+                persona['system_prompt']
+                + f"\n\nRemember to embody the {persona['name']} persona in your responses, "
+                f"using a {persona['response_style']['tone']} tone."
+            )
+            for persona_type, persona in self.personas.items()
+        }
     
     def _initialize_personas(self) -> Dict[PersonaType, Dict[str, Any]]:
         """Initialize persona definitions with system prompts"""
@@ -176,14 +186,22 @@ Your approach:
         Returns:
             System prompt string
         """
-        persona = self.get_persona(persona_type)
-        prompt = persona['system_prompt']
-        
+        try:
+            persona_enum = PersonaType(persona_type) if persona_type else self.current_persona
+        except ValueError:
+            persona_enum = PersonaType.FRIEND
+
+        # Keep the precomputed static persona text as a stable prefix and
+        # append the per-turn emotional context last, so providers with
+        # prompt caching can reuse the unchanged prefix across requests
+        prompt = self._static_prompts.get(
+            persona_enum,
+            self._static_prompts[PersonaType.FRIEND]
+        )
+
         if emotional_context:
             prompt += f"\n\nCurrent emotional context: {emotional_context}"
-        
-        prompt += f"\n\nRemember to embody the {persona['name']} persona in your responses, using a {persona['response_style']['tone']} tone."
-        
+
         return prompt
     
     def get_all_personas(self) -> List[Dict[str, str]]:
@@ -5,6 +5,9 @@ Tool execution engine for handling external tool calls
 import os
 import re
 import json
+import asyncio
+import hashlib
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 from app.services.weather_service import WeatherService
@@ -15,16 +18,224 @@ from app.services.calendar_service import CalendarService
 from app.utils.logger import logger
 
 
+@lru_cache(maxsize=None)
+def _shared_service(service_class):
+    """One instance per service class, shared across ToolEngine constructions
+
+    The reminder and calendar services load their data files at init, so
+    building a fresh set per ToolEngine repeats that work and splits state
+    (in-memory caches, scheduled reminders) between instances.
+    """
+    return service_class()
+
+
+# Keyword tables and precompiled patterns for the detect_* scans, built once
+# at import instead of as fresh literals (and re.compile calls) on every
+# message
+NOTE_SAVE_KEYWORDS = (
+    'remember', 'save', 'note', 'write down', 'keep track',
+    'add to', 'put in', 'store', 'record'
+)
+NOTE_GET_KEYWORDS = (
+    'what\'s', 'what is', 'show me', 'tell me', 'get', 'retrieve',
+    'read', 'what\'s in', 'what\'s on'
+)
+NOTE_DELETE_KEYWORDS = (
+    'delete', 'remove', 'clear', 'erase', 'forget'
+)
+NOTE_LIST_KEYWORDS = (
+    'list all', 'show all', 'what notes', 'what lists',
+    'all my notes', 'all my lists'
+)
+NOTE_TOPIC_WORDS = ('list', 'note', 'grocery', 'todo', 'shopping')
+
+REMINDER_KEYWORDS = (
+    'remind me', 'reminder', 'set a reminder', 'create a reminder',
+    'schedule a reminder', 'alert me', 'notify me', 'wake me',
+    'don\'t forget', 'remember to', 'set alarm'
+)
+
+SEARCH_KEYWORDS = (
+    'search', 'look up', 'find', 'google', 'what is', 'who is',
+    'tell me about', 'information about', 'learn about', 'research',
+    'find out', 'look for', 'search for', 'latest news', 'recent news',
+    'current news', 'news about', 'get news', 'fetch', 'retrieve',
+    'get information', 'get latest', 'get recent', 'get current',
+    'from internet', 'from the web', 'online', 'browse', 'check online'
+)
+SEARCH_QUESTION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'what\'?s? (?:the )?latest',
+    r'what\'?s? (?:the )?current',
+    r'what\'?s? (?:the )?recent',
+    r'what\'?s? happening',
+    r'what\'?s? new',
+    r'can you (?:get|find|search|look up)',
+    r'could you (?:get|find|search|look up)',
+    r'please (?:get|find|search|look up)',
+))
+
+WEATHER_KEYWORDS = (
+    'weather', 'temperature', 'forecast', 'rain', 'snow', 'sunny',
+    'cloudy', 'hot', 'cold', 'warm', 'umbrella', 'jacket', 'climate'
+)
+
+CALENDAR_LIST_ALL_KEYWORDS = (
+    'list all meetings', 'list meetings', 'show all meetings',
+    'all my meetings', 'all scheduled meetings', 'list my meetings',
+    'show my meetings', 'what meetings do i have scheduled',
+    'show scheduled meetings', 'list scheduled meetings',
+    'all meetings', 'my meetings'
+)
+CALENDAR_GET_TODAY_KEYWORDS = (
+    'today\'s calendar', 'todays calendar', 'calendar for today',
+    'what\'s on my calendar', 'whats on my calendar',
+    'show my calendar', 'show calendar', 'my calendar today',
+    'what do i have today', 'what\'s scheduled today',
+    'my schedule today', 'today\'s schedule', 'todays schedule',
+    'what meetings do i have today', 'do i have any meetings today'
+)
+CALENDAR_SCHEDULE_KEYWORDS = (
+    'schedule a meeting', 'schedule meeting', 'book a meeting',
+    'set up a meeting', 'arrange a meeting', 'plan a meeting',
+    'schedule an event', 'create a meeting', 'add to calendar',
+    'put on calendar', 'calendar event', 'meeting at', 'meeting on'
+)
+CALENDAR_TIME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'meeting\s+(?:at|on|for|tomorrow|next)',
+    r'schedule\s+(?:at|on|for|tomorrow|next)',
+    r'(?:tomorrow|next\s+\w+)\s+at\s+\d',
+))
+
+# Extraction patterns, precompiled at import like the detect_* tables above.
+# The extract_* helpers used to rebuild these pattern lists per call and
+# lean on re's internal compile cache; binding the compiled objects once
+# makes each call a straight scan over ready patterns.
+NOTE_COMMON_TITLES = (
+    'grocery list', 'shopping list', 'todo list', 'to-do list', 'notes'
+)
+NOTE_REMEMBER_PATTERN = re.compile(r'(?:remember|save|note)\s+(.+)', re.IGNORECASE)
+NOTE_LEADING_SEPARATORS = re.compile(r'^[:\s]+')
+NOTE_SAVE_GENERIC_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:remember|save|note)\s+(?:that\s+)?(.+?)\s+(?:as|in|to)\s+(?:my\s+)?(.+?)(?:\?|$)',
+    r'(?:add|put)\s+(.+?)\s+(?:to|in)\s+(?:my\s+)?(.+?)(?:\?|$)',
+))
+NOTE_GET_DELETE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:what\'s|show me|tell me|get|delete|remove)\s+(?:the\s+)?(?:my\s+)?(.+?)(?:\?|$)',
+))
+NOTE_TRAILING_LIST_PATTERN = re.compile(r'\s+list$')
+
+
+@lru_cache(maxsize=32)
+def _note_save_patterns(title: str) -> tuple:
+    """Compiled content-extraction patterns for one note title (the titles
+    come from the small fixed NOTE_COMMON_TITLES set, so each trio is
+    compiled once and reused for every later message)"""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        rf'{title}[:\s]+(.+?)(?:\?|$)',
+        rf'(?:remember|save|note|write down)\s+(?:that\s+)?(.+?)\s+(?:in|to|on)\s+(?:my\s+)?{title}',
+        rf'(?:add|put)\s+(.+?)\s+(?:to|in|on)\s+(?:my\s+)?{title}',
+    ))
+
+
+REMINDER_EXTRACT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'remind me (?:to )?(.+?) (?:in|at|tomorrow|after) (.+?)(?:\?|$)',
+    r'remind me (?:in|at|tomorrow|after) (.+?) (?:to )?(.+?)(?:\?|$)',
+    r'set (?:a )?reminder (?:to )?(.+?) (?:in|at|for|tomorrow) (.+?)(?:\?|$)',
+    r'set (?:a )?reminder (?:for|in|at|tomorrow) (.+?) (?:to )?(.+?)(?:\?|$)',
+    r'alert me (?:to )?(.+?) (?:in|at|tomorrow) (.+?)(?:\?|$)',
+    r'notify me (?:to )?(.+?) (?:in|at|tomorrow) (.+?)(?:\?|$)',
+))
+REMINDER_SIMPLE_PATTERN = re.compile(r'remind me (?:to )?(.+?)(?:\?|$)', re.IGNORECASE)
+REMINDER_TIME_INDICATORS = (
+    'minute', 'hour', 'day', 'week', 'pm', 'am', 'tomorrow', 'o\'clock'
+)
+
+SEARCH_EXTRACT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'search (?:for |about )?(.+?)(?:\?|$)',
+    r'look up (.+?)(?:\?|$)',
+    r'find (?:out )?(?:about )?(.+?)(?:\?|$)',
+    r'google (.+?)(?:\?|$)',
+    r'what is (.+?)(?:\?|$)',
+    r'who is (.+?)(?:\?|$)',
+    r'tell me about (.+?)(?:\?|$)',
+    r'information about (.+?)(?:\?|$)',
+    r'learn about (.+?)(?:\?|$)',
+    r'research (.+?)(?:\?|$)',
+    r'(?:get|fetch|retrieve) (?:the )?(?:latest|recent|current) (.+?)(?:\?|$)',
+    r'(?:latest|recent|current) (?:news|information|updates?) (?:about|on|for) (.+?)(?:\?|$)',
+    r'(?:latest|recent|current) (.+?) news(?:\?|$)',
+    r'news (?:about|on|for) (.+?)(?:\?|$)',
+    r'can you (?:get|find|search|look up) (.+?)(?:\?|$)',
+    r'could you (?:get|find|search|look up) (.+?)(?:\?|$)',
+    r'please (?:get|find|search|look up) (.+?)(?:\?|$)',
+    r'what\'?s? (?:the )?(?:latest|recent|current) (?:on |about )?(.+?)(?:\?|$)',
+    r'what\'?s? happening (?:with |in )?(.+?)(?:\?|$)',
+))
+SEARCH_SOURCE_SUFFIX_PATTERN = re.compile(
+    r'\s+from\s+(?:the\s+)?(?:internet|web|online)$', re.IGNORECASE
+)
+SEARCH_PREFIXES_TO_REMOVE = (
+    'can you get', 'could you get', 'please get',
+    'can you find', 'could you find', 'please find',
+    'can you search', 'could you search', 'please search',
+    'search for', 'search about', 'search',
+    'look up', 'find out about', 'find about', 'find',
+    'google', 'tell me about', 'get', 'fetch', 'retrieve'
+)
+
+LOCATION_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:in|at|for)\s+([A-Z][a-zA-Z\s]+?)(?:\s+weather|\s+forecast|[?.!]|$)',
+    r'weather\s+(?:in|at|for)\s+([A-Z][a-zA-Z\s]+?)(?:[?.!]|$)',
+    r'([A-Z][a-zA-Z\s]+?)\s+weather',
+    r'(?:in|at)\s+([A-Z][a-zA-Z\s]+?)$',
+))
+DEFAULT_LOCATIONS = ('London', 'New York', 'Tokyo', 'Paris', 'Sydney')
+
+CALENDAR_TITLE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'schedule\s+(?:a\s+)?(?:meeting\s+)?(?:called\s+|named\s+|about\s+)?["\']([^"\']+)["\']',
+    r'schedule\s+(?:a\s+)?(?:meeting\s+)?(?:called\s+|named\s+|about\s+)?(\w+(?:\s+\w+){0,4})\s+(?:at|on|for|tomorrow)',
+    r'meeting\s+(?:called\s+|named\s+|about\s+)?["\']([^"\']+)["\']',
+    r'(?:schedule|book|create)\s+["\']([^"\']+)["\']',
+))
+CALENDAR_TITLE_FALLBACK_PATTERN = re.compile(
+    r'(?:schedule|meeting|book)\s+(?:a\s+)?(\w+(?:\s+\w+){0,3})\s+(?:at|on|for|tomorrow)'
+)
+CALENDAR_TIME_EXTRACT_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?:at|on|for)\s+(tomorrow\s+at\s+\d+(?::\d+)?\s*(?:am|pm)?)',
+    r'(?:at|on|for)\s+(next\s+\w+\s+at\s+\d+(?::\d+)?\s*(?:am|pm)?)',
+    r'(?:at|on)\s+(\d+(?::\d+)?\s*(?:am|pm))',
+    r'(tomorrow\s+at\s+\d+(?::\d+)?\s*(?:am|pm)?)',
+    r'(at\s+\d+(?::\d+)?\s*(?:am|pm))',
+    r'(in\s+\d+\s+hours?)',
+))
+CALENDAR_ANY_TIME_PATTERN = re.compile(r'(\d+(?::\d+)?\s*(?:am|pm))')
+CALENDAR_DURATION_PATTERN = re.compile(
+    r'(?:for|lasting)\s+(\d+)\s*(?:minutes?|mins?|hours?|hrs?)'
+)
+CALENDAR_LOCATION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(?:at|in)\s+(?:the\s+)?([A-Z][a-zA-Z\s]+?)\s+(?:room|office|building)',
+    r'location:\s*([^\n,]+)',
+    r'(?:at|in)\s+([A-Z][a-zA-Z\s]+?)(?:\s+at|\s+on|$)',
+))
+CALENDAR_DESCRIPTION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'about\s+([^,\.]+)',
+    r'regarding\s+([^,\.]+)',
+    r'to\s+discuss\s+([^,\.]+)',
+))
+
+
 class ToolEngine:
     """Engine for detecting and executing tools"""
-    
+
     def __init__(self):
-        self.weather_service = WeatherService()
-        self.search_service = SearchService()
-        self.reminder_service = ReminderService()
-        self.notes_service = NotesService()
-        self.calendar_service = CalendarService()
+        self.weather_service = _shared_service(WeatherService)
+        self.search_service = _shared_service(SearchService)
+        self.reminder_service = _shared_service(ReminderService)
+        self.notes_service = _shared_service(NotesService)
+        self.calendar_service = _shared_service(CalendarService)
         self.tools = self._initialize_tools()
+        self._tool_definitions_cache = None
+        self._tools_fingerprint = None
     
     def _initialize_tools(self) -> Dict[str, Dict[str, Any]]:
         """Initialize available tools with their definitions and handlers"""
@@ -599,15 +810,35 @@ class ToolEngine:
         Returns:
             List of tool definitions
         """
-        return [
-            {
-                'name': tool['name'],
-                'description': tool['description'],
-                'parameters': tool['parameters']
-            }
-            for tool in self.tools.values()
-        ]
-    
+        if self._tool_definitions_cache is None:
+            self._tool_definitions_cache = [
+                {
+                    'name': tool['name'],
+                    'description': tool['description'],
+                    'parameters': tool['parameters']
+                }
+                for tool in self.tools.values()
+            ]
+        return self._tool_definitions_cache
+
+    def get_tools_fingerprint(self) -> str:
+        """
+        Get a stable hash of the registered tool schemas
+
+        Cache layers can use this instead of re-serializing every schema
+        when building keys; it is invalidated together with the
+        definitions cache whenever tools are (un)registered.
+
+        Returns:
+            Hex digest identifying the current tool set
+        """
+        if self._tools_fingerprint is None:
+            payload = json.dumps(self.get_tool_definitions(), sort_keys=True)
+            self._tools_fingerprint = hashlib.blake2b(
+                payload.encode('utf-8'), digest_size=16
+            ).hexdigest()
+        return self._tools_fingerprint
+
     async def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a tool by name
@@ -828,49 +1059,26 @@ class ToolEngine:
             Action type ('save', 'get', 'delete', 'list') or None
         """
         lower_message = message.lower()
-        
-        # Save/Remember patterns
-        save_keywords = [
-            'remember', 'save', 'note', 'write down', 'keep track',
-            'add to', 'put in', 'store', 'record'
-        ]
-        
-        # Get/Retrieve patterns
-        get_keywords = [
-            'what\'s', 'what is', 'show me', 'tell me', 'get', 'retrieve',
-            'read', 'what\'s in', 'what\'s on'
-        ]
-        
-        # Delete patterns
-        delete_keywords = [
-            'delete', 'remove', 'clear', 'erase', 'forget'
-        ]
-        
-        # List patterns
-        list_keywords = [
-            'list all', 'show all', 'what notes', 'what lists',
-            'all my notes', 'all my lists'
-        ]
-        
+
         # Check for list action
-        if any(keyword in lower_message for keyword in list_keywords):
+        if any(keyword in lower_message for keyword in NOTE_LIST_KEYWORDS):
             return 'list'
-        
+
         # Check for delete action
-        if any(keyword in lower_message for keyword in delete_keywords):
-            if any(word in lower_message for word in ['list', 'note', 'grocery', 'todo', 'shopping']):
+        if any(keyword in lower_message for keyword in NOTE_DELETE_KEYWORDS):
+            if any(word in lower_message for word in NOTE_TOPIC_WORDS):
                 return 'delete'
-        
+
         # Check for get action
-        if any(keyword in lower_message for keyword in get_keywords):
-            if any(word in lower_message for word in ['list', 'note', 'grocery', 'todo', 'shopping']):
+        if any(keyword in lower_message for keyword in NOTE_GET_KEYWORDS):
+            if any(word in lower_message for word in NOTE_TOPIC_WORDS):
                 return 'get'
-        
+
         # Check for save action
-        if any(keyword in lower_message for keyword in save_keywords):
-            if any(word in lower_message for word in ['list', 'note', 'grocery', 'todo', 'shopping']):
+        if any(keyword in lower_message for keyword in NOTE_SAVE_KEYWORDS):
+            if any(word in lower_message for word in NOTE_TOPIC_WORDS):
                 return 'save'
-        
+
         return None
     
     def extract_note_data(self, message: str, action: str) -> Optional[Dict[str, str]]:
@@ -888,67 +1096,49 @@ class ToolEngine:
         
         if action == 'list':
             return {}  # No data needed for list
-        
-        # Common list/note names
-        common_titles = ['grocery list', 'shopping list', 'todo list', 'to-do list', 'notes']
-        
+
         # Try to find a common title
-        for title in common_titles:
+        for title in NOTE_COMMON_TITLES:
             if title in lower_message:
                 if action == 'save':
                     # Extract content after the title
-                    patterns = [
-                        rf'{title}[:\s]+(.+?)(?:\?|$)',
-                        rf'(?:remember|save|note|write down)\s+(?:that\s+)?(.+?)\s+(?:in|to|on)\s+(?:my\s+)?{title}',
-                        rf'(?:add|put)\s+(.+?)\s+(?:to|in|on)\s+(?:my\s+)?{title}',
-                    ]
-                    
-                    for pattern in patterns:
-                        match = re.search(pattern, lower_message, re.IGNORECASE)
+                    for pattern in _note_save_patterns(title):
+                        match = pattern.search(lower_message)
                         if match:
                             content = match.group(1).strip()
                             return {'title': title, 'content': content}
-                    
+
                     # If no content pattern matched, try to extract everything after "remember"
-                    remember_match = re.search(r'(?:remember|save|note)\s+(.+)', lower_message, re.IGNORECASE)
+                    remember_match = NOTE_REMEMBER_PATTERN.search(lower_message)
                     if remember_match:
                         full_text = remember_match.group(1).strip()
                         # Remove the title from content
                         content = full_text.replace(title, '').strip()
-                        content = re.sub(r'^[:\s]+', '', content)  # Remove leading colons/spaces
+                        content = NOTE_LEADING_SEPARATORS.sub('', content)  # Remove leading colons/spaces
                         if content:
                             return {'title': title, 'content': content}
                 else:
                     # For get/delete, just return the title
                     return {'title': title}
-        
+
         # If no common title found, try generic patterns
         if action == 'save':
-            patterns = [
-                r'(?:remember|save|note)\s+(?:that\s+)?(.+?)\s+(?:as|in|to)\s+(?:my\s+)?(.+?)(?:\?|$)',
-                r'(?:add|put)\s+(.+?)\s+(?:to|in)\s+(?:my\s+)?(.+?)(?:\?|$)',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, lower_message, re.IGNORECASE)
+            for pattern in NOTE_SAVE_GENERIC_PATTERNS:
+                match = pattern.search(lower_message)
                 if match:
                     content = match.group(1).strip()
                     title = match.group(2).strip()
                     return {'title': title, 'content': content}
-        
+
         elif action in ['get', 'delete']:
-            patterns = [
-                r'(?:what\'s|show me|tell me|get|delete|remove)\s+(?:the\s+)?(?:my\s+)?(.+?)(?:\?|$)',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, lower_message, re.IGNORECASE)
+            for pattern in NOTE_GET_DELETE_PATTERNS:
+                match = pattern.search(lower_message)
                 if match:
                     title = match.group(1).strip()
                     # Clean up common words
-                    title = re.sub(r'\s+list$', ' list', title)
+                    title = NOTE_TRAILING_LIST_PATTERN.sub(' list', title)
                     return {'title': title}
-        
+
         return None
     
     def detect_reminder_query(self, message: str) -> bool:
@@ -961,14 +1151,8 @@ class ToolEngine:
         Returns:
             True if reminder query detected
         """
-        reminder_keywords = [
-            'remind me', 'reminder', 'set a reminder', 'create a reminder',
-            'schedule a reminder', 'alert me', 'notify me', 'wake me',
-            'don\'t forget', 'remember to', 'set alarm'
-        ]
-        
         lower_message = message.lower()
-        return any(keyword in lower_message for keyword in reminder_keywords)
+        return any(keyword in lower_message for keyword in REMINDER_KEYWORDS)
     
     def extract_reminder_data(self, message: str) -> Optional[Dict[str, str]]:
         """
@@ -981,33 +1165,22 @@ class ToolEngine:
             Dictionary with 'message' and 'time' or None
         """
         lower_message = message.lower()
-        
-        # Patterns to extract reminder data
-        patterns = [
-            r'remind me (?:to )?(.+?) (?:in|at|tomorrow|after) (.+?)(?:\?|$)',
-            r'remind me (?:in|at|tomorrow|after) (.+?) (?:to )?(.+?)(?:\?|$)',
-            r'set (?:a )?reminder (?:to )?(.+?) (?:in|at|for|tomorrow) (.+?)(?:\?|$)',
-            r'set (?:a )?reminder (?:for|in|at|tomorrow) (.+?) (?:to )?(.+?)(?:\?|$)',
-            r'alert me (?:to )?(.+?) (?:in|at|tomorrow) (.+?)(?:\?|$)',
-            r'notify me (?:to )?(.+?) (?:in|at|tomorrow) (.+?)(?:\?|$)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, lower_message, re.IGNORECASE)
+
+        for pattern in REMINDER_EXTRACT_PATTERNS:
+            match = pattern.search(lower_message)
             if match:
                 # Determine which group is message and which is time
                 group1 = match.group(1).strip()
                 group2 = match.group(2).strip()
-                
+
                 # Check if group1 looks like a time expression
-                time_indicators = ['minute', 'hour', 'day', 'week', 'pm', 'am', 'tomorrow', 'o\'clock']
-                if any(indicator in group1.lower() for indicator in time_indicators):
+                if any(indicator in group1.lower() for indicator in REMINDER_TIME_INDICATORS):
                     return {'time': group1, 'message': group2}
                 else:
                     return {'message': group1, 'time': group2}
-        
+
         # Simpler pattern: "remind me to X"
-        simple_match = re.search(r'remind me (?:to )?(.+?)(?:\?|$)', lower_message, re.IGNORECASE)
+        simple_match = REMINDER_SIMPLE_PATTERN.search(lower_message)
         if simple_match:
             full_text = simple_match.group(1).strip()
             # Try to split by time indicators
@@ -1031,37 +1204,17 @@ class ToolEngine:
         Returns:
             True if search query detected
         """
-        search_keywords = [
-            'search', 'look up', 'find', 'google', 'what is', 'who is',
-            'tell me about', 'information about', 'learn about', 'research',
-            'find out', 'look for', 'search for', 'latest news', 'recent news',
-            'current news', 'news about', 'get news', 'fetch', 'retrieve',
-            'get information', 'get latest', 'get recent', 'get current',
-            'from internet', 'from the web', 'online', 'browse', 'check online'
-        ]
-        
         lower_message = message.lower()
-        
+
         # Check for direct keyword matches
-        if any(keyword in lower_message for keyword in search_keywords):
+        if any(keyword in lower_message for keyword in SEARCH_KEYWORDS):
             return True
-        
+
         # Check for question patterns that likely need internet search
-        question_patterns = [
-            r'what\'?s? (?:the )?latest',
-            r'what\'?s? (?:the )?current',
-            r'what\'?s? (?:the )?recent',
-            r'what\'?s? happening',
-            r'what\'?s? new',
-            r'can you (?:get|find|search|look up)',
-            r'could you (?:get|find|search|look up)',
-            r'please (?:get|find|search|look up)',
-        ]
-        
-        for pattern in question_patterns:
-            if re.search(pattern, lower_message):
+        for pattern in SEARCH_QUESTION_PATTERNS:
+            if pattern.search(lower_message):
                 return True
-        
+
         return False
     
     def extract_search_query(self, message: str) -> Optional[str]:
@@ -1075,58 +1228,26 @@ class ToolEngine:
             Extracted search query or None
         """
         lower_message = message.lower()
-        
-        # Patterns to extract query - more comprehensive
-        patterns = [
-            r'search (?:for |about )?(.+?)(?:\?|$)',
-            r'look up (.+?)(?:\?|$)',
-            r'find (?:out )?(?:about )?(.+?)(?:\?|$)',
-            r'google (.+?)(?:\?|$)',
-            r'what is (.+?)(?:\?|$)',
-            r'who is (.+?)(?:\?|$)',
-            r'tell me about (.+?)(?:\?|$)',
-            r'information about (.+?)(?:\?|$)',
-            r'learn about (.+?)(?:\?|$)',
-            r'research (.+?)(?:\?|$)',
-            r'(?:get|fetch|retrieve) (?:the )?(?:latest|recent|current) (.+?)(?:\?|$)',
-            r'(?:latest|recent|current) (?:news|information|updates?) (?:about|on|for) (.+?)(?:\?|$)',
-            r'(?:latest|recent|current) (.+?) news(?:\?|$)',
-            r'news (?:about|on|for) (.+?)(?:\?|$)',
-            r'can you (?:get|find|search|look up) (.+?)(?:\?|$)',
-            r'could you (?:get|find|search|look up) (.+?)(?:\?|$)',
-            r'please (?:get|find|search|look up) (.+?)(?:\?|$)',
-            r'what\'?s? (?:the )?(?:latest|recent|current) (?:on |about )?(.+?)(?:\?|$)',
-            r'what\'?s? happening (?:with |in )?(.+?)(?:\?|$)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, lower_message, re.IGNORECASE)
+
+        for pattern in SEARCH_EXTRACT_PATTERNS:
+            match = pattern.search(lower_message)
             if match and match.group(1):
                 query = match.group(1).strip()
                 # Clean up common trailing words
-                query = re.sub(r'\s+from\s+(?:the\s+)?(?:internet|web|online)$', '', query, flags=re.IGNORECASE)
+                query = SEARCH_SOURCE_SUFFIX_PATTERN.sub('', query)
                 return query
-        
+
         # If no pattern matches but search keywords found, try to extract meaningful part
         if self.detect_search_query(message):
             # Remove common prefixes and get the main query
-            prefixes_to_remove = [
-                'can you get', 'could you get', 'please get',
-                'can you find', 'could you find', 'please find',
-                'can you search', 'could you search', 'please search',
-                'search for', 'search about', 'search',
-                'look up', 'find out about', 'find about', 'find',
-                'google', 'tell me about', 'get', 'fetch', 'retrieve'
-            ]
-            
             query = message
-            for prefix in prefixes_to_remove:
+            for prefix in SEARCH_PREFIXES_TO_REMOVE:
                 if lower_message.startswith(prefix):
                     query = message[len(prefix):].strip()
                     break
-            
+
             # Clean up
-            query = re.sub(r'\s+from\s+(?:the\s+)?(?:internet|web|online)$', '', query, flags=re.IGNORECASE)
+            query = SEARCH_SOURCE_SUFFIX_PATTERN.sub('', query)
             query = query.strip('?.,! ')
             
             if query and len(query) > 3:  # Ensure we have a meaningful query
@@ -1144,13 +1265,8 @@ class ToolEngine:
         Returns:
             True if weather query detected
         """
-        weather_keywords = [
-            'weather', 'temperature', 'forecast', 'rain', 'snow', 'sunny',
-            'cloudy', 'hot', 'cold', 'warm', 'umbrella', 'jacket', 'climate'
-        ]
-        
         lower_message = message.lower()
-        return any(keyword in lower_message for keyword in weather_keywords)
+        return any(keyword in lower_message for keyword in WEATHER_KEYWORDS)
     
     def extract_location(self, message: str) -> Optional[str]:
         """
@@ -1162,23 +1278,16 @@ class ToolEngine:
         Returns:
             Extracted location or None
         """
-        patterns = [
-            r'(?:in|at|for)\s+([A-Z][a-zA-Z\s]+?)(?:\s+weather|\s+forecast|[?.!]|$)',
-            r'weather\s+(?:in|at|for)\s+([A-Z][a-zA-Z\s]+?)(?:[?.!]|$)',
-            r'([A-Z][a-zA-Z\s]+?)\s+weather',
-            r'(?:in|at)\s+([A-Z][a-zA-Z\s]+?)$'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in LOCATION_PATTERNS:
+            match = pattern.search(message)
             if match and match.group(1):
                 return match.group(1).strip()
-        
-        default_locations = ['London', 'New York', 'Tokyo', 'Paris', 'Sydney']
-        for location in default_locations:
-            if location.lower() in message.lower():
+
+        lower_message = message.lower()
+        for location in DEFAULT_LOCATIONS:
+            if location.lower() in lower_message:
                 return location
-        
+
         return None
     def detect_calendar_query(self, message: str) -> Optional[str]:
         """
@@ -1194,52 +1303,22 @@ class ToolEngine:
         lower_message = message.lower()
         
         # Check for "list all meetings" queries first (more specific)
-        list_all_keywords = [
-            'list all meetings', 'list meetings', 'show all meetings',
-            'all my meetings', 'all scheduled meetings', 'list my meetings',
-            'show my meetings', 'what meetings do i have scheduled',
-            'show scheduled meetings', 'list scheduled meetings',
-            'all meetings', 'my meetings'
-        ]
-        
-        if any(keyword in lower_message for keyword in list_all_keywords):
+        if any(keyword in lower_message for keyword in CALENDAR_LIST_ALL_KEYWORDS):
             return 'list_all'
-        
+
         # Check for "get today's calendar" queries
-        get_calendar_keywords = [
-            'today\'s calendar', 'todays calendar', 'calendar for today',
-            'what\'s on my calendar', 'whats on my calendar',
-            'show my calendar', 'show calendar', 'my calendar today',
-            'what do i have today', 'what\'s scheduled today',
-            'my schedule today', 'today\'s schedule', 'todays schedule',
-            'what meetings do i have today', 'do i have any meetings today'
-        ]
-        
-        if any(keyword in lower_message for keyword in get_calendar_keywords):
+        if any(keyword in lower_message for keyword in CALENDAR_GET_TODAY_KEYWORDS):
             return 'get_today'
-        
+
         # Check for scheduling keywords
-        schedule_keywords = [
-            'schedule a meeting', 'schedule meeting', 'book a meeting',
-            'set up a meeting', 'arrange a meeting', 'plan a meeting',
-            'schedule an event', 'create a meeting', 'add to calendar',
-            'put on calendar', 'calendar event', 'meeting at', 'meeting on'
-        ]
-        
-        if any(keyword in lower_message for keyword in schedule_keywords):
+        if any(keyword in lower_message for keyword in CALENDAR_SCHEDULE_KEYWORDS):
             return 'schedule'
-        
+
         # Check for time-based scheduling patterns
-        time_patterns = [
-            r'meeting\s+(?:at|on|for|tomorrow|next)',
-            r'schedule\s+(?:at|on|for|tomorrow|next)',
-            r'(?:tomorrow|next\s+\w+)\s+at\s+\d',
-        ]
-        
-        for pattern in time_patterns:
-            if re.search(pattern, lower_message):
+        for pattern in CALENDAR_TIME_PATTERNS:
+            if pattern.search(lower_message):
                 return 'schedule'
-        
+
         return None
     
     def extract_calendar_data(self, message: str, action: str) -> Optional[Dict[str, Any]]:
@@ -1262,23 +1341,16 @@ class ToolEngine:
             
             # Extract meeting title
             title = None
-            title_patterns = [
-                r'schedule\s+(?:a\s+)?(?:meeting\s+)?(?:called\s+|named\s+|about\s+)?["\']([^"\']+)["\']',
-                r'schedule\s+(?:a\s+)?(?:meeting\s+)?(?:called\s+|named\s+|about\s+)?(\w+(?:\s+\w+){0,4})\s+(?:at|on|for|tomorrow)',
-                r'meeting\s+(?:called\s+|named\s+|about\s+)?["\']([^"\']+)["\']',
-                r'(?:schedule|book|create)\s+["\']([^"\']+)["\']',
-            ]
-            
-            for pattern in title_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
+            for pattern in CALENDAR_TITLE_PATTERNS:
+                match = pattern.search(message)
                 if match:
                     title = match.group(1).strip()
                     break
-            
+
             # If no title found, try to extract from context
             if not title:
                 # Look for words between schedule/meeting and time expression
-                match = re.search(r'(?:schedule|meeting|book)\s+(?:a\s+)?(\w+(?:\s+\w+){0,3})\s+(?:at|on|for|tomorrow)', lower_message)
+                match = CALENDAR_TITLE_FALLBACK_PATTERN.search(lower_message)
                 if match:
                     potential_title = match.group(1).strip()
                     # Filter out common words
@@ -1290,33 +1362,24 @@ class ToolEngine:
             
             # Extract time expression
             time_expression = None
-            time_patterns = [
-                r'(?:at|on|for)\s+(tomorrow\s+at\s+\d+(?::\d+)?\s*(?:am|pm)?)',
-                r'(?:at|on|for)\s+(next\s+\w+\s+at\s+\d+(?::\d+)?\s*(?:am|pm)?)',
-                r'(?:at|on)\s+(\d+(?::\d+)?\s*(?:am|pm))',
-                r'(tomorrow\s+at\s+\d+(?::\d+)?\s*(?:am|pm)?)',
-                r'(at\s+\d+(?::\d+)?\s*(?:am|pm))',
-                r'(in\s+\d+\s+hours?)',
-            ]
-            
-            for pattern in time_patterns:
-                match = re.search(pattern, lower_message)
+            for pattern in CALENDAR_TIME_EXTRACT_PATTERNS:
+                match = pattern.search(lower_message)
                 if match:
                     time_expression = match.group(1).strip()
                     break
-            
+
             if not time_expression:
                 # Try to find any time-like pattern
-                match = re.search(r'(\d+(?::\d+)?\s*(?:am|pm))', lower_message)
+                match = CALENDAR_ANY_TIME_PATTERN.search(lower_message)
                 if match:
                     time_expression = f"at {match.group(1)}"
-            
+
             if not time_expression:
                 return None  # Can't schedule without time
-            
+
             # Extract duration (optional)
             duration = 60  # Default 1 hour
-            duration_match = re.search(r'(?:for|lasting)\s+(\d+)\s*(?:minutes?|mins?|hours?|hrs?)', lower_message)
+            duration_match = CALENDAR_DURATION_PATTERN.search(lower_message)
             if duration_match:
                 amount = int(duration_match.group(1))
                 if 'hour' in lower_message or 'hr' in lower_message:
@@ -1326,28 +1389,16 @@ class ToolEngine:
             
             # Extract location (optional)
             location = None
-            location_patterns = [
-                r'(?:at|in)\s+(?:the\s+)?([A-Z][a-zA-Z\s]+?)\s+(?:room|office|building)',
-                r'location:\s*([^\n,]+)',
-                r'(?:at|in)\s+([A-Z][a-zA-Z\s]+?)(?:\s+at|\s+on|$)',
-            ]
-            
-            for pattern in location_patterns:
-                match = re.search(pattern, message)
+            for pattern in CALENDAR_LOCATION_PATTERNS:
+                match = pattern.search(message)
                 if match:
                     location = match.group(1).strip()
                     break
-            
+
             # Extract description (optional)
             description = None
-            desc_patterns = [
-                r'about\s+([^,\.]+)',
-                r'regarding\s+([^,\.]+)',
-                r'to\s+discuss\s+([^,\.]+)',
-            ]
-            
-            for pattern in desc_patterns:
-                match = re.search(pattern, lower_message)
+            for pattern in CALENDAR_DESCRIPTION_PATTERNS:
+                match = pattern.search(lower_message)
                 if match:
                     description = match.group(1).strip()
                     break
@@ -1372,6 +1423,8 @@ class ToolEngine:
             tool_definition: Tool definition with handler
         """
         self.tools[tool_name] = tool_definition
+        self._tool_definitions_cache = None
+        self._tools_fingerprint = None
         logger.info(f"Tool registered: {tool_name}")
     
     def unregister_tool(self, tool_name: str) -> None:
@@ -1383,6 +1436,8 @@ class ToolEngine:
         """
         if tool_name in self.tools:
             del self.tools[tool_name]
+            self._tool_definitions_cache = None
+            self._tools_fingerprint = None
             logger.info(f"Tool unregistered: {tool_name}")
     
     def get_tools_list(self) -> List[str]:
@@ -1396,31 +1451,49 @@ class ToolEngine:
     
     async def execute_multiple_tools(
         self,
-        tool_calls: List[Dict[str, Any]]
+        tool_calls: List[Dict[str, Any]],
+        max_concurrency: int = 8
     ) -> List[Dict[str, Any]]:
         """
-        Execute multiple tools sequentially
-        
+        Execute multiple tools concurrently
+
+        Wall time becomes the slowest call rather than the sum; a semaphore
+        bounds the fan-out. Per-tool errors are already caught inside
+        execute_tool and returned as error results, so ordering and shape
+        match the old sequential behavior.
+
         Args:
             tool_calls: List of tool call dictionaries with toolName and parameters
-            
+            max_concurrency: Maximum number of tools running at once
+
         Returns:
-            List of tool execution results
+            List of tool execution results (same order as tool_calls)
         """
-        results = []
-        
-        for call in tool_calls:
-            result = await self.execute_tool(
-                call.get('toolName'),
-                call.get('parameters', {})
-            )
-            results.append({
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(call: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                result = await self.execute_tool(
+                    call.get('toolName'),
+                    call.get('parameters', {})
+                )
+            return {
                 'toolName': call.get('toolName'),
                 'result': result
-            })
-        
-        return results
+            }
+
+        return list(await asyncio.gather(*(run_one(call) for call in tool_calls)))
     
+    async def close(self) -> None:
+        """Release shared service resources (HTTP sessions) on shutdown"""
+        for service in (self.weather_service, self.search_service):
+            close = getattr(service, 'close', None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception as error:
+                    logger.error(f"Error closing service session: {error}")
+
     def format_tool_result_for_context(self, tool_result: Dict[str, Any]) -> str:
         """
         Format tool result for inclusion in LLM context
@@ -1434,6 +1507,8 @@ class ToolEngine:
         if tool_result.get('success') and tool_result.get('formatted'):
             return f"[Tool Result]\n{tool_result['formatted']}"
         elif tool_result.get('success'):
-            return f"[Tool Result]\n{json.dumps(tool_result.get('data', {}), indent=2)}"
+            # Compact separators: indentation costs prompt tokens with no
+            # benefit to the model
+            return f"[Tool Result]\n{json.dumps(tool_result.get('data', {}), separators=(',', ':'), default=str)}"
         else:
             return f"[Tool Error]\n{tool_result.get('error', 'Unknown error')}"
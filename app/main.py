@@ -31,12 +31,12 @@ from app.websocket.socket_handler import SocketHandler
 from app.services.llm_service import LLMService
 from app.services.stt_service import STTService
 from app.services.tts_service import TTSService
-from app.services.weather_service import WeatherService
 from app.services.audio_emotion_service import audio_emotion_service
 from app.engines.emotion_engine import EmotionEngine
 from app.engines.persona_engine import PersonaEngine
 from app.engines.memory_engine import MemoryEngine
 from app.engines.tool_engine import ToolEngine
+from app.utils.token_counter import prewarm as prewarm_token_encoder
 from app.utils.logger import logger
 
 # Debug (after logger is available)
@@ -44,6 +44,16 @@ logger.info(f'🔍 DEBUG: Loaded .env from: {_env_path}')
 logger.info(f'🔍 DEBUG: AUDIO_PROVIDER="{os.getenv("AUDIO_PROVIDER", "NOT_SET")}", AUDIO_EMOTION_ENABLED="{os.getenv("AUDIO_EMOTION_ENABLED", "NOT_SET")}"')
 
 
+# Prefer uvloop even when the server is launched externally via
+# `uvicorn app.main:socket_app` (the __main__ path below also passes
+# loop="uvloop" explicitly, which only covers `python -m app.main`)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+
 def _suppress_cancelled_error_in_uvicorn(record: logging.LogRecord) -> bool:
     """Don't log CancelledError as ERROR during shutdown (Ctrl+C)."""
     if record.levelno != logging.ERROR:
@@ -92,9 +102,10 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Eva AI Server...")
     
-    # Connect to databases
-    await connect_database()  # MongoDB or File-based
-    await connect_redis()
+    # Connect to databases concurrently - the document store (MongoDB or
+    # file-based, including its cache load) and Redis are independent, so
+    # startup pays the slower of the two instead of their sum
+    await asyncio.gather(connect_database(), connect_redis())
     
     # Initialize services
     llm_service = LLMService()
@@ -102,8 +113,7 @@ async def lifespan(app: FastAPI):
     logger.info("🔧 Initializing TTS Service...")
     tts_service = TTSService()
     logger.info(f"✅ TTS Service initialized with provider: {tts_service.provider.name}")
-    weather_service = WeatherService()
-    
+
     # Initialize engines
     emotion_engine = EmotionEngine(llm_service, audio_emotion_service)
     persona_engine = PersonaEngine()
@@ -124,6 +134,15 @@ async def lifespan(app: FastAPI):
     
     # Connect reminder service to socket handler and TTS
     tool_engine.reminder_service.set_services(socket_handler, tts_service)
+
+    # Pay the remaining cold starts here instead of on the first user turn:
+    # the tiktoken encoder builds its BPE tables lazily, and the local TTS
+    # provider probes for the Piper binary on first synthesis
+    warmups = [asyncio.to_thread(prewarm_token_encoder)]
+    piper_probe = getattr(tts_service.provider, 'is_piper_available', None)
+    if piper_probe is not None:
+        warmups.append(piper_probe())
+    await asyncio.gather(*warmups)
     
     # Store in app state
     app.state.socket_handler = socket_handler
@@ -137,16 +156,28 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down Eva AI Server...")
+    await llm_service.close()
+    await stt_service.close()
+    await tool_engine.close()
     await disconnect_databases()
     logger.info("✅ Eva AI Server stopped")
 
 
+# Use orjson for response encoding when available (~2-5x faster than stdlib json)
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+    _response_class = ORJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as _response_class
+
 # Create FastAPI app
 app = FastAPI(
     title="Eva AI",
     description="Emotional Voice Assistant with AI",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=_response_class
 )
 
 # CORS middleware
@@ -188,10 +219,23 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", 3001))
     host = os.getenv("HOST", "0.0.0.0")
 
+    # Prefer uvloop + httptools when available (uvicorn[standard]) for
+    # noticeably lower latency on the IO-bound socket/chat paths
+    loop_impl = "auto"
+    http_impl = "auto"
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+        http_impl = "httptools"
+    except ImportError:
+        logger.warning("uvloop not installed - falling back to asyncio event loop")
+
     uvicorn.run(
         socket_app,
         host=host,
         port=port,
+        loop=loop_impl,
+        http=http_impl,
         log_level="info",
         access_log=True,
     )
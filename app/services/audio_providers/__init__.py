@@ -2,8 +2,25 @@ from .openai_audio_provider import OpenAIAudioProvider
 from .local_audio_provider import LocalAudioProvider
 from .kokoro_audio_provider import KokoroAudioProvider
 
+# Provider instances shared across services (mirrors the LLM provider
+# cache): STT and TTS resolve the same provider class from AUDIO_PROVIDER,
+# and sharing one instance means one HTTP client / SDK connection pool
+# (and one Piper binary probe) instead of one per service
+_provider_instances = {}
+
+
+def get_audio_provider(provider_class):
+    """Shared instance of an audio provider class (created on first use)"""
+    instance = _provider_instances.get(provider_class)
+    if instance is None:
+        instance = provider_class()
+        _provider_instances[provider_class] = instance
+    return instance
+
+
 __all__ = [
     'OpenAIAudioProvider',
     'LocalAudioProvider',
-    'KokoroAudioProvider'
+    'KokoroAudioProvider',
+    'get_audio_provider'
 ]
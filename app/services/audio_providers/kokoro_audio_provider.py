@@ -1,7 +1,9 @@
 import os
 import asyncio
+import itertools
 import logging
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any
 import aiofiles
@@ -11,6 +13,17 @@ logger = logging.getLogger(__name__)
 # Kokoro-82M Hugging Face repo
 KOKORO_REPO_ID = 'hexgrad/Kokoro-82M'
 
+# Model inference runs on its own single worker instead of the loop's shared
+# default executor: synthesis jobs are CPU-bound (torch already parallelizes
+# internally), so queueing them one at a time avoids oversubscription and
+# keeps them from starving unrelated to_thread work
+_tts_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='kokoro-tts')
+
+# Monotonic suffix for temp file names: concurrent generations (chunked
+# TTS fires several at once) can share a millisecond timestamp, and a
+# shared name would let one call read or unlink another's output
+_temp_name_seq = itertools.count()
+
 
 class KokoroAudioProvider:
     """Kokoro-82M TTS provider for high-quality local text-to-speech"""
@@ -71,7 +84,7 @@ class KokoroAudioProvider:
         
         timestamp = asyncio.get_event_loop().time()
         timestamp_ms = int(timestamp * 1000)
-        output_path = self.temp_dir / f'kokoro_speech_{timestamp_ms}.wav'
+        output_path = self.temp_dir / f'kokoro_speech_{timestamp_ms}_{next(_temp_name_seq)}.wav'
         
         try:
             import soundfile as sf
@@ -83,23 +96,25 @@ class KokoroAudioProvider:
             
             logger.info(f'Generating speech with Kokoro: voice={voice}, speed={speed}')
             
-            # Run in executor to avoid blocking
+            # Run in the dedicated pool to avoid blocking the event loop
             loop = asyncio.get_event_loop()
             audio_data = await loop.run_in_executor(
-                None,
+                _tts_pool,
                 self._generate_sync,
                 pipeline,
                 text,
                 voice,
                 speed
             )
-            
+
             if audio_data is None:
                 raise Exception('Failed to generate audio')
-            
-            # Save to WAV file
+
+            # Save to WAV file (blocking disk write goes off the loop too)
             self.temp_dir.mkdir(exist_ok=True)
-            sf.write(str(output_path), audio_data, self.sample_rate)
+            await loop.run_in_executor(
+                _tts_pool, sf.write, str(output_path), audio_data, self.sample_rate
+            )
             
             # Read back as bytes
             async with aiofiles.open(output_path, 'rb') as f:
@@ -1,5 +1,6 @@
 import os
 import asyncio
+import itertools
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -8,11 +9,19 @@ import httpx
 
 logger = logging.getLogger(__name__)
 
+# Monotonic suffix for temp file names: concurrent generations (chunked
+# TTS fires several at once) can share a millisecond timestamp, and a
+# shared name would let one call read or unlink another's output
+_temp_name_seq = itertools.count()
+
 
 class LocalAudioProvider:
     def __init__(self):
         self.temp_dir = Path(__file__).parent.parent.parent.parent / 'temp'
         self.name = 'Local (Whisper CLI + eSpeak)'
+        self._groq_client: Optional[httpx.AsyncClient] = None
+        # Result of the one-time Piper binary probe (None = not probed yet)
+        self._piper_available: Optional[bool] = None
         
         # Whisper CLI settings
         self.whisper_model = os.getenv('WHISPER_MODEL', 'base.en')
@@ -36,6 +45,22 @@ class LocalAudioProvider:
         if self.keep_temp_audio:
             logger.info('KEEP_TEMP_AUDIO enabled - audio files will be saved in temp/ folder')
 
+    def _get_groq_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive HTTP client for the Groq Whisper fallback, so
+        repeated transcriptions reuse the TCP+TLS connection instead of
+        paying the handshake per call"""
+        if self._groq_client is None or self._groq_client.is_closed:
+            self._groq_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=30.0)
+            )
+        return self._groq_client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client (call on shutdown)"""
+        if self._groq_client is not None and not self._groq_client.is_closed:
+            await self._groq_client.aclose()
+
     async def transcribe_audio(self, audio_buffer: bytes, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         if options is None:
             options = {}
@@ -47,9 +72,11 @@ class LocalAudioProvider:
         try:
             timestamp = asyncio.get_event_loop().time()
             timestamp_ms = int(timestamp * 1000)
-            temp_raw_path = self.temp_dir / f'input_raw_{timestamp_ms}.webm'
-            temp_wav_path = self.temp_dir / f'input_{timestamp_ms}.wav'
-            temp_output_path = self.temp_dir / f'output_{timestamp_ms}.txt'
+            # One sequence number groups this transcription's three files
+            seq = next(_temp_name_seq)
+            temp_raw_path = self.temp_dir / f'input_raw_{timestamp_ms}_{seq}.webm'
+            temp_wav_path = self.temp_dir / f'input_{timestamp_ms}_{seq}.wav'
+            temp_output_path = self.temp_dir / f'output_{timestamp_ms}_{seq}.txt'
 
             # Save raw audio buffer first
             async with aiofiles.open(temp_raw_path, 'wb') as f:
@@ -191,34 +218,34 @@ class LocalAudioProvider:
             options = {}
         
         try:
-            async with httpx.AsyncClient() as client:
-                files = {
-                    'file': ('audio.webm', audio_buffer, 'audio/webm')
-                }
-                data = {
-                    'model': 'whisper-large-v3',
-                    'language': options.get('language', 'en'),
-                    'response_format': 'json'
-                }
-                
-                response = await client.post(
-                    'https://api.groq.com/openai/v1/audio/transcriptions',
-                    files=files,
-                    data=data,
-                    headers={
-                        'Authorization': f'Bearer {os.getenv("GROQ_API_KEY")}'
-                    }
-                )
-                
-                response.raise_for_status()
-                result = response.json()
+            client = self._get_groq_client()
+            files = {
+                'file': ('audio.webm', audio_buffer, 'audio/webm')
+            }
+            data = {
+                'model': 'whisper-large-v3',
+                'language': options.get('language', 'en'),
+                'response_format': 'json'
+            }
 
-                logger.info('Audio transcribed with Groq Whisper (FREE)')
-                
-                return {
-                    'text': result['text'],
-                    'language': options.get('language', 'en')
+            response = await client.post(
+                'https://api.groq.com/openai/v1/audio/transcriptions',
+                files=files,
+                data=data,
+                headers={
+                    'Authorization': f'Bearer {os.getenv("GROQ_API_KEY")}'
                 }
+            )
+
+            response.raise_for_status()
+            result = response.json()
+
+            logger.info('Audio transcribed with Groq Whisper (FREE)')
+
+            return {
+                'text': result['text'],
+                'language': options.get('language', 'en')
+            }
         except Exception as error:
             logger.error(f'Groq Whisper error: {error}')
             raise
@@ -266,7 +293,7 @@ class LocalAudioProvider:
 
         timestamp = asyncio.get_event_loop().time()
         timestamp_ms = int(timestamp * 1000)
-        output_path = self.temp_dir / f'speech_{timestamp_ms}.wav'
+        output_path = self.temp_dir / f'speech_{timestamp_ms}_{next(_temp_name_seq)}.wav'
 
         try:
             speed = round((options.get('speed', 1.0)) * 175)
@@ -315,7 +342,7 @@ class LocalAudioProvider:
         
         timestamp = asyncio.get_event_loop().time()
         timestamp_ms = int(timestamp * 1000)
-        output_path = self.temp_dir / f'speech_{timestamp_ms}.wav'
+        output_path = self.temp_dir / f'speech_{timestamp_ms}_{next(_temp_name_seq)}.wav'
         piper_path = os.getenv('PIPER_PATH', 'piper')
         piper_model = os.getenv('PIPER_MODEL', 'en_US-lessac-medium')
 
@@ -356,6 +383,11 @@ class LocalAudioProvider:
             raise
 
     async def is_piper_available(self) -> bool:
+        # Probe once and remember: the binary doesn't appear or vanish
+        # mid-run, and spawning a --version subprocess on every TTS call
+        # added tens of milliseconds before synthesis even started
+        if self._piper_available is not None:
+            return self._piper_available
         try:
             piper_path = os.getenv('PIPER_PATH', 'piper')
             process = await asyncio.create_subprocess_exec(
@@ -365,9 +397,10 @@ class LocalAudioProvider:
                 stderr=asyncio.subprocess.PIPE
             )
             await process.communicate()
-            return process.returncode == 0
+            self._piper_available = process.returncode == 0
         except Exception:
-            return False
+            self._piper_available = False
+        return self._piper_available
 
     def validate_config(self) -> bool:
         """Check if any STT option is available"""
@@ -8,8 +8,14 @@ import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from app.utils.logger import logger
 
+# Dedicated single-thread pool for calendar saves: dumps submitted to the
+# shared default executor contend with every other blocking task in the
+# process, and a single worker also serializes writes to the same file
+_save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='calendar-save')
+
 
 class CalendarService:
     """Service for managing calendar events and meetings"""
@@ -38,12 +44,19 @@ class CalendarService:
             self.events = {}
     
     def _save_events(self):
-        """Save calendar events to file"""
+        """Save calendar events to file (atomic: tmp file + replace, so a
+        crash mid-write can never leave a torn calendar file)"""
+        tmp = self.calendar_file.with_name(self.calendar_file.name + '.tmp')
         try:
-            with open(self.calendar_file, 'w') as f:
+            with open(tmp, 'w') as f:
                 json.dump(self.events, f, indent=2, default=str)
+            os.replace(tmp, self.calendar_file)
         except Exception as e:
             logger.error(f"Error saving calendar events: {e}")
+
+    async def _save_events_async(self):
+        """Save events from a request path without blocking the event loop"""
+        await asyncio.get_running_loop().run_in_executor(_save_pool, self._save_events)
     
     async def schedule_meeting(
         self,
@@ -98,7 +111,7 @@ class CalendarService:
             
             # Save event
             self.events[event_id] = event
-            self._save_events()
+            await self._save_events_async()
             
             logger.info(f"✅ Scheduled meeting: {title} at {start_time}")
             
@@ -365,7 +378,7 @@ class CalendarService:
             # Update status
             event['status'] = 'cancelled'
             event['cancelled_at'] = datetime.now().isoformat()
-            self._save_events()
+            await self._save_events_async()
             
             logger.info(f"❌ Cancelled event: {event['title']}")
             
@@ -411,7 +424,7 @@ class CalendarService:
                     event[field] = value
             
             event['updated_at'] = datetime.now().isoformat()
-            self._save_events()
+            await self._save_events_async()
             
             logger.info(f"✏️ Updated event: {event['title']}")
             
@@ -2,38 +2,49 @@
 Conversation service for managing conversations and messages
 """
 
+import re
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Union
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.config.database import get_database, get_mongodb
-from app.models.conversation import (
-    Message,
-    ConversationBase,
-    ConversationDB,
-    ConversationSummary,
-    generate_title_from_message
-)
+from app.models.conversation import generate_title_from_message
 from app.utils.logger import logger
 
 
+# Constant query shapes, built once at import instead of as fresh literals
+# per call - keeps the query objects identical across calls as well
+_SUMMARY_PROJECTION = {
+    "sessionId": 1,
+    "title": 1,
+    "messages": 1,
+    "persona": 1,
+    "lastMessageAt": 1,
+    "createdAt": 1,
+    "isActive": 1
+}
+
+
 class ConversationService:
     """Service for managing conversations"""
     
     def __init__(self):
         self.db: Optional[Union[AsyncIOMotorDatabase, Any]] = None
         self.collection_name = "conversations"
-    
+        self._collection: Optional[Any] = None
+
     def _get_collection(self):
-        """Get conversations collection"""
-        if self.db is None:
-            self.db = get_database()
-        
-        # Support both MongoDB and file-based DB
-        if hasattr(self.db, 'get_collection'):
-            return self.db.get_collection(self.collection_name)
-        else:
-            # MongoDB
-            return self.db[self.collection_name]
+        """Get conversations collection (handle resolved once and reused)"""
+        if self._collection is None:
+            if self.db is None:
+                self.db = get_database()
+
+            # Support both MongoDB and file-based DB
+            if hasattr(self.db, 'get_collection'):
+                self._collection = self.db.get_collection(self.collection_name)
+            else:
+                # MongoDB
+                self._collection = self.db[self.collection_name]
+        return self._collection
     
     async def create_conversation(
         self, 
@@ -163,24 +174,24 @@ class ConversationService:
                 "timestamp": now
             }
             
-            # Get current messages
-            messages = conversation.get("messages", [])
-            messages.append(message)
-            
-            # Auto-generate title from first user message
+            # Append via $push so the existing message array isn't rewritten
+            # (single update round trip on both MongoDB and the file DB)
             update_data = {
-                "messages": messages,
                 "lastMessageAt": now,
                 "updatedAt": now
             }
-            
-            if len(messages) == 1 and role == "user":
+
+            # Auto-generate title from first user message
+            if len(conversation.get("messages", [])) == 0 and role == "user":
                 title = generate_title_from_message(content)
                 update_data["title"] = title
-            
+
             await collection.update_one(
                 {"sessionId": session_id},
-                {"$set": update_data}
+                {
+                    "$set": update_data,
+                    "$push": {"messages": message}
+                }
             )
             
             return message
@@ -213,15 +224,7 @@ class ConversationService:
                     "userId": user_id,
                     "messages.0": {"$exists": True}
                 },
-                {
-                    "sessionId": 1,
-                    "title": 1,
-                    "messages": 1,
-                    "persona": 1,
-                    "lastMessageAt": 1,
-                    "createdAt": 1,
-                    "isActive": 1
-                }
+                _SUMMARY_PROJECTION
             ).sort("lastMessageAt", -1).limit(limit)
             
             conversations = await cursor.to_list(length=limit)
@@ -290,18 +293,19 @@ class ConversationService:
         """
         try:
             collection = self._get_collection()
-            
-            conversation = await collection.find_one({"sessionId": session_id})
-            if conversation:
-                await collection.update_one(
-                    {"sessionId": session_id},
-                    {
-                        "$set": {
-                            "isActive": False,
-                            "updatedAt": datetime.utcnow()
-                        }
+
+            # The update itself reports whether a conversation matched, so
+            # the existence pre-check was a wasted round trip
+            result = await collection.update_one(
+                {"sessionId": session_id},
+                {
+                    "$set": {
+                        "isActive": False,
+                        "updatedAt": datetime.utcnow()
                     }
-                )
+                }
+            )
+            if result.modified_count:
                 logger.info(f"Ended conversation: {session_id}")
                 
         except Exception as error:
@@ -325,20 +329,23 @@ class ConversationService:
             conversation = await collection.find_one({"sessionId": session_id})
             if not conversation:
                 raise ValueError(f"Conversation not found: {session_id}")
-            
+
+            now = datetime.utcnow()
             await collection.update_one(
                 {"sessionId": session_id},
                 {
                     "$set": {
                         "title": title,
-                        "updatedAt": datetime.utcnow()
+                        "updatedAt": now
                     }
                 }
             )
-            
-            # Return updated conversation
-            updated = await collection.find_one({"sessionId": session_id})
-            return updated
+
+            # The updated values are already known in-process - apply them to
+            # the fetched document instead of re-querying
+            conversation["title"] = title
+            conversation["updatedAt"] = now
+            return conversation
             
         except Exception as error:
             logger.error(f"Error updating conversation title: {error}")
@@ -380,13 +387,17 @@ class ConversationService:
         """
         try:
             collection = self._get_collection()
-            
+
+            # User input is a literal search string, not a pattern - escape it
+            # so queries like "(" match literally instead of failing the regex
+            # compile and surfacing as an empty result
+            pattern = re.escape(query)
             cursor = collection.find(
                 {
                     "userId": user_id,
                     "$or": [
-                        {"title": {"$regex": query, "$options": "i"}},
-                        {"messages.content": {"$regex": query, "$options": "i"}}
+                        {"title": {"$regex": pattern, "$options": "i"}},
+                        {"messages.content": {"$regex": pattern, "$options": "i"}}
                     ]
                 }
             ).sort("lastMessageAt", -1).limit(limit)
@@ -22,12 +22,17 @@ class GroqProvider:
             options = {}
         
         try:
-            response = await self.client.chat.completions.create(
-                model=options.get('model', self.model),
-                messages=messages,
-                temperature=options.get('temperature', 0.7),
-                max_tokens=options.get('max_tokens', 1000)
-            )
+            request_kwargs = {
+                'model': options.get('model', self.model),
+                'messages': messages,
+                'temperature': options.get('temperature', 0.7),
+                'max_tokens': options.get('max_tokens', 1000)
+            }
+            # JSON mode for analyzer prompts (Groq is OpenAI-compatible)
+            if options.get('response_format'):
+                request_kwargs['response_format'] = options['response_format']
+
+            response = await self.client.chat.completions.create(**request_kwargs)
 
             return response.choices[0].message.content
         except Exception as error:
@@ -52,15 +57,17 @@ class GroqProvider:
                 stream=True
             )
 
-            full_content = ''
+            # Collect deltas in a list - repeated += on a str re-copies the
+            # whole accumulated response for every chunk
+            content_parts = []
             async for chunk in stream:
                 content = chunk.choices[0].delta.content or ''
                 if content:
-                    full_content += content
+                    content_parts.append(content)
                     if on_chunk:
                         on_chunk(content)
 
-            return full_content
+            return ''.join(content_parts)
         except Exception as error:
             logger.error(f'Groq streaming error: {error}')
             raise
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Callable
 import aiohttp
 import asyncio
@@ -7,12 +8,40 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _format_message(role: str, content: str) -> str:
+    """Format one chat message as Mistral-instruct markup (cached - the
+    first N-1 messages of a conversation are identical turn after turn)"""
+    if role == 'system':
+        return f'<s>[INST] {content} [/INST]'
+    elif role == 'user':
+        return f'<s>[INST] {content} [/INST]'
+    elif role == 'assistant':
+        return f'{content}</s>'
+    return content
+
+
 class HuggingFaceProvider:
     def __init__(self):
         self.api_key = os.getenv('HUGGINGFACE_API_KEY')
         self.model = os.getenv('HUGGINGFACE_MODEL', 'mistralai/Mistral-7B-Instruct-v0.2')
         self.base_url = 'https://api-inference.huggingface.co/models'
         self.name = 'Hugging Face'
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session so each call reuses TCP/TLS connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60, connect=5),
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=50)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     async def generate_completion(
         self,
@@ -24,31 +53,31 @@ class HuggingFaceProvider:
         
         try:
             prompt = self.format_messages(messages)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f'{self.base_url}/{options.get("model", self.model)}',
-                    json={
-                        'inputs': prompt,
-                        'parameters': {
-                            'temperature': options.get('temperature', 0.7),
-                            'max_new_tokens': options.get('max_tokens', 1000),
-                            'return_full_text': False
-                        }
-                    },
-                    headers={
-                        'Authorization': f'Bearer {self.api_key}',
-                        'Content-Type': 'application/json'
+
+            session = self._get_session()
+            async with session.post(
+                f'{self.base_url}/{options.get("model", self.model)}',
+                json={
+                    'inputs': prompt,
+                    'parameters': {
+                        'temperature': options.get('temperature', 0.7),
+                        'max_new_tokens': options.get('max_tokens', 1000),
+                        'return_full_text': False
                     }
-                ) as response:
-                    data = await response.json()
-                    
-                    if response.status == 503:
-                        raise Exception('Model is loading. Please wait a moment and try again.')
-                    
-                    if isinstance(data, list):
-                        return data[0]['generated_text']
-                    return data.get('generated_text', data[0].get('generated_text', ''))
+                },
+                headers={
+                    'Authorization': f'Bearer {self.api_key}',
+                    'Content-Type': 'application/json'
+                }
+            ) as response:
+                data = await response.json()
+
+                if response.status == 503:
+                    raise Exception('Model is loading. Please wait a moment and try again.')
+
+                if isinstance(data, list):
+                    return data[0]['generated_text']
+                return data.get('generated_text', data[0].get('generated_text', ''))
         except Exception as error:
             logger.error(f'Hugging Face completion error: {error}')
             raise
@@ -60,30 +89,20 @@ class HuggingFaceProvider:
         on_chunk: Optional[Callable[[str], None]] = None
     ) -> str:
         result = await self.generate_completion(messages, options)
-        
+
+        # The inference API has no real streaming; replay the text as word
+        # chunks. sleep(0) yields to the loop between chunks without the
+        # artificial 50ms/word delay that throttled responses to ~20 words/s.
         if on_chunk:
             words = result.split(' ')
             for word in words:
                 on_chunk(word + ' ')
-                await asyncio.sleep(0.05)
-        
+                await asyncio.sleep(0)
+
         return result
 
     def format_messages(self, messages: List[Dict[str, str]]) -> str:
-        formatted = []
-        for msg in messages:
-            role = msg['role']
-            content = msg['content']
-            
-            if role == 'system':
-                formatted.append(f'<s>[INST] {content} [/INST]')
-            elif role == 'user':
-                formatted.append(f'<s>[INST] {content} [/INST]')
-            elif role == 'assistant':
-                formatted.append(f'{content}</s>')
-            else:
-                formatted.append(content)
-        
+        formatted = [_format_message(msg['role'], msg['content']) for msg in messages]
         return '\n'.join(formatted)
 
     def validate_config(self) -> bool:
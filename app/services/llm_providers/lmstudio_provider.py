@@ -4,14 +4,42 @@ import aiohttp
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Constant request settings, built once instead of per call
+_VALIDATE_TIMEOUT = aiohttp.ClientTimeout(total=3)
+
+# Stream parsing decodes one small JSON blob per generated token - the
+# tightest loop in this module - so use orjson when available (its
+# JSONDecodeError subclasses json's, keeping the except clauses valid)
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 class LMStudioProvider:
     def __init__(self):
         self.base_url = os.getenv('LMSTUDIO_BASE_URL', 'http://localhost:1234/v1')
         self.model = os.getenv('LMSTUDIO_MODEL', 'local-model')
         self.name = 'LM Studio'
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session so each call reuses TCP connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60, connect=5),
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=50)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     async def generate_completion(
         self,
@@ -22,19 +50,23 @@ class LMStudioProvider:
             options = {}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f'{self.base_url}/chat/completions',
-                    json={
-                        'model': options.get('model', self.model),
-                        'messages': messages,
-                        'temperature': options.get('temperature', 0.7),
-                        'max_tokens': options.get('max_tokens', 1000),
-                        'stream': False
-                    }
-                ) as response:
-                    data = await response.json()
-                    return data['choices'][0]['message']['content']
+            session = self._get_session()
+            async with session.post(
+                f'{self.base_url}/chat/completions',
+                json={
+                    'model': options.get('model', self.model),
+                    'messages': messages,
+                    'temperature': options.get('temperature', 0.7),
+                    'max_tokens': options.get('max_tokens', 1000),
+                    'stream': False,
+                    # JSON mode for analyzer prompts (OpenAI-compatible API);
+                    # None is ignored by the server
+                    **({'response_format': options['response_format']}
+                       if options.get('response_format') else {})
+                }
+            ) as response:
+                data = await response.json()
+                return data['choices'][0]['message']['content']
         except Exception as error:
             logger.error(f'LM Studio completion error: {error}')
             raise Exception(f'LM Studio error: {str(error)}. Is LM Studio running?')
@@ -49,49 +81,56 @@ class LMStudioProvider:
             options = {}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f'{self.base_url}/chat/completions',
-                    json={
-                        'model': options.get('model', self.model),
-                        'messages': messages,
-                        'temperature': options.get('temperature', 0.7),
-                        'max_tokens': options.get('max_tokens', 1000),
-                        'stream': True
-                    }
-                ) as response:
-                    full_content = ''
-                    
-                    async for line in response.content:
-                        line_str = line.decode('utf-8').strip()
-                        if line_str and line_str.startswith('data: '):
-                            data_str = line_str.replace('data: ', '', 1)
-                            if data_str == '[DONE]':
-                                break
-                            
+            session = self._get_session()
+            async with session.post(
+                f'{self.base_url}/chat/completions',
+                json={
+                    'model': options.get('model', self.model),
+                    'messages': messages,
+                    'temperature': options.get('temperature', 0.7),
+                    'max_tokens': options.get('max_tokens', 1000),
+                    'stream': True
+                }
+            ) as response:
+                # Collect deltas in a list - repeated += on a str re-copies
+                # the whole accumulated response for every chunk
+                content_parts = []
+
+                async for line in response.content:
+                    line_str = line.decode('utf-8').strip()
+                    if line_str and line_str.startswith('data: '):
+                        data_str = line_str.replace('data: ', '', 1)
+                        if data_str == '[DONE]':
+                            break
+
+                        try:
+                            data = _loads(data_str)
+                            # Direct indexing instead of chained .get()s with
+                            # fresh default list/dict allocations per chunk
                             try:
-                                data = json.loads(data_str)
-                                content = data.get('choices', [{}])[0].get('delta', {}).get('content', '')
-                                if content:
-                                    full_content += content
-                                    if on_chunk:
-                                        on_chunk(content)
-                            except json.JSONDecodeError as err:
-                                logger.error(f'Error parsing LM Studio stream: {err}')
-                    
-                    return full_content
+                                content = data['choices'][0]['delta'].get('content')
+                            except (KeyError, IndexError):
+                                content = None
+                            if content:
+                                content_parts.append(content)
+                                if on_chunk:
+                                    on_chunk(content)
+                        except json.JSONDecodeError as err:
+                            logger.error(f'Error parsing LM Studio stream: {err}')
+
+                return ''.join(content_parts)
         except Exception as error:
             logger.error(f'LM Studio streaming error: {error}')
             raise
 
     async def validate_config(self) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f'{self.base_url}/models',
-                    timeout=aiohttp.ClientTimeout(total=3)
-                ) as response:
-                    return response.status == 200
+            session = self._get_session()
+            async with session.get(
+                f'{self.base_url}/models',
+                timeout=_VALIDATE_TIMEOUT
+            ) as response:
+                return response.status == 200
         except Exception as error:
             logger.warning(f'LM Studio not available: {error}')
             return False
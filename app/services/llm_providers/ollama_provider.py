@@ -1,17 +1,59 @@
 import os
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Callable
 import aiohttp
 import json
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Constant request settings, built once instead of per call
+_VALIDATE_TIMEOUT = aiohttp.ClientTimeout(total=3)
+
+# Stream parsing decodes one small JSON blob per generated token - the
+# tightest loop in this module - so use orjson when available (its
+# JSONDecodeError subclasses json's, keeping the except clauses valid)
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+@lru_cache(maxsize=512)
+def _format_message(role: str, content: str) -> str:
+    """Format one chat message for the prompt (cached - the first N-1
+    messages of a conversation are identical turn after turn)"""
+    if role == 'system':
+        return f'System: {content}'
+    elif role == 'user':
+        return f'User: {content}'
+    elif role == 'assistant':
+        return f'Assistant: {content}'
+    return content
+
 
 class OllamaProvider:
     def __init__(self):
         self.base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
         self.model = os.getenv('OLLAMA_MODEL', 'llama3.1:8b')
         self.name = 'Ollama'
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session so each call reuses TCP connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60, connect=5),
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=50)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     async def generate_completion(
         self,
@@ -23,23 +65,28 @@ class OllamaProvider:
         
         try:
             prompt = self.format_messages(messages)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f'{self.base_url}/api/generate',
-                    json={
-                        'model': options.get('model', self.model),
-                        'prompt': prompt,
-                        'stream': False,
-                        'options': {
-                            'temperature': options.get('temperature', 0.7),
-                            'num_predict': options.get('max_tokens', 1000),
-                            'top_p': options.get('top_p', 1)
-                        }
-                    }
-                ) as response:
-                    data = await response.json()
-                    return data['response']
+
+            payload = {
+                'model': options.get('model', self.model),
+                'prompt': prompt,
+                'stream': False,
+                'options': {
+                    'temperature': options.get('temperature', 0.7),
+                    'num_predict': options.get('max_tokens', 1000),
+                    'top_p': options.get('top_p', 1)
+                }
+            }
+            # Ollama's equivalent of JSON mode: constrains output to valid JSON
+            if options.get('response_format'):
+                payload['format'] = 'json'
+
+            session = self._get_session()
+            async with session.post(
+                f'{self.base_url}/api/generate',
+                json=payload
+            ) as response:
+                data = await response.json()
+                return data['response']
         except Exception as error:
             logger.error(f'Ollama completion error: {error}')
             raise Exception(f'Ollama error: {str(error)}. Is Ollama running?')
@@ -55,66 +102,55 @@ class OllamaProvider:
         
         try:
             prompt = self.format_messages(messages)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f'{self.base_url}/api/generate',
-                    json={
-                        'model': options.get('model', self.model),
-                        'prompt': prompt,
-                        'stream': True,
-                        'options': {
-                            'temperature': options.get('temperature', 0.7),
-                            'num_predict': options.get('max_tokens', 1000)
-                        }
+
+            session = self._get_session()
+            async with session.post(
+                f'{self.base_url}/api/generate',
+                json={
+                    'model': options.get('model', self.model),
+                    'prompt': prompt,
+                    'stream': True,
+                    'options': {
+                        'temperature': options.get('temperature', 0.7),
+                        'num_predict': options.get('max_tokens', 1000)
                     }
-                ) as response:
-                    full_content = ''
-                    
-                    async for line in response.content:
-                        line_str = line.decode('utf-8').strip()
-                        if line_str:
-                            try:
-                                data = json.loads(line_str)
-                                if 'response' in data:
-                                    full_content += data['response']
-                                    if on_chunk:
-                                        on_chunk(data['response'])
-                                if data.get('done', False):
-                                    break
-                            except json.JSONDecodeError as err:
-                                logger.error(f'Error parsing Ollama stream: {err}')
-                    
-                    return full_content
+                }
+            ) as response:
+                # Collect deltas in a list - repeated += on a str re-copies
+                # the whole accumulated response for every chunk
+                content_parts = []
+
+                async for line in response.content:
+                    line_str = line.decode('utf-8').strip()
+                    if line_str:
+                        try:
+                            data = _loads(line_str)
+                            if 'response' in data:
+                                content_parts.append(data['response'])
+                                if on_chunk:
+                                    on_chunk(data['response'])
+                            if data.get('done', False):
+                                break
+                        except json.JSONDecodeError as err:
+                            logger.error(f'Error parsing Ollama stream: {err}')
+
+                return ''.join(content_parts)
         except Exception as error:
             logger.error(f'Ollama streaming error: {error}')
             raise
 
     def format_messages(self, messages: List[Dict[str, str]]) -> str:
-        formatted = []
-        for msg in messages:
-            role = msg['role']
-            content = msg['content']
-            
-            if role == 'system':
-                formatted.append(f'System: {content}')
-            elif role == 'user':
-                formatted.append(f'User: {content}')
-            elif role == 'assistant':
-                formatted.append(f'Assistant: {content}')
-            else:
-                formatted.append(content)
-        
+        formatted = [_format_message(msg['role'], msg['content']) for msg in messages]
         return '\n\n'.join(formatted) + '\n\nAssistant:'
 
     async def validate_config(self) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f'{self.base_url}/api/tags',
-                    timeout=aiohttp.ClientTimeout(total=3)
-                ) as response:
-                    return response.status == 200
+            session = self._get_session()
+            async with session.get(
+                f'{self.base_url}/api/tags',
+                timeout=_VALIDATE_TIMEOUT
+            ) as response:
+                return response.status == 200
         except Exception as error:
             logger.warning(f'Ollama not available: {error}')
             return False
@@ -21,15 +21,21 @@ class OpenAIProvider:
             options = {}
         
         try:
-            response = await self.client.chat.completions.create(
-                model=options.get('model', self.model),
-                messages=messages,
-                temperature=options.get('temperature', 0.7),
-                max_tokens=options.get('max_tokens', 1000),
-                top_p=options.get('top_p', 1),
-                frequency_penalty=options.get('frequency_penalty', 0),
-                presence_penalty=options.get('presence_penalty', 0)
-            )
+            request_kwargs = {
+                'model': options.get('model', self.model),
+                'messages': messages,
+                'temperature': options.get('temperature', 0.7),
+                'max_tokens': options.get('max_tokens', 1000),
+                'top_p': options.get('top_p', 1),
+                'frequency_penalty': options.get('frequency_penalty', 0),
+                'presence_penalty': options.get('presence_penalty', 0)
+            }
+            # JSON mode for analyzer prompts: the model is constrained to
+            # emit valid JSON, so no tokens are spent on prose around it
+            if options.get('response_format'):
+                request_kwargs['response_format'] = options['response_format']
+
+            response = await self.client.chat.completions.create(**request_kwargs)
 
             return response.choices[0].message.content
         except Exception as error:
@@ -54,15 +60,17 @@ class OpenAIProvider:
                 stream=True
             )
 
-            full_content = ''
+            # Collect deltas in a list - repeated += on a str re-copies the
+            # whole accumulated response for every chunk
+            content_parts = []
             async for chunk in stream:
                 content = chunk.choices[0].delta.content or ''
                 if content:
-                    full_content += content
+                    content_parts.append(content)
                     if on_chunk:
                         on_chunk(content)
 
-            return full_content
+            return ''.join(content_parts)
         except Exception as error:
             logger.error(f'OpenAI streaming error: {error}')
             raise
@@ -1,4 +1,8 @@
 import os
+import json
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Callable
 import logging
 
@@ -9,10 +13,95 @@ from .llm_providers import (
     GroqProvider,
     HuggingFaceProvider
 )
+from .response_cache import response_cache, is_cacheable
+from .semantic_cache import semantic_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 logger = logging.getLogger(__name__)
 
 
+# Embeddings are converted to arrays once when they arrive from the
+# provider, so the consumers doing vector math (semantic cache cosine
+# similarity) don't re-box a list of Python floats on every lookup. They
+# are unit-normalized here as well: cosine against a pre-normalized store
+# is then a plain inner product, with no per-lookup (or per-store) norm
+# division - normalization happens once per distinct text instead of once
+# per use of the vector. The arrays are kept as float16: that halves what
+# the 4096-entry cache holds in RAM versus float32 (~6 MB instead of
+# ~12 MB for 1536-dim vectors), and the precision loss is far below the
+# 0.95 cosine threshold the semantic cache compares against - consumers
+# promote to float32 for the actual math. Without numpy the raw provider
+# list is kept and everything still works.
+if np is not None:
+    def _as_vector(embedding: List[float]) -> Any:
+        """Provider embedding as a contiguous, unit-normalized float16 array
+        (an all-zero embedding is kept as-is; consumers treat it as a miss)"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm:
+            vector = vector / norm
+        return vector.astype(np.float16)
+else:
+    def _as_vector(embedding: List[float]) -> Any:
+        """Provider embedding unchanged (numpy unavailable)"""
+        return embedding
+
+PROVIDER_CLASSES = {
+    'openai': OpenAIProvider,
+    'ollama': OllamaProvider,
+    'lmstudio': LMStudioProvider,
+    'groq': GroqProvider,
+    'huggingface': HuggingFaceProvider
+}
+
+
+@lru_cache(maxsize=16)
+def resolve_provider_class(provider_type: str):
+    """Resolve a provider name to its class (cached; names are a small fixed set)"""
+    return PROVIDER_CLASSES.get(provider_type.strip().lower())
+
+
+# Provider instances shared across LLMService constructions so every service
+# reuses the same SDK client / HTTP session instead of opening new connections
+_provider_instances: Dict[str, Any] = {}
+
+# Embeddings are deterministic per (model, text), so repeated queries - the
+# semantic cache embedding the same prompt phrasings across sessions - can
+# skip the provider round trip entirely
+EMBEDDING_CACHE_MAX_SIZE = 4096
+_embedding_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+# In-flight embedding requests by text, so concurrent callers embedding the
+# same prompt (e.g. parallel sessions hitting the semantic cache) share one
+# provider call instead of issuing duplicates before the cache fills
+_embedding_in_flight: Dict[str, "asyncio.Future"] = {}
+
+
+def _cache_embedding(text: str, embedding: Any) -> None:
+    """Remember an embedding, evicting the least recently used on overflow"""
+    _embedding_cache[text] = embedding
+    _embedding_cache.move_to_end(text)
+    while len(_embedding_cache) > EMBEDDING_CACHE_MAX_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+def get_provider_instance(provider_type: str):
+    """Get (and cache) the singleton provider instance for a provider name"""
+    name = provider_type.strip().lower()
+    instance = _provider_instances.get(name)
+    if instance is None:
+        provider_class = resolve_provider_class(name)
+        if provider_class is None:
+            return None
+        instance = provider_class()
+        _provider_instances[name] = instance
+    return instance
+
+
 class LLMService:
     def __init__(self):
         self.provider = self.initialize_provider()
@@ -22,23 +111,15 @@ class LLMService:
         logger.info(f'Model info: {self.provider.get_model_info()}')
 
     def initialize_provider(self):
-        provider_type = os.getenv('LLM_PROVIDER', 'ollama').lower()
-        
-        providers = {
-            'openai': OpenAIProvider,
-            'ollama': OllamaProvider,
-            'lmstudio': LMStudioProvider,
-            'groq': GroqProvider,
-            'huggingface': HuggingFaceProvider
-        }
+        provider_type = os.getenv('LLM_PROVIDER', 'ollama')
 
-        provider_class = providers.get(provider_type)
-        
-        if not provider_class:
+        provider = get_provider_instance(provider_type)
+
+        if provider is None:
             logger.warning(f'Unknown provider: {provider_type}, falling back to Ollama')
-            return OllamaProvider()
+            return get_provider_instance('ollama')
 
-        return provider_class()
+        return provider
 
     async def generate_completion(
         self,
@@ -50,13 +131,61 @@ class LLMService:
         
         try:
             options['max_tokens'] = options.get('max_tokens', self.default_max_tokens)
-            content = await self.provider.generate_completion(messages, options)
+
+            if is_cacheable(options):
+                key = response_cache.make_key(
+                    self.provider.name,
+                    getattr(self.provider, 'model', ''),
+                    messages,
+                    options
+                )
+                content = await response_cache.get_or_fetch(
+                    key,
+                    lambda: self._fetch_with_semantic_cache(messages, options)
+                )
+            else:
+                content = await self.provider.generate_completion(messages, options)
+
             logger.info(f'LLM completion generated: {content[:100]}...')
             return content
         except Exception as error:
             logger.error(f'Error generating LLM completion: {error}')
             raise
 
+    async def _fetch_with_semantic_cache(
+        self,
+        messages: List[Dict[str, str]],
+        options: Dict[str, Any]
+    ) -> str:
+        """
+        Fetch a completion, consulting the semantic cache first so
+        near-duplicate deterministic prompts skip the provider call.
+        Only used behind an exact-cache miss.
+        """
+        embedding = None
+        context = 0
+        if semantic_cache.enabled and self.provider.name == 'OpenAI':
+            query = semantic_cache.query_text(messages)
+            if query:
+                try:
+                    embedding = await self.embed_text(query)
+                except Exception as error:
+                    logger.debug(f'Semantic cache embedding failed: {error}')
+                if embedding is not None:
+                    # Fuzzy match on the query text, exact match on the
+                    # surrounding messages it was answered under
+                    context = semantic_cache.context_key(messages)
+                    cached = semantic_cache.lookup(embedding, context)
+                    if cached is not None:
+                        return cached
+
+        content = await self.provider.generate_completion(messages, options)
+
+        if embedding is not None:
+            semantic_cache.store(embedding, content, context)
+
+        return content
+
     async def generate_streaming_completion(
         self,
         messages: List[Dict[str, str]],
@@ -93,10 +222,10 @@ class LLMService:
             messages = [{'role': 'system', 'content': system_prompt}]
 
             if conversation_history:
-                messages.extend([
+                messages.extend(
                     {'role': msg['role'], 'content': msg['content']}
                     for msg in conversation_history
-                ])
+                )
 
             messages.append({'role': 'user', 'content': user_message})
 
@@ -122,10 +251,10 @@ class LLMService:
             messages = [{'role': 'system', 'content': system_prompt}]
 
             if conversation_history:
-                messages.extend([
+                messages.extend(
                     {'role': msg['role'], 'content': msg['content']}
                     for msg in conversation_history
-                ])
+                )
 
             messages.append({'role': 'user', 'content': user_message})
 
@@ -159,7 +288,6 @@ class LLMService:
                 message = response.choices[0].message
 
                 if message.function_call:
-                    import json
                     return {
                         'type': 'function_call',
                         'name': message.function_call.name,
@@ -179,20 +307,95 @@ class LLMService:
             'content': await self.generate_completion(messages, options)
         }
 
-    async def embed_text(self, text: str) -> Optional[List[float]]:
-        if self.provider.name == 'OpenAI':
+    async def embed_text(self, text: str) -> Optional[Any]:
+        cached = _embedding_cache.get(text)
+        if cached is not None:
+            _embedding_cache.move_to_end(text)
+            return cached
+
+        if self.provider.name != 'OpenAI':
+            logger.warning('Embeddings not supported by current provider')
+            return None
+
+        # Coalesce concurrent requests for the same text into one call
+        pending = _embedding_in_flight.get(text)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        pending = asyncio.get_event_loop().create_future()
+        _embedding_in_flight[text] = pending
+        try:
+            response = await self.provider.client.embeddings.create(
+                model='text-embedding-ada-002',
+                input=text
+            )
+            embedding = _as_vector(response.data[0].embedding)
+            _cache_embedding(text, embedding)
+        except Exception as error:
+            logger.error(f'Error generating embedding: {error}')
+            if not pending.done():
+                pending.set_exception(error)
+                # Consume the exception if nobody else awaited it
+                pending.exception()
+            raise
+        finally:
+            _embedding_in_flight.pop(text, None)
+
+        if not pending.done():
+            pending.set_result(embedding)
+        return embedding
+
+    async def embed_texts(self, texts: List[str]) -> Optional[List[Any]]:
+        """
+        Embed several texts in one provider round trip.
+
+        The embeddings endpoint accepts a list input, so callers with N
+        texts pay one network round trip instead of N sequential ones.
+        Texts already in the embedding cache are served from it and only
+        the misses are sent to the provider.
+        """
+        if not texts:
+            return []
+
+        results: Dict[str, Any] = {}
+        misses = []
+        for text in texts:
+            cached = _embedding_cache.get(text)
+            if cached is not None:
+                _embedding_cache.move_to_end(text)
+                results[text] = cached
+            elif text not in misses:
+                misses.append(text)
+
+        if misses:
+            if self.provider.name != 'OpenAI':
+                logger.warning('Embeddings not supported by current provider')
+                return None
             try:
                 response = await self.provider.client.embeddings.create(
                     model='text-embedding-ada-002',
-                    input=text
+                    input=misses
                 )
-                return response.data[0].embedding
+                # The API may return items out of order; index is authoritative
+                for item in response.data:
+                    text = misses[item.index]
+                    vector = _as_vector(item.embedding)
+                    results[text] = vector
+                    _cache_embedding(text, vector)
             except Exception as error:
-                logger.error(f'Error generating embedding: {error}')
+                logger.error(f'Error generating batch embeddings: {error}')
                 raise
-        
-        logger.warning('Embeddings not supported by current provider')
-        return None
+
+        return [results[text] for text in texts]
+
+    async def close(self) -> None:
+        """Release provider resources (shared HTTP sessions) on shutdown"""
+        close = getattr(self.provider, 'close', None)
+        if close is not None:
+            try:
+                await close()
+            except Exception as error:
+                logger.error(f'Error closing provider HTTP session: {error}')
 
     def validate_api_key(self) -> bool:
         return self.provider.validate_config()
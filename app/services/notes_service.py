@@ -2,12 +2,20 @@
 Notes/Lists service for saving and managing user notes and lists
 """
 
+import os
 import json
+import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from app.utils.logger import logger
 
+# Dedicated single-thread pool for note saves: dumps submitted to the
+# shared default executor contend with every other blocking task in the
+# process, and a single worker also serializes writes to the same file
+_save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notes-save')
+
 
 class NotesService:
     """Service for managing user notes and lists"""
@@ -15,6 +23,9 @@ class NotesService:
     def __init__(self):
         self.notes_dir = Path(__file__).parent.parent.parent / 'data' / 'notes'
         self.notes_dir.mkdir(parents=True, exist_ok=True)
+        # Parsed notes per user, invalidated via file mtime so external
+        # edits are still picked up without re-parsing on every call
+        self._notes_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         logger.info("✅ Notes service initialized")
     
     def _get_user_notes_file(self, user_id: str) -> Path:
@@ -22,23 +33,37 @@ class NotesService:
         return self.notes_dir / f'{user_id}_notes.json'
     
     def _load_user_notes(self, user_id: str) -> Dict[str, Any]:
-        """Load all notes for a user"""
+        """Load all notes for a user (cached, re-read only when the file changes)"""
         notes_file = self._get_user_notes_file(user_id)
-        if notes_file.exists():
-            try:
-                with open(notes_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading notes: {e}")
-                return {}
-        return {}
-    
+        if not notes_file.exists():
+            self._notes_cache.pop(user_id, None)
+            return {}
+
+        try:
+            mtime = notes_file.stat().st_mtime
+            cached = self._notes_cache.get(user_id)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            with open(notes_file, 'r') as f:
+                notes = json.load(f)
+            self._notes_cache[user_id] = (mtime, notes)
+            return notes
+        except Exception as e:
+            logger.error(f"Error loading notes: {e}")
+            return {}
+
     def _save_user_notes(self, user_id: str, notes: Dict[str, Any]):
-        """Save all notes for a user"""
+        """Save all notes for a user (atomic: tmp file + replace, so a crash
+        mid-write can never leave a torn notes file)"""
         notes_file = self._get_user_notes_file(user_id)
+        tmp = notes_file.with_name(notes_file.name + '.tmp')
         try:
-            with open(notes_file, 'w') as f:
+            with open(tmp, 'w') as f:
                 json.dump(notes, f, indent=2, default=str)
+            os.replace(tmp, notes_file)
+            # Refresh the cache from what we just wrote - no re-read needed
+            self._notes_cache[user_id] = (notes_file.stat().st_mtime, notes)
         except Exception as e:
             logger.error(f"Error saving notes: {e}")
     
@@ -80,8 +105,12 @@ class NotesService:
                 'updated_at': datetime.now().isoformat()
             }
             
-            self._save_user_notes(user_id, notes)
-            
+            # Serialize + write in a worker thread so the dump doesn't block
+            # the event loop mid-request
+            await asyncio.get_running_loop().run_in_executor(
+                _save_pool, self._save_user_notes, user_id, notes
+            )
+
             action = 'updated' if is_update else 'saved'
             logger.info(f"📝 Note '{title}' {action} for user {user_id}")
             
@@ -156,7 +185,9 @@ class NotesService:
             
             if normalized_title in notes:
                 del notes[normalized_title]
-                self._save_user_notes(user_id, notes)
+                await asyncio.get_running_loop().run_in_executor(
+                    _save_pool, self._save_user_notes, user_id, notes
+                )
                 
                 logger.info(f"🗑️ Deleted note '{title}' for user {user_id}")
                 
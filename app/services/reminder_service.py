@@ -8,10 +8,16 @@ import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 from app.utils.logger import logger
 
+# Dedicated single-thread pool for reminder saves: dumps submitted to the
+# shared default executor contend with every other blocking task in the
+# process, and a single worker also serializes writes to the same file
+_save_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reminder-save')
+
 
 class ReminderService:
     """Service for managing reminders with voice notifications"""
@@ -44,28 +50,45 @@ class ReminderService:
                 with open(self.reminders_file, 'r') as f:
                     self.reminders = json.load(f)
                 logger.info(f"Loaded {len(self.reminders)} reminders")
-                
-                # Reschedule active reminders
+
+                # Reschedule active reminders; expirations are coalesced into
+                # one save at the end instead of rewriting the whole file once
+                # per expired reminder
+                dirty = False
                 for reminder_id, reminder in self.reminders.items():
                     if reminder['status'] == 'active':
-                        self._schedule_reminder(reminder_id, reminder)
+                        dirty |= self._schedule_reminder(reminder_id, reminder, save=False)
+                if dirty:
+                    self._save_reminders()
         except Exception as e:
             logger.error(f"Error loading reminders: {e}")
             self.reminders = {}
     
     def _save_reminders(self):
-        """Save reminders to file"""
+        """Save reminders to file (atomic: tmp file + replace, so a crash
+        mid-write can never leave a torn reminders file)"""
+        tmp = self.reminders_file.with_name(self.reminders_file.name + '.tmp')
         try:
-            with open(self.reminders_file, 'w') as f:
+            with open(tmp, 'w') as f:
                 json.dump(self.reminders, f, indent=2, default=str)
+            os.replace(tmp, self.reminders_file)
         except Exception as e:
             logger.error(f"Error saving reminders: {e}")
+
+    async def _save_reminders_async(self):
+        """Save reminders from a request path without blocking the event loop"""
+        await asyncio.get_running_loop().run_in_executor(_save_pool, self._save_reminders)
     
-    def _schedule_reminder(self, reminder_id: str, reminder: Dict[str, Any]):
-        """Schedule a reminder"""
+    def _schedule_reminder(self, reminder_id: str, reminder: Dict[str, Any], save: bool = True) -> bool:
+        """Schedule a reminder
+
+        Returns True when the reminder was mutated (marked expired); with
+        save=False the caller owns persisting the change, so a batch of
+        expirations costs one file write.
+        """
         try:
             trigger_time = datetime.fromisoformat(reminder['trigger_time'])
-            
+
             # Only schedule if in the future
             if trigger_time > datetime.now():
                 self.scheduler.add_job(
@@ -79,9 +102,12 @@ class ReminderService:
             else:
                 # Mark as expired if past
                 reminder['status'] = 'expired'
-                self._save_reminders()
+                if save:
+                    self._save_reminders()
+                return True
         except Exception as e:
             logger.error(f"Error scheduling reminder: {e}")
+        return False
     
     async def _trigger_reminder(self, reminder_id: str):
         """Trigger a reminder - send notification"""
@@ -95,7 +121,7 @@ class ReminderService:
             # Update status
             reminder['status'] = 'completed'
             reminder['completed_at'] = datetime.now().isoformat()
-            self._save_reminders()
+            await self._save_reminders_async()
             
             # Send notification via socket if available
             if self.socket_handler and reminder.get('user_sid'):
@@ -189,7 +215,7 @@ class ReminderService:
             
             # Save reminder
             self.reminders[reminder_id] = reminder
-            self._save_reminders()
+            await self._save_reminders_async()
             
             # Schedule it
             self._schedule_reminder(reminder_id, reminder)
@@ -233,7 +259,7 @@ class ReminderService:
                 
                 # Update status
                 self.reminders[reminder_id]['status'] = 'cancelled'
-                self._save_reminders()
+                await self._save_reminders_async()
                 
                 logger.info(f"❌ Cancelled reminder: {reminder_id}")
                 return True
@@ -0,0 +1,133 @@
+"""
+In-memory response cache for deterministic LLM completions
+
+Identical prompts (same messages and options) issued close together — e.g.
+the emotion analyzer or memory analyzer re-running on unchanged text — can
+skip the network round trip entirely. Only deterministic requests
+(temperature == 0) are cached to preserve response variety elsewhere.
+In-flight duplicate requests are coalesced so concurrent identical calls
+share a single upstream request.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.logger import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bind the key serializer once at import; make_key runs for every cacheable
+# completion, so the faster C serializer matters
+if orjson is not None:
+    def _dumps_key(payload: dict) -> bytes:
+        """Serialize a cache-key payload (orjson)"""
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+else:
+    def _dumps_key(payload: dict) -> bytes:
+        """Serialize a cache-key payload (stdlib fallback)"""
+        return json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+
+CACHE_MAX_SIZE = 1024
+CACHE_TTL_SECONDS = 3600  # Stale deterministic answers are cheap to refetch
+
+
+class ResponseCache:
+    """LRU cache with single-flight coalescing for async LLM calls"""
+
+    def __init__(self, max_size: int = CACHE_MAX_SIZE, ttl: float = CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build a stable cache key from the full request"""
+        payload = _dumps_key(
+            {'p': provider, 'm': model, 'msgs': messages, 'opts': options or {}}
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Return the cached response for key, or await fetch() and cache it.
+        Concurrent callers with the same key share one fetch.
+        """
+        async with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                stored_at, result = cached
+                if time.monotonic() - stored_at < self.ttl:
+                    self._cache.move_to_end(key)
+                    logger.debug(f'LLM response cache hit: {key[:12]}')
+                    return result
+                # Expired - drop and fall through to a fresh fetch
+                del self._cache[key]
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = asyncio.get_event_loop().create_future()
+                self._in_flight[key] = pending
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return await asyncio.shield(pending)
+
+        try:
+            result = await fetch()
+        except Exception as error:
+            async with self._lock:
+                self._in_flight.pop(key, None)
+            if not pending.done():
+                pending.set_exception(error)
+                # Consume the exception if nobody else awaited it
+                pending.exception()
+            raise
+
+        async with self._lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+            self._in_flight.pop(key, None)
+
+        if not pending.done():
+            pending.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self._cache.clear()
+
+
+# Shared cache for deterministic completions
+response_cache = ResponseCache()
+
+
+def is_cacheable(options: Optional[Dict[str, Any]]) -> bool:
+    """Only deterministic requests (temperature == 0) are safe to cache;
+    callers can also opt out explicitly with disable_cache"""
+    return (
+        bool(options)
+        and options.get('temperature') == 0
+        and not options.get('disable_cache')
+    )
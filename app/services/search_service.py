@@ -16,7 +16,23 @@ class SearchService:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-    
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session so repeated searches reuse connections
+        instead of paying TCP+TLS setup per request"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session (call on shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
     async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
         Search the web using DuckDuckGo
@@ -31,15 +47,14 @@ class SearchService:
         try:
             logger.info(f"🔍 Searching web for: {query}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.search_url,
-                    data={'q': query},
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    response.raise_for_status()
-                    html = await response.text()
+            session = self._get_session()
+            async with session.post(
+                self.search_url,
+                data={'q': query},
+                headers=self.headers
+            ) as response:
+                response.raise_for_status()
+                html = await response.text()
             
             # Parse HTML results
             soup = BeautifulSoup(html, 'html.parser')
@@ -91,16 +106,15 @@ class SearchService:
             Extracted text content or None
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    html = await response.text()
+            session = self._get_session()
+            async with session.get(
+                url,
+                headers=self.headers
+            ) as response:
+                if response.status != 200:
+                    return None
+
+                html = await response.text()
             
             # Parse and extract text
             soup = BeautifulSoup(html, 'html.parser')
@@ -141,15 +155,17 @@ class SearchService:
         if not results:
             return f"No results found for '{query}'"
         
-        formatted = f"Search results for '{query}':\n\n"
-        
+        # Collect the pieces and join once - repeated += on a str re-copies
+        # the accumulated text for every result
+        parts = [f"Search results for '{query}':\n\n"]
+
         for i, result in enumerate(results, 1):
-            formatted += f"{i}. {result['title']}\n"
+            parts.append(f"{i}. {result['title']}\n")
             if result['snippet']:
-                formatted += f"   {result['snippet']}\n"
-            formatted += f"   URL: {result['url']}\n\n"
-        
-        return formatted
+                parts.append(f"   {result['snippet']}\n")
+            parts.append(f"   URL: {result['url']}\n\n")
+
+        return ''.join(parts)
     
     async def search_and_summarize(self, query: str, max_results: int = 3) -> Dict[str, Any]:
         """
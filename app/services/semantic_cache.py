@@ -0,0 +1,167 @@
+"""
+Semantic cache for deterministic LLM completions
+
+Second layer behind the exact-match response cache: when an exact lookup
+misses, the last user message is embedded and compared (cosine similarity)
+against embeddings of previously answered prompts. Near-duplicate phrasings
+("what's the weather in London" / "weather in London please") then reuse
+the stored response instead of paying the provider round trip.
+
+Fuzzy matching applies only to that last user message; everything else in
+the request (system prompt, history) must match exactly via a context hash
+stored with each entry, so a hit can never leak an answer produced under a
+different persona, user context, or instruction set.
+
+Requires numpy and a provider that supports embeddings; degrades to a no-op
+otherwise.
+"""
+
+import hashlib
+from typing import Any, List, Optional
+
+from app.utils.logger import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SIMILARITY_THRESHOLD = 0.95
+MAX_ENTRIES = 1000
+
+
+class SemanticCache:
+    """Cosine-similarity cache of (embedding, response) pairs"""
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = MAX_ENTRIES
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # Unit-normalized vectors in one preallocated contiguous matrix
+        # (float16: halves the footprint, similarity near the 0.95 threshold
+        # is unaffected). Vectors arrive already normalized from llm_service,
+        # so a lookup is a single inner-product matmul - no stacking or norm
+        # division per query. The matrix is a ring buffer: once full, new
+        # entries overwrite the oldest.
+        self._matrix: Any = None
+        # Per-row context hash (uint64): rows only match queries issued
+        # under the same surrounding messages
+        self._contexts: Any = None
+        self._responses: List[str] = []
+        self._count = 0
+        self._next = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Semantic lookups need numpy for the vector math"""
+        return np is not None
+
+    @staticmethod
+    def query_text(messages: List[dict]) -> Optional[str]:
+        """Extract the last user message as the lookup query"""
+        for msg in reversed(messages):
+            if msg.get('role') == 'user':
+                content = msg.get('content')
+                return content if content else None
+        return None
+
+    @staticmethod
+    def context_key(messages: List[dict]) -> int:
+        """Hash of every message except the last user one
+
+        The embedding fuzzes only the query text; the system prompt and
+        history it was answered under must match exactly, or a similar
+        question from another session would be served a response generated
+        with someone else's context.
+        """
+        last_user = None
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index].get('role') == 'user':
+                last_user = index
+                break
+
+        digest = hashlib.blake2b(digest_size=8)
+        for index, msg in enumerate(messages):
+            if index == last_user:
+                continue
+            digest.update(str(msg.get('role')).encode('utf-8'))
+            digest.update(b'\x00')
+            digest.update(str(msg.get('content')).encode('utf-8'))
+            digest.update(b'\x01')
+        return int.from_bytes(digest.digest(), 'big')
+
+    def lookup(self, embedding: List[float], context: int) -> Optional[str]:
+        """Return the cached response most similar to embedding, if close
+        enough and stored under the same context hash"""
+        if np is None or self._count == 0:
+            return None
+
+        # Embeddings arrive from llm_service already unit-normalized (an
+        # all-zero vector means the provider returned nothing useful);
+        # promote to float32 for the matmul, no per-lookup norm division
+        query = np.asarray(embedding, dtype=np.float32)
+        if not query.any():
+            return None
+
+        # Rows answered under a different context can never be served, no
+        # matter how similar the query text is
+        mask = self._contexts[:self._count] == np.uint64(context)
+        if not mask.any():
+            return None
+
+        # Stored vectors are pre-normalized, so the inner product is already
+        # the cosine similarity; float16 rows promote to float32 in the
+        # matmul, keeping full score precision
+        sims = self._matrix[:self._count] @ query
+        sims = np.where(mask, sims, -1.0)
+        best = int(np.argmax(sims))
+        if sims[best] >= self.threshold:
+            logger.debug(f'Semantic cache hit (similarity={sims[best]:.3f})')
+            return self._responses[best]
+        return None
+
+    def store(self, embedding: List[float], response: str, context: int) -> None:
+        """Remember a (prompt embedding, response) pair under a context hash"""
+        if np is None:
+            return
+
+        # Already unit-normalized by llm_service; copying into the matrix
+        # row below leaves the caller's (possibly cached) vector untouched
+        vector = np.asarray(embedding, dtype=np.float32)
+        if not vector.any():
+            return
+
+        if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+            # First insert (or the embedding model changed dimension):
+            # allocate the full ring buffer up front
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float16)
+            self._contexts = np.zeros(self.max_entries, dtype=np.uint64)
+            self._responses = []
+            self._count = 0
+            self._next = 0
+
+        if self._count < self.max_entries:
+            index = self._count
+            self._count += 1
+            self._responses.append(response)
+        else:
+            index = self._next
+            self._next = (self._next + 1) % self.max_entries
+            self._responses[index] = response
+        self._matrix[index] = vector
+        self._contexts[index] = np.uint64(context)
+
+    def clear(self) -> None:
+        """Drop all cached pairs"""
+        self._matrix = None
+        self._contexts = None
+        self._responses.clear()
+        self._count = 0
+        self._next = 0
+
+
+# Shared semantic cache for deterministic completions
+semantic_cache = SemanticCache()
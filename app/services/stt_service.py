@@ -2,7 +2,7 @@ import os
 import logging
 from typing import Optional, Dict, Any
 
-from .audio_providers import OpenAIAudioProvider, LocalAudioProvider
+from .audio_providers import OpenAIAudioProvider, LocalAudioProvider, get_audio_provider
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +16,16 @@ class STTService:
         audio_provider = os.getenv('AUDIO_PROVIDER', 'local').lower()
         
         if audio_provider == 'openai' and os.getenv('OPENAI_API_KEY'):
-            return OpenAIAudioProvider()
-        
+            return get_audio_provider(OpenAIAudioProvider)
+
         # Default to local
-        return LocalAudioProvider()
+        return get_audio_provider(LocalAudioProvider)
+
+    async def close(self) -> None:
+        """Release the provider's pooled HTTP connections, if it holds any"""
+        provider_close = getattr(self.provider, 'close', None)
+        if provider_close is not None:
+            await provider_close()
 
     async def transcribe_audio(self, audio_buffer: bytes, options: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         if options is None:
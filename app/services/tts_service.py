@@ -1,9 +1,10 @@
 import os
 import re
+import asyncio
 import logging
 from typing import Optional, Dict, Any, List, AsyncGenerator
 
-from .audio_providers import OpenAIAudioProvider, LocalAudioProvider, KokoroAudioProvider
+from .audio_providers import OpenAIAudioProvider, LocalAudioProvider, KokoroAudioProvider, get_audio_provider
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +40,14 @@ class TTSService:
         
         if audio_provider == 'openai' and os.getenv('OPENAI_API_KEY'):
             logger.info('✅ Using OpenAI TTS provider')
-            return OpenAIAudioProvider()
+            return get_audio_provider(OpenAIAudioProvider)
         elif audio_provider == 'kokoro':
             logger.info('✅ Using Kokoro-82M TTS provider')
-            return KokoroAudioProvider()
-        
+            return get_audio_provider(KokoroAudioProvider)
+
         # Default to local (eSpeak/Piper)
         logger.info(f'⚠️  Using Local TTS provider (eSpeak/Piper) - audio_provider was "{audio_provider}"')
-        return LocalAudioProvider()
+        return get_audio_provider(LocalAudioProvider)
 
     async def generate_speech(self, text: str, options: Optional[Dict[str, Any]] = None) -> bytes:
         if options is None:
@@ -142,14 +143,18 @@ class TTSService:
             options = {}
         
         try:
-            audio_chunks = []
-            
-            for text in text_chunks:
-                if text.strip():
-                    audio = await self.generate_speech(text, options)
-                    audio_chunks.append(audio)
-            
-            return audio_chunks
+            # Each chunk is an independent provider round trip, so fire them
+            # all at once over the pooled connection instead of waiting for
+            # one to finish before starting the next; gather preserves order
+            tasks = [
+                self.generate_speech(text, options)
+                for text in text_chunks
+                if text.strip()
+            ]
+            if not tasks:
+                return []
+
+            return list(await asyncio.gather(*tasks))
         except Exception as error:
             logger.error(f'Error generating speech chunks: {error}')
             raise
@@ -3,21 +3,65 @@ Weather service using OpenWeather API
 """
 
 import os
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from collections import Counter
+from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter, OrderedDict
 import aiohttp
 from app.utils.logger import logger
 
+# Users ask about the same place repeatedly ("weather?", "and tomorrow?");
+# conditions don't move within a few minutes, so repeats within the TTL skip
+# the API round trip. Coordinates never change and are cached indefinitely.
+WEATHER_CACHE_TTL_SECONDS = 600
+CACHE_MAX_SIZE = 256
+
 
 class WeatherService:
     """Weather service for fetching weather data"""
-    
+
     def __init__(self):
         self.api_key = os.getenv('OPENWEATHER_API_KEY')
         self.base_url = 'https://api.openweathermap.org/data/2.5'
         self.geo_url = 'https://api.openweathermap.org/geo/1.0'
-    
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._coord_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._weather_cache: "OrderedDict[Any, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _cached_weather(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Return a cached API response for key if it is still fresh"""
+        entry = self._weather_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, data = entry
+        if time.monotonic() - stored_at >= WEATHER_CACHE_TTL_SECONDS:
+            del self._weather_cache[key]
+            return None
+        self._weather_cache.move_to_end(key)
+        return data
+
+    def _cache_weather(self, key: Any, data: Dict[str, Any]) -> None:
+        """Remember an API response, evicting the least recently used"""
+        self._weather_cache[key] = (time.monotonic(), data)
+        self._weather_cache.move_to_end(key)
+        while len(self._weather_cache) > CACHE_MAX_SIZE:
+            self._weather_cache.popitem(last=False)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session so repeated calls reuse connections
+        instead of paying TCP+TLS setup per request"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=15, connect=5)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session (call on shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
     async def get_current_weather(self, location: str) -> Dict[str, Any]:
         """
         Get current weather for a location
@@ -29,20 +73,26 @@ class WeatherService:
             Weather data dictionary
         """
         try:
+            cache_key = ('weather', location.strip().lower())
+            cached = self._cached_weather(cache_key)
+            if cached is not None:
+                logger.debug(f'Weather cache hit for {location}')
+                return cached
+
             coords = await self.get_coordinates(location)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/weather",
-                    params={
-                        'lat': coords['lat'],
-                        'lon': coords['lon'],
-                        'appid': self.api_key,
-                        'units': 'metric'
-                    }
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+
+            session = self._get_session()
+            async with session.get(
+                f"{self.base_url}/weather",
+                params={
+                    'lat': coords['lat'],
+                    'lon': coords['lon'],
+                    'appid': self.api_key,
+                    'units': 'metric'
+                }
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
             
             weather = {
                 'location': data['name'],
@@ -58,6 +108,7 @@ class WeatherService:
             }
             
             logger.info(f"Weather fetched for {location}: {weather['temperature']}°C, {weather['condition']}")
+            self._cache_weather(cache_key, weather)
             return weather
         
         except Exception as e:
@@ -76,21 +127,27 @@ class WeatherService:
             Forecast data dictionary
         """
         try:
+            cache_key = ('forecast', location.strip().lower(), days)
+            cached = self._cached_weather(cache_key)
+            if cached is not None:
+                logger.debug(f'Forecast cache hit for {location}')
+                return cached
+
             coords = await self.get_coordinates(location)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/forecast",
-                    params={
-                        'lat': coords['lat'],
-                        'lon': coords['lon'],
-                        'appid': self.api_key,
-                        'units': 'metric',
-                        'cnt': days * 8
-                    }
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+
+            session = self._get_session()
+            async with session.get(
+                f"{self.base_url}/forecast",
+                params={
+                    'lat': coords['lat'],
+                    'lon': coords['lon'],
+                    'appid': self.api_key,
+                    'units': 'metric',
+                    'cnt': days * 8
+                }
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
             
             forecast = [
                 {
@@ -107,11 +164,13 @@ class WeatherService:
             ]
             
             logger.info(f"Forecast fetched for {location}: {len(forecast)} entries")
-            return {
+            result = {
                 'location': data['city']['name'],
                 'country': data['city']['country'],
                 'forecast': forecast
             }
+            self._cache_weather(cache_key, result)
+            return result
         
         except Exception as e:
             logger.error(f"Error fetching forecast: {e}")
@@ -128,27 +187,38 @@ class WeatherService:
             Coordinates dictionary with lat, lon, name, country
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.geo_url}/direct",
-                    params={
-                        'q': location,
-                        'limit': 1,
-                        'appid': self.api_key
-                    }
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            cache_key = location.strip().lower()
+            cached = self._coord_cache.get(cache_key)
+            if cached is not None:
+                self._coord_cache.move_to_end(cache_key)
+                return cached
+
+            session = self._get_session()
+            async with session.get(
+                f"{self.geo_url}/direct",
+                params={
+                    'q': location,
+                    'limit': 1,
+                    'appid': self.api_key
+                }
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
             
             if not data:
                 raise Exception('Location not found')
-            
-            return {
+
+            coords = {
                 'lat': data[0]['lat'],
                 'lon': data[0]['lon'],
                 'name': data[0]['name'],
                 'country': data[0]['country']
             }
+            self._coord_cache[cache_key] = coords
+            self._coord_cache.move_to_end(cache_key)
+            while len(self._coord_cache) > CACHE_MAX_SIZE:
+                self._coord_cache.popitem(last=False)
+            return coords
         
         except Exception as e:
             logger.error(f"Error getting coordinates: {e}")
@@ -209,12 +279,12 @@ class WeatherService:
                 'condition': dominant_condition
             })
         
-        # Format response
-        response = f"Weather forecast for {location}, {country}:\n\n"
-        for day in daily_forecasts:
-            response += f"{day['date']}: {day['condition']}, High: {day['maxTemp']}°C, Low: {day['minTemp']}°C\n"
-        
-        return response
+        # Format response (single join instead of += re-copying per line)
+        header = f"Weather forecast for {location}, {country}:\n\n"
+        return header + ''.join(
+            f"{day['date']}: {day['condition']}, High: {day['maxTemp']}°C, Low: {day['minTemp']}°C\n"
+            for day in daily_forecasts
+        )
     
     def _get_most_frequent(self, arr: List[Any]) -> Any:
         """Get most frequent item in array"""
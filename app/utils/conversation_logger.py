@@ -4,11 +4,28 @@ Conversation logging utility for structured logging of user interactions
 
 import os
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from app.utils.logger import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bind the line serializer once at import instead of re-checking orjson
+# availability for every logged event
+if orjson is not None:
+    def _dumps_line(entry: dict) -> str:
+        """Serialize a log entry to one JSON line (orjson)"""
+        return orjson.dumps(entry, default=str).decode('utf-8')
+else:
+    def _dumps_line(entry: dict) -> str:
+        """Serialize a log entry to one JSON line (stdlib fallback)"""
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
 
 class ConversationLogger:
     """Logger for conversation events"""
@@ -16,32 +33,59 @@ class ConversationLogger:
     def __init__(self):
         self.enabled = os.getenv('LOG_CONVERSATIONS', 'true').lower() == 'true'
         self.log_dir = Path('logs/conversations')
-        
+        # Formatting datetimes is the expensive part of a log write, so the
+        # file path is cached per day and the timestamp per second instead of
+        # being rebuilt for every event
+        self._log_file: Optional[Path] = None
+        self._log_file_day = ''
+        self._timestamp_second = -1
+        self._timestamp_iso = ''
+        # The day's file stays open in append mode between events; opening
+        # and closing per line was the dominant syscall cost of a log write
+        self._log_handle = None
+
         if self.enabled:
             self.log_dir.mkdir(parents=True, exist_ok=True)
-    
-    def _get_log_file(self) -> Path:
-        """Get today's log file path"""
+
+    def _get_log_handle(self):
+        """Get an open handle to today's log file (reopened only when the
+        day changes)"""
         today = datetime.now().strftime('%Y-%m-%d')
-        return self.log_dir / f'conversation-{today}.log'
-    
+        if today != self._log_file_day or self._log_handle is None:
+            if self._log_handle is not None:
+                self._log_handle.close()
+            self._log_file_day = today
+            self._log_file = self.log_dir / f'conversation-{today}.log'
+            self._log_handle = open(self._log_file, 'a', encoding='utf-8')
+        return self._log_handle
+
+    def _timestamp(self) -> str:
+        """UTC ISO timestamp, reformatted only when the second advances"""
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp_iso = datetime.utcfromtimestamp(second).isoformat() + 'Z'
+        return self._timestamp_iso
+
     def _write_log(self, event_type: str, data: dict):
         """Write log entry"""
         if not self.enabled:
             return
-        
+
         try:
             log_entry = {
-                'timestamp': datetime.utcnow().isoformat() + 'Z',
+                'timestamp': self._timestamp(),
                 'event': event_type,
                 **data
             }
             
-            log_file = self._get_log_file()
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
-        
+            handle = self._get_log_handle()
+            handle.write(_dumps_line(log_entry) + '\n')
+            handle.flush()
+
         except Exception as e:
+            # Drop the handle so the next write reopens it cleanly
+            self._log_handle = None
             logger.error(f"Error writing conversation log: {e}")
     
     async def log_session_start(self, session_id: str, user_id: str, persona: str):
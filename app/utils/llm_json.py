@@ -0,0 +1,106 @@
+"""
+Fast parsing of JSON returned by LLM completions
+
+Analyzer prompts ask for JSON, but models still sometimes wrap it in
+markdown fences or a line of prose. This parses those responses in one
+place - orjson when available (2-5x faster than stdlib), a precompiled
+fence strip, and an outermost-object fallback - instead of per-caller
+string surgery.
+"""
+
+import json
+import re
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bind the parser once at import instead of re-checking orjson availability
+# on every response
+_loads = orjson.loads if orjson is not None else json.loads
+
+# ```json ... ``` fences around the payload, stripped in one pass
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
+
+def _extract_first_json(text: str) -> Optional[str]:
+    """
+    Return the first complete JSON object embedded in text
+
+    One forward pass tracking brace depth (respecting string literals and
+    escapes), instead of find('{') + rfind('}') scans - which walk the text
+    twice and can pair the object start with a stray brace in trailing
+    prose.
+
+    Args:
+        text: Text possibly containing a JSON object
+
+    Returns:
+        The balanced {...} span, or None if no complete object exists
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            if depth > 0:
+                in_string = True
+        elif char == '{':
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == '}' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+
+    return None
+
+
+def parse_llm_json(raw: str) -> Optional[Any]:
+    """
+    Parse a JSON object out of an LLM response
+
+    Tries the raw text first, then with markdown fences stripped, then the
+    outermost {...} span.
+
+    Args:
+        raw: LLM response text
+
+    Returns:
+        Parsed JSON value, or None if no JSON could be recovered
+    """
+    if not raw:
+        return None
+
+    text = raw.strip()
+    try:
+        return _loads(text)
+    except ValueError:
+        pass
+
+    stripped = _FENCE_RE.sub('', text).strip()
+    if stripped != text:
+        try:
+            return _loads(stripped)
+        except ValueError:
+            pass
+
+    snippet = _extract_first_json(stripped)
+    if snippet is not None:
+        try:
+            return _loads(snippet)
+        except ValueError:
+            return None
+    return None
@@ -0,0 +1,155 @@
+"""
+Token counting utilities for LLM prompt budgeting
+
+Uses tiktoken BPE counts when available (accurate), falling back to the
+common chars/4 heuristic. Counts are cached per content hash so repeated
+messages in a conversation are only tokenized once.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+# Cache of content-hash -> token count (shared across sessions)
+_token_cache: Dict[str, int] = {}
+_TOKEN_CACHE_MAX_SIZE = 4096
+
+# Lazily-resolved tiktoken encoder per model name (None = unavailable)
+_encoders: Dict[str, Optional[object]] = {}
+
+CHARS_PER_TOKEN = 4
+
+
+def _get_encoder(model: str):
+    """Get (and cache) a tiktoken encoder for a model, or None if unavailable"""
+    if model in _encoders:
+        return _encoders[model]
+
+    encoder = None
+    try:
+        import tiktoken
+        try:
+            encoder = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoder = tiktoken.get_encoding('cl100k_base')
+    except ImportError:
+        encoder = None
+
+    _encoders[model] = encoder
+    return encoder
+
+
+def prewarm(model: str = 'gpt-3.5-turbo') -> None:
+    """Load the tiktoken encoder ahead of the first request
+
+    encoding_for_model builds the BPE tables on first use (can take
+    hundreds of milliseconds); calling this from app startup moves that
+    cost out of the first user turn.
+    """
+    _get_encoder(model)
+
+
+def _content_key(content: str) -> str:
+    """Stable cache key for message content"""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def estimate_tokens(content: str, model: str = 'gpt-3.5-turbo') -> int:
+    """
+    Estimate token count for a piece of text
+
+    Args:
+        content: Text to count
+        model: Model name used to pick the tiktoken encoding
+
+    Returns:
+        Estimated token count
+    """
+    if not content:
+        return 0
+
+    key = _content_key(content)
+    cached = _token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    encoder = _get_encoder(model)
+    if encoder is not None:
+        count = len(encoder.encode(content))
+    else:
+        count = len(content) // CHARS_PER_TOKEN
+
+    if len(_token_cache) >= _TOKEN_CACHE_MAX_SIZE:
+        _token_cache.clear()
+    _token_cache[key] = count
+
+    return count
+
+
+def estimate_messages_tokens(messages: List[dict], model: str = 'gpt-3.5-turbo') -> int:
+    """
+    Estimate total token count for a list of message dicts
+
+    Args:
+        messages: List of message dicts with a 'content' field
+        model: Model name used to pick the tiktoken encoding
+
+    Returns:
+        Estimated total token count (with small per-message overhead)
+    """
+    total = 0
+    for msg in messages:
+        # ~4 tokens of per-message framing overhead (role, separators)
+        total += estimate_tokens(msg.get('content') or '', model) + 4
+    return total
+
+
+def exceeds_token_limit(messages: List[dict], limit: int, model: str = 'gpt-3.5-turbo') -> bool:
+    """
+    Check whether messages exceed a token budget, stopping at the first
+    message that pushes the running total over the limit
+
+    Args:
+        messages: List of message dicts with a 'content' field
+        limit: Token budget
+        model: Model name used to pick the tiktoken encoding
+
+    Returns:
+        True if the total estimate exceeds the limit
+    """
+    total = 0
+    for msg in messages:
+        total += estimate_tokens(msg.get('content') or '', model) + 4
+        if total > limit:
+            return True
+    return False
+
+
+def trim_messages_to_budget(messages: List[dict], limit: int, model: str = 'gpt-3.5-turbo') -> List[dict]:
+    """
+    Return the longest suffix of messages that fits the token budget
+    (always keeps at least the most recent message)
+
+    Args:
+        messages: List of message dicts with a 'content' field
+        limit: Token budget
+        model: Model name used to pick the tiktoken encoding
+
+    Returns:
+        Trimmed message list, most recent messages preserved
+    """
+    total = 0
+    kept = []
+    for msg in reversed(messages):
+        # Same +4 per-message framing overhead as the estimators above, so
+        # a trimmed suffix also passes exceeds_token_limit
+        total += estimate_tokens(msg.get('content') or '', model) + 4
+        if kept and total > limit:
+            break
+        kept.append(msg)
+    kept.reverse()
+    return kept
+
+
+def invalidate_cached_tokens(content: str) -> None:
+    """Drop the cached count for content that has been mutated"""
+    _token_cache.pop(_content_key(content), None)
@@ -4,14 +4,23 @@ WebSocket handler for managing real-time communication with clients
 
 import os
 import re
+import base64
+import asyncio
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import socketio
 from datetime import datetime
 
 
+# Exact scalar types that need no conversion - the bulk of a memory dict;
+# checking them first skips the isinstance chain for the common case
+_EMIT_SAFE_TYPES = {str, int, float, bool, type(None)}
+
+
 def _serialize_memory_for_emit(obj: Any) -> Any:
     """Make memory dict JSON-serializable for WebSocket emit (datetime -> iso string)."""
+    if type(obj) in _EMIT_SAFE_TYPES:
+        return obj
     if isinstance(obj, datetime):
         return obj.isoformat() + 'Z' if not obj.isoformat().endswith('Z') else obj.isoformat()
     if isinstance(obj, dict):
@@ -34,10 +43,33 @@ from app.engines.persona_engine import PersonaEngine
 from app.engines.memory_engine import MemoryEngine
 from app.engines.tool_engine import ToolEngine
 
+# Constant request settings, built once instead of per turn. Every key the
+# LLM service touches (max_tokens included) is pinned here, so the dict is
+# never mutated downstream and is safe to share across calls.
+_RESPONSE_OPTIONS = {
+    'temperature': 0.8,
+    'max_tokens': 500
+}
+
 
 class SessionData:
     """Data structure for active session"""
-    
+
+    # One instance per connected client, held for the whole session: slots
+    # skip the per-instance __dict__ and make the frequent attribute reads
+    # on the message path a fixed-offset lookup
+    __slots__ = (
+        'session_id',
+        'user_id',
+        'persona',
+        'input_mode',
+        'output_mode',
+        'audio_disabled',
+        'is_processing',
+        'conversation_created',
+        'client_tts_enabled'
+    )
+
     def __init__(
         self,
         session_id: str,
@@ -82,7 +114,12 @@ class SocketHandler:
         
         self.active_sessions: Dict[str, SessionData] = {}
         self.audio_buffers: Dict[str, List[bytes]] = {}
-        
+
+        # Strong references to fire-and-forget background tasks (memory
+        # analysis after a response); without them the event loop may
+        # garbage-collect a still-running task
+        self._background_tasks: set = set()
+
         self.audio_enabled = self._check_audio_enabled()
         
         self._register_handlers()
@@ -206,9 +243,13 @@ class SocketHandler:
             
             self.active_sessions[sid] = session
             
-            await self.memory_engine.initialize_session(session_id, user_id)
-            
-            await conversation_logger.log_session_start(session_id, user_id, persona)
+            # Session init (a conversation read) and the session-start log
+            # write are independent - run them concurrently so connection
+            # setup pays the slower of the two instead of their sum
+            await asyncio.gather(
+                self.memory_engine.initialize_session(session_id, user_id),
+                conversation_logger.log_session_start(session_id, user_id, persona)
+            )
             
             await self.sio.emit(
                 WebSocketEvents.CONNECTION_ESTABLISHED,
@@ -280,18 +321,20 @@ class SocketHandler:
             await self.sio.emit(WebSocketEvents.PROCESSING_START, to=sid)
             
             user_message = sanitize_input(data.get('message', ''))
-            
+
+            # Mirror the audio path's empty-transcription skip: an empty
+            # message would otherwise run the full pipeline - conversation
+            # creation, emotion detection, tool scan and the LLM round trip -
+            # for nothing (sanitize_input already stripped whitespace)
+            if not user_message:
+                session.is_processing = False
+                await self.sio.emit(WebSocketEvents.PROCESSING_END, to=sid)
+                return
+
             logger.info('═══════════════════════════════════════════════════════')
             logger.info(f'💬 USER TEXT: "{user_message}"')
             logger.info('═══════════════════════════════════════════════════════')
             
-            await conversation_logger.log_user_input(
-                session.session_id,
-                session.user_id,
-                user_message,
-                'text'
-            )
-            
             if not session.conversation_created:
                 await conversation_service.create_conversation(
                     session.session_id,
@@ -299,29 +342,31 @@ class SocketHandler:
                     session.persona
                 )
                 session.conversation_created = True
-            
-            await conversation_service.add_message(
-                session.session_id,
-                'user',
-                user_message,
-                {'isTranscribed': False}
+
+            # The log write, conversation save, and emotion analysis don't
+            # depend on each other - run them concurrently so the (possibly
+            # LLM-backed) emotion pass isn't stacked on top of the saves
+            emotion_data, _, _ = await asyncio.gather(
+                self.emotion_engine.detect_emotion(user_message),
+                conversation_logger.log_user_input(
+                    session.session_id,
+                    session.user_id,
+                    user_message,
+                    'text'
+                ),
+                conversation_service.add_message(
+                    session.session_id,
+                    'user',
+                    user_message,
+                    {'isTranscribed': False}
+                )
             )
-            
-            emotion_data = await self.emotion_engine.detect_emotion(user_message)
             await self.sio.emit(
                 WebSocketEvents.EMOTION_DETECTED,
                 emotion_data,
                 to=sid
             )
             
-            await self.memory_engine.add_message(
-                session.session_id,
-                'user',
-                user_message,
-                emotion_data.get('emotion', 'neutral'),
-                emotion_data.get('sentiment', 'neutral')
-            )
-            
             # If user said "Save to memory: ..." or "Remember that ...", persist to Memory Lane
             save_memory = self._parse_save_to_memory(user_message)
             if save_memory:
@@ -340,12 +385,23 @@ class SocketHandler:
                     logger.info(f'Saved to Memory Lane: "{title}"')
                 except Exception as e:
                     logger.warning(f'Failed to save to Memory Lane: {e}')
-            
-            tool_result = await self.tool_engine.detect_and_execute_tools(
-                user_message,
-                self.llm_service,
-                session.user_id,
-                sid
+
+            # Tool detection doesn't read short-term memory, so it runs
+            # alongside the memory update instead of after it
+            tool_result, _ = await asyncio.gather(
+                self.tool_engine.detect_and_execute_tools(
+                    user_message,
+                    self.llm_service,
+                    session.user_id,
+                    sid
+                ),
+                self.memory_engine.add_message(
+                    session.session_id,
+                    'user',
+                    user_message,
+                    emotion_data.get('emotion', 'neutral'),
+                    emotion_data.get('sentiment', 'neutral')
+                )
             )
             
             if tool_result.get('toolUsed'):
@@ -369,12 +425,14 @@ class SocketHandler:
             contextual_message = user_message
             if tool_result.get('error') and tool_result.get('message'):
                 contextual_message = f"{user_message}\n\n[Note: User asked about weather but the weather API is not configured. Please respond helpfully without weather data.]"
-            
+
+            on_chunk, drain_chunks = self._make_chunk_emitter(sid)
             response = await self.generate_response(
                 session,
                 contextual_message,
                 emotion_data,
-                tool_result
+                tool_result,
+                on_chunk=on_chunk
             )
             
             logger.info('───────────────────────────────────────────────────────')
@@ -383,25 +441,14 @@ class SocketHandler:
             logger.info('───────────────────────────────────────────────────────')
             
             output_mode = 'voice' if session.output_mode == CommunicationMode.VOICE.value else 'text'
-            await conversation_logger.log_bot_response(
-                session.session_id,
-                session.user_id,
-                response,
-                emotion_data.get('emotion', 'neutral'),
-                session.persona,
-                output_mode
-            )
-            
-            await conversation_service.add_message(
-                session.session_id,
-                'assistant',
-                response,
-                {
-                    'emotion': emotion_data.get('emotion'),
-                    'persona': session.persona
-                }
-            )
-            
+
+            # Every streamed chunk must land before the final response so
+            # the client never receives a stale chunk after the full reply
+            await drain_chunks()
+
+            # Emit the final text first so the client isn't waiting on
+            # bookkeeping; the log write, conversation save, and short-term
+            # memory update are independent of each other and run concurrently
             await self.sio.emit(
                 WebSocketEvents.BOT_TEXT_RESPONSE,
                 {
@@ -411,24 +458,56 @@ class SocketHandler:
                 },
                 to=sid
             )
-            
-            await self.memory_engine.add_message(
-                session.session_id,
-                'assistant',
-                response,
-                emotion_data.get('emotion', 'neutral'),
-                emotion_data.get('sentiment', 'neutral')
-            )
-            
+
+            post_tasks = [
+                conversation_logger.log_bot_response(
+                    session.session_id,
+                    session.user_id,
+                    response,
+                    emotion_data.get('emotion', 'neutral'),
+                    session.persona,
+                    output_mode
+                ),
+                conversation_service.add_message(
+                    session.session_id,
+                    'assistant',
+                    response,
+                    {
+                        'emotion': emotion_data.get('emotion'),
+                        'persona': session.persona
+                    }
+                ),
+                self.memory_engine.add_message(
+                    session.session_id,
+                    'assistant',
+                    response,
+                    emotion_data.get('emotion', 'neutral'),
+                    emotion_data.get('sentiment', 'neutral')
+                )
+            ]
+            # TTS synthesis is another independent round trip (subprocess or
+            # network) - fan it out with the writes so the voice reply isn't
+            # stacked behind them
             if session.output_mode == CommunicationMode.VOICE.value and not session.audio_disabled:
-                await self.generate_and_stream_audio(sid, response, emotion_data.get('emotion', 'neutral'))
-            
+                post_tasks.append(
+                    self.generate_and_stream_audio(sid, response, emotion_data.get('emotion', 'neutral'))
+                )
+            await asyncio.gather(*post_tasks)
+
             if self.emotion_engine.should_save_as_memory(emotion_data):
-                await self.memory_engine.analyze_and_save_important_moments(
-                    session.session_id,
-                    session.user_id
+                # Memory analysis is a full LLM round trip whose result the
+                # user never waits on - run it in the background so the
+                # session accepts the next message immediately (it handles
+                # its own errors and skips re-runs on unchanged conversations)
+                task = asyncio.create_task(
+                    self.memory_engine.analyze_and_save_important_moments(
+                        session.session_id,
+                        session.user_id
+                    )
                 )
-            
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+
             session.is_processing = False
             await self.sio.emit(WebSocketEvents.PROCESSING_END, to=sid)
             
@@ -472,7 +551,6 @@ class SocketHandler:
             logger.debug(f'Received audio data type: {type(audio_data)}, length: {len(audio_data) if hasattr(audio_data, "__len__") else "N/A"}')
             
             if isinstance(audio_data, str):
-                import base64
                 try:
                     audio_buffer = base64.b64decode(audio_data)
                     logger.debug(f'Decoded base64 to {len(audio_buffer)} bytes')
@@ -578,13 +656,6 @@ class SocketHandler:
             logger.info(f'🎤 USER SPEECH (Audio → Text): "{transcribed_text}"')
             logger.info('═══════════════════════════════════════════════════════')
             
-            await conversation_logger.log_user_input(
-                session.session_id,
-                session.user_id,
-                transcribed_text,
-                'voice'
-            )
-            
             if not session.conversation_created:
                 await conversation_service.create_conversation(
                     session.session_id,
@@ -592,49 +663,61 @@ class SocketHandler:
                     session.persona
                 )
                 session.conversation_created = True
-            
-            await conversation_service.add_message(
-                session.session_id,
-                'user',
-                transcribed_text,
-                {'isTranscribed': True}
-            )
-            
+
+            # Show the transcription right away instead of after the saves
             await self.sio.emit(
                 WebSocketEvents.TRANSCRIPTION_RESULT,
                 {'text': transcribed_text},
                 to=sid
             )
-            
+
             # Process the transcribed text (generate response)
             # Don't call handle_user_text as it would save the message again
-            # Detect emotion from both text and audio (voice)
+            # Detect emotion from both text and audio (voice); the log write
+            # and conversation save don't depend on it and run concurrently
             audio_path_obj = Path(audio_file_path) if audio_file_path else None
-            emotion_data = await self.emotion_engine.detect_emotion(transcribed_text, audio_path_obj)
-            
+            emotion_data, _, _ = await asyncio.gather(
+                self.emotion_engine.detect_emotion(transcribed_text, audio_path_obj),
+                conversation_logger.log_user_input(
+                    session.session_id,
+                    session.user_id,
+                    transcribed_text,
+                    'voice'
+                ),
+                conversation_service.add_message(
+                    session.session_id,
+                    'user',
+                    transcribed_text,
+                    {'isTranscribed': True}
+                )
+            )
+
             # Log if audio emotion was used
             if emotion_data.get('emotion_source') == 'audio':
                 logger.info(f"🎤 Emotion from voice: {emotion_data['emotion']} (confidence: {emotion_data['confidence']:.2f})")
-            
+
             await self.sio.emit(
                 WebSocketEvents.EMOTION_DETECTED,
                 emotion_data,
                 to=sid
             )
-            
-            await self.memory_engine.add_message(
-                session.session_id,
-                'user',
-                transcribed_text,
-                emotion_data.get('emotion', 'neutral'),
-                emotion_data.get('sentiment', 'neutral')
-            )
-            
-            tool_result = await self.tool_engine.detect_and_execute_tools(
-                transcribed_text,
-                self.llm_service,
-                session.user_id,
-                sid
+
+            # Tool detection doesn't read short-term memory, so it runs
+            # alongside the memory update instead of after it
+            tool_result, _ = await asyncio.gather(
+                self.tool_engine.detect_and_execute_tools(
+                    transcribed_text,
+                    self.llm_service,
+                    session.user_id,
+                    sid
+                ),
+                self.memory_engine.add_message(
+                    session.session_id,
+                    'user',
+                    transcribed_text,
+                    emotion_data.get('emotion', 'neutral'),
+                    emotion_data.get('sentiment', 'neutral')
+                )
             )
             
             if tool_result.get('toolUsed'):
@@ -650,12 +733,14 @@ class SocketHandler:
             contextual_message = transcribed_text
             if tool_result.get('error') and tool_result.get('message'):
                 contextual_message = f"{transcribed_text}\n\n[Note: User asked about weather but the weather API is not configured. Please respond helpfully without weather data.]"
-            
+
+            on_chunk, drain_chunks = self._make_chunk_emitter(sid)
             response = await self.generate_response(
                 session,
                 contextual_message,
                 emotion_data,
-                tool_result
+                tool_result,
+                on_chunk=on_chunk
             )
             
             logger.info('───────────────────────────────────────────────────────')
@@ -664,25 +749,14 @@ class SocketHandler:
             logger.info('───────────────────────────────────────────────────────')
             
             output_mode = 'voice' if session.output_mode == CommunicationMode.VOICE.value else 'text'
-            await conversation_logger.log_bot_response(
-                session.session_id,
-                session.user_id,
-                response,
-                emotion_data.get('emotion', 'neutral'),
-                session.persona,
-                output_mode
-            )
-            
-            await conversation_service.add_message(
-                session.session_id,
-                'assistant',
-                response,
-                {
-                    'emotion': emotion_data.get('emotion'),
-                    'persona': session.persona
-                }
-            )
-            
+
+            # Every streamed chunk must land before the final response so
+            # the client never receives a stale chunk after the full reply
+            await drain_chunks()
+
+            # Emit the final text first so the client isn't waiting on
+            # bookkeeping; the log write, conversation save, and short-term
+            # memory update are independent of each other and run concurrently
             await self.sio.emit(
                 WebSocketEvents.BOT_TEXT_RESPONSE,
                 {
@@ -692,18 +766,42 @@ class SocketHandler:
                 },
                 to=sid
             )
-            
-            await self.memory_engine.add_message(
-                session.session_id,
-                'assistant',
-                response,
-                emotion_data.get('emotion', 'neutral'),
-                emotion_data.get('sentiment', 'neutral')
-            )
-            
+
+            post_tasks = [
+                conversation_logger.log_bot_response(
+                    session.session_id,
+                    session.user_id,
+                    response,
+                    emotion_data.get('emotion', 'neutral'),
+                    session.persona,
+                    output_mode
+                ),
+                conversation_service.add_message(
+                    session.session_id,
+                    'assistant',
+                    response,
+                    {
+                        'emotion': emotion_data.get('emotion'),
+                        'persona': session.persona
+                    }
+                ),
+                self.memory_engine.add_message(
+                    session.session_id,
+                    'assistant',
+                    response,
+                    emotion_data.get('emotion', 'neutral'),
+                    emotion_data.get('sentiment', 'neutral')
+                )
+            ]
+            # TTS synthesis is another independent round trip (subprocess or
+            # network) - fan it out with the writes so the voice reply isn't
+            # stacked behind them
             if output_mode == 'voice' and not session.audio_disabled:
-                await self.generate_and_stream_audio(sid, response, emotion_data.get('emotion', 'neutral'))
-            
+                post_tasks.append(
+                    self.generate_and_stream_audio(sid, response, emotion_data.get('emotion', 'neutral'))
+                )
+            await asyncio.gather(*post_tasks)
+
             session.is_processing = False
             await self.sio.emit(WebSocketEvents.PROCESSING_END, to=sid)
             
@@ -721,30 +819,62 @@ class SocketHandler:
             if session:
                 session.is_processing = False
     
+    def _make_chunk_emitter(self, sid: str):
+        """Build an on_chunk callback that streams text deltas to the client,
+        plus a drain coroutine that awaits every pending chunk emit
+
+        The emit tasks are collected for two reasons: the set keeps strong
+        references so the event loop can't garbage-collect an unfinished
+        emit, and draining before the final BOT_TEXT_RESPONSE guarantees no
+        stale chunk reaches the client after the full reply.
+        """
+        # The callback runs once per streamed token; bind the lookups it
+        # needs into the closure so each call is straight local access
+        # instead of re-resolving self.sio.emit and the event name
+        emit = self.sio.emit
+        create_task = asyncio.create_task
+        event = WebSocketEvents.BOT_TEXT_CHUNK
+        tasks: set = set()
+        add = tasks.add
+        discard = tasks.discard
+
+        def on_chunk(chunk: str):
+            task = create_task(emit(event, {'text': chunk}, to=sid))
+            add(task)
+            task.add_done_callback(discard)
+
+        async def drain():
+            if tasks:
+                await asyncio.gather(*tasks)
+
+        return on_chunk, drain
+
     async def generate_response(
         self,
         session: SessionData,
         user_message: str,
         emotion_data: Dict[str, Any],
-        tool_result: Dict[str, Any]
+        tool_result: Dict[str, Any],
+        on_chunk=None
     ) -> str:
         """Generate AI response based on context"""
         try:
             emotional_context = self.emotion_engine.generate_emotional_context(emotion_data)
-            system_prompt = self.persona_engine.get_system_prompt(
-                session.persona,
-                emotional_context
-            )
-            
-            conversation_history = await self.memory_engine.get_conversation_context(
-                session.session_id,
-                10
-            )
+            system_prompt = self.persona_engine.get_system_prompt(session.persona)
             
-            memory_context = await self.memory_engine.get_memory_context(
-                session.user_id,
-                limit=8,
-                current_message=user_message
+            # Conversation history and Memory Lane context are independent
+            # lookups - fetch them concurrently instead of paying each
+            # round trip in sequence
+            conversation_history, memory_context = await asyncio.gather(
+                self.memory_engine.get_conversation_messages(
+                    session.session_id,
+                    10
+                ),
+                self.memory_engine.get_memory_context(
+                    session.user_id,
+                    limit=8,
+                    current_message=user_message
+                )
             )
             if memory_context:
                 logger.info(f'Using {len(memory_context)} chars of Memory Lane context for response')
@@ -754,28 +884,39 @@ class SocketHandler:
                 tool_context = self.tool_engine.format_tool_result_for_context(tool_result['result'])
                 contextual_message = f"{user_message}\n\n{tool_context}\n\nPlease incorporate this information naturally into your response."
             
+            # The static persona prompt leads unchanged between turns, so
+            # providers with prefix caching reuse it; everything that varies
+            # per turn (emotional context, Memory Lane) follows in a second
+            # system message instead of being spliced into the prefix
             messages = [
-                {'role': 'system', 'content': system_prompt + memory_context}
+                {'role': 'system', 'content': system_prompt}
             ]
+            dynamic_parts = []
+            if emotional_context:
+                dynamic_parts.append(f'Current emotional context: {emotional_context}')
+            if memory_context:
+                dynamic_parts.append(memory_context.strip())
+            if dynamic_parts:
+                messages.append({'role': 'system', 'content': '\n\n'.join(dynamic_parts)})
             
+            # History arrives as ready-made chat dicts, so no re-parsing of a
+            # joined transcript (which also mangled multi-line messages)
             if conversation_history:
-                history_lines = conversation_history.split('\n')
-                for line in history_lines:
-                    if line.startswith('user:'):
-                        messages.append({'role': 'user', 'content': line[5:].strip()})
-                    elif line.startswith('assistant:'):
-                        messages.append({'role': 'assistant', 'content': line[10:].strip()})
+                messages.extend(conversation_history)
             
             messages.append({'role': 'user', 'content': contextual_message})
-            
-            response = await self.llm_service.generate_completion(
-                messages,
-                {
-                    'temperature': 0.8,
-                    'max_tokens': 500
-                }
-            )
-            
+
+            # Stream when a chunk callback is provided so the client sees
+            # text as it's generated instead of waiting for the full reply
+            if on_chunk:
+                response = await self.llm_service.generate_streaming_completion(
+                    messages,
+                    _RESPONSE_OPTIONS,
+                    on_chunk
+                )
+            else:
+                response = await self.llm_service.generate_completion(messages, _RESPONSE_OPTIONS)
+
             return response
             
         except Exception as error:
@@ -784,7 +925,6 @@ class SocketHandler:
     
     def clean_text_for_tts(self, text: str) -> str:
         """Clean text for better TTS pronunciation"""
-        import re
         
         # Remove markdown formatting
         text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # Remove bold **text**
@@ -836,7 +976,6 @@ class SocketHandler:
             logger.info(f"✅ Audio generated: {len(audio_buffer)} bytes")
             
             # Convert bytes to base64 for reliable transmission over WebSocket
-            import base64
             audio_base64 = base64.b64encode(audio_buffer).decode('utf-8')
             
             logger.info(f"📦 Sending complete audio: {len(audio_buffer)} bytes (base64: {len(audio_base64)} chars)")
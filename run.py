@@ -33,12 +33,25 @@ def main():
     
     # Import here to ensure environment is loaded
     from app.main import socket_app
-    
+
+    # Prefer uvloop + httptools when available (uvicorn[standard]) for
+    # noticeably lower latency on the IO-bound socket/chat paths
+    loop_impl = "auto"
+    http_impl = "auto"
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+        http_impl = "httptools"
+    except ImportError:
+        print("⚠️  uvloop not installed - falling back to asyncio event loop")
+
     # Run server
     uvicorn.run(
         socket_app,
         host=host,
         port=port,
+        loop=loop_impl,
+        http=http_impl,
         log_level="info" if environment == "production" else "debug",
         access_log=True,
         reload=environment == "development"
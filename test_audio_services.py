@@ -11,11 +11,15 @@ from app.services.tts_service import TTSService
 
 load_dotenv()
 
+# One service of each kind for the whole script (the unittest setUpClass
+# equivalent): construction initializes the provider once, and the shared
+# provider cache means every test reuses the same instance anyway
+stt_service = STTService()
+tts_service = TTSService()
+
 
 async def test_stt_provider_info():
     print("\n=== Testing STT Provider Info ===")
-    stt_service = STTService()
-    
     info = stt_service.get_provider_info()
     print(f"Provider Info: {info}")
     
@@ -25,8 +29,6 @@ async def test_stt_provider_info():
 
 async def test_tts_provider_info():
     print("\n=== Testing TTS Provider Info ===")
-    tts_service = TTSService()
-    
     info = tts_service.get_provider_info()
     print(f"Provider Info: {info}")
     
@@ -36,8 +38,6 @@ async def test_tts_provider_info():
 
 async def test_tts_basic():
     print("\n=== Testing Basic TTS ===")
-    tts_service = TTSService()
-    
     text = "Hello, this is a test of the text to speech system."
     print(f"Generating speech for: {text}")
     
@@ -56,8 +56,6 @@ async def test_tts_basic():
 
 async def test_tts_emotional():
     print("\n=== Testing Emotional TTS ===")
-    tts_service = TTSService()
-    
     emotions = ['happy', 'sad', 'excited', 'neutral']
     text = "This is a test of emotional speech."
     
@@ -75,8 +73,6 @@ async def test_tts_emotional():
 
 async def test_tts_text_splitting():
     print("\n=== Testing Text Splitting ===")
-    tts_service = TTSService()
-    
     long_text = "This is a sentence. This is another sentence! And here's a question? " * 100
     chunks = tts_service.split_text_for_tts(long_text, max_length=200)
     
@@ -87,8 +83,6 @@ async def test_tts_text_splitting():
 
 async def test_tts_available_voices():
     print("\n=== Testing Available Voices ===")
-    tts_service = TTSService()
-    
     voices = tts_service.get_available_voices()
     print(f"Available voices: {voices}")
     
@@ -107,8 +101,6 @@ async def test_stt_with_sample():
         print("Skipping STT test. To test STT, place a sample audio file at the path above.")
         return
     
-    stt_service = STTService()
-    
     with open(sample_path, 'rb') as f:
         audio_buffer = f.read()
     
@@ -121,8 +113,6 @@ async def test_stt_with_sample():
 
 async def test_tts_chunks():
     print("\n=== Testing TTS Chunks ===")
-    tts_service = TTSService()
-    
     text_chunks = [
         "This is the first chunk.",
         "Here is the second chunk.",
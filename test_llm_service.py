@@ -9,11 +9,13 @@ from app.services.llm_service import LLMService
 
 load_dotenv()
 
+# One service for the whole script (the unittest setUpClass equivalent):
+# construction initializes the provider, and every test can share it
+llm_service = LLMService()
+
 
 async def test_basic_completion():
     print("\n=== Testing Basic Completion ===")
-    llm_service = LLMService()
-    
     messages = [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": "Say hello in one sentence."}
@@ -25,8 +27,6 @@ async def test_basic_completion():
 
 async def test_streaming_completion():
     print("\n=== Testing Streaming Completion ===")
-    llm_service = LLMService()
-    
     messages = [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": "Count from 1 to 5."}
@@ -41,8 +41,6 @@ async def test_streaming_completion():
 
 async def test_generate_response():
     print("\n=== Testing Generate Response ===")
-    llm_service = LLMService()
-    
     response = await llm_service.generate_response(
         system_prompt="You are a helpful assistant.",
         user_message="What is 2+2?",
@@ -53,8 +51,6 @@ async def test_generate_response():
 
 async def test_provider_info():
     print("\n=== Testing Provider Info ===")
-    llm_service = LLMService()
-    
     info = llm_service.get_provider_info()
     print(f"Provider Info: {info}")
     